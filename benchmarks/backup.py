@@ -0,0 +1,62 @@
+"""Time and peak memory of a backup versus the JSON export.
+
+Run from the project root:  python benchmarks/backup.py [rows]
+Builds a throwaway database in a temporary folder.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.row_materialization import _populate
+from database.account_dao import AccountDAO
+from database.budget_dao import BudgetDAO
+from database.category_dao import CategoryDAO
+from database.db_manager import DatabaseManager
+from database.recurring_dao import RecurringDAO
+from database.transaction_dao import TransactionDAO
+from services.data_service import DataService
+from services.transaction_service import TransactionService
+
+
+def _measure(fn) -> tuple[float, int]:
+    """(seconds, peak bytes allocated) for one call of fn."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(count: int = 200_000):
+    with tempfile.TemporaryDirectory() as folder:
+        db = DatabaseManager(os.path.join(folder, "budget_bench.db"))
+        db.initialize()
+        tx_dao = TransactionDAO(db)
+        account_dao = AccountDAO(db)
+        _populate(tx_dao, count)
+        data_svc = DataService(
+            db, account_dao, CategoryDAO(db), BudgetDAO(db), RecurringDAO(db), tx_dao,
+            TransactionService(db, tx_dao, account_dao),
+        )
+
+        def export():
+            with open(os.path.join(folder, "export.json"), "w", encoding="utf-8") as f:
+                json.dump(data_svc.export_json(), f, default=str)
+
+        print(f"{count:,} transactions, {os.path.getsize(db.db_path) / 2**20:,.1f} MB file\n")
+        print(f"{'':<12} {'seconds':>8} {'peak MB':>9}")
+        for name, fn in (("export_json", export), ("backup", db.backups.backup)):
+            elapsed, peak = _measure(fn)
+            print(f"{name:<12} {elapsed:>8.2f} {peak / 2**20:>9.1f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
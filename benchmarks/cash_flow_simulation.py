@@ -0,0 +1,42 @@
+"""Time of the Monte Carlo forecast's simulation by number of categories.
+
+Run from the project root:  python benchmarks/cash_flow_simulation.py [paths]
+Uses synthetic category histories; no database is needed.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import cash_flow_simulation as simulation
+
+MONTHS = 24
+
+
+def _history(categories: int, rng: np.random.Generator) -> np.ndarray:
+    """Monthly totals in cents, active in about 60% of months."""
+    shape = (categories, simulation.HISTORY_MONTHS)
+    return np.rint((rng.random(shape) < 0.6) * rng.lognormal(9, 1, shape)).astype(np.int64)
+
+
+def main(paths: int = simulation.SIMULATION_PATHS):
+    rng = np.random.default_rng(1)
+    print(f"{paths:,} paths x {MONTHS} months\n")
+    print(f"{'categories':>10} {'ms':>8}")
+    for categories in (10, 25, 50):
+        history = _history(categories, rng)
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            net = -simulation.simulate(simulation.fit(history), MONTHS, paths, rng)
+            simulation.bands(net)
+            simulation.bands(np.cumsum(net, axis=1))
+            best = min(best, time.perf_counter() - start)
+        print(f"{categories:>10} {best * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else simulation.SIMULATION_PATHS)
@@ -0,0 +1,61 @@
+"""Rows per second and bytes per row for loading transactions through the DAOs.
+
+Run from the project root:  python benchmarks/row_materialization.py [rows]
+Builds a throwaway database in a temporary folder.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.transaction_dao import TransactionDAO
+
+
+def _populate(dao: TransactionDAO, count: int):
+    random.seed(1)
+    dao.create_many([
+        {
+            "account_id": 1,
+            "type_": random.choice(("income", "expense")),
+            "amount": random.randint(100, 99_999),
+            "date": f"2026-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            "description": f"Payee {random.randint(1, 500)}",
+            "category_id": random.randint(1, 10),
+        }
+        for _ in range(count)
+    ])
+
+
+def main(count: int = 100_000):
+    with tempfile.TemporaryDirectory() as folder:
+        db = DatabaseManager(os.path.join(folder, "bench.db"))
+        db.initialize()
+        dao = TransactionDAO(db)
+        _populate(dao, count)
+        dao.get_all()  # warm the page cache
+
+        best = min(_timed(dao.get_all) for _ in range(5))
+        tracemalloc.start()
+        rows = dao.get_all()
+        size, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{len(rows):,} rows")
+        print(f"{len(rows) / best:,.0f} rows/s")
+        print(f"{size / len(rows):,.0f} bytes/row retained")
+        db.close()
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
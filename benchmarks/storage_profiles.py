@@ -0,0 +1,91 @@
+"""Write and read throughput of each storage profile on a copy of your data.
+
+Run from the project root:  python benchmarks/storage_profiles.py [db_path] [writes]
+db_path defaults to this year's budget file in the configured DB folder. The
+file is copied once per profile into a temporary folder; the original is only
+read.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.account_dao import AccountDAO
+from database.db_manager import DatabaseManager
+from database.storage_profiles import STORAGE_PROFILES
+from database.transaction_dao import TransactionDAO
+from utils.app_config import get_db_folder
+from utils.constants import db_file_for_year
+
+
+def _default_path() -> str:
+    path = db_file_for_year(date.today().year)
+    folder = get_db_folder()
+    return os.path.join(folder, os.path.basename(path)) if folder else path
+
+
+def _copy(source: str, dest: str):
+    """Consistent copy of `source`, even while the app has it open."""
+    src = sqlite3.connect(Path(source).resolve().as_uri() + "?mode=ro", uri=True)
+    dst = sqlite3.connect(dest)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+def _run(path: str, profile: str, writes: int) -> tuple[float, float, int]:
+    """(committed writes/s, rows read/s, rows read) under `profile`."""
+    db = DatabaseManager(path)
+    try:
+        db.initialize()
+        db.set_storage_profile(profile)
+        accounts = AccountDAO(db).get_all()
+        account_id = accounts[0].id if accounts else AccountDAO(db).create("Benchmark").id
+        dao = TransactionDAO(db)
+
+        today = date.today().isoformat()
+        start = time.perf_counter()
+        for i in range(writes):
+            dao.create(account_id, "expense", 100 + i, today, f"Benchmark {i}")
+        write_rate = writes / (time.perf_counter() - start)
+
+        dao.get_all()  # warm the page cache
+        best = min(_timed(dao.get_all) for _ in range(5))
+        rows = len(dao.get_all())
+        return write_rate, rows / best, rows
+    finally:
+        db.close()
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(source: str, writes: int = 500):
+    if not os.path.exists(source):
+        sys.exit(f"No database at {source}")
+    print(f"{source}, {writes:,} single-transaction writes per profile\n")
+    print(f"{'profile':<12} {'writes/s':>12} {'rows/s':>14} {'rows':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        for name in STORAGE_PROFILES:
+            path = os.path.join(folder, f"{name}.db")
+            _copy(source, path)
+            write_rate, read_rate, rows = _run(path, name, writes)
+            print(f"{name:<12} {write_rate:>12,.0f} {read_rate:>14,.0f} {rows:>10,}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        args[0] if args else _default_path(),
+        int(args[1]) if len(args) > 1 else 500,
+    )
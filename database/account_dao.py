@@ -1,64 +1,131 @@
+import threading
 from typing import Optional
+from database.changes import Change
 from database.db_manager import DatabaseManager
+from database.rows import fetch_all, fetch_one
 from models.account import Account
 
+# Every column but created_at, which nothing reads.
+_COLUMNS = "id, name, description, account_type, opening_balance"
+
+# Larger changes reload the whole map rather than an IN list this long.
+_MAX_PATCHED_IDS = 500
+
 
 class AccountDAO:
+    """Accounts, served from an identity map read on first use.
+
+    The map holds one Account per id, indexed by id and name, so lookups cost
+    no SQL. It is patched from the ChangeBus once a write commits, so rows of a
+    unit of work that rolls back never reach it; a change of unknown scope,
+    such as an import or another process writing, drops it.
+    """
+
     def __init__(self, db: DatabaseManager):
         self._db = db
-        self._all_cache: list | None = None
+        self._by_id: dict[int, Account] | None = None
+        # Bumped by every invalidation, so a load that raced one is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._by_name: dict[str, Account] = {}
+        self._all_cache: list[Account] = []
+        db.changes.subscribe(self._on_change, "account")
+        # A load inside a unit of work may have read its uncommitted rows
+        db.changes.subscribe_discards(lambda _: self._invalidate_cache(), "account")
 
     def _invalidate_cache(self):
-        self._all_cache = None
-
-    def _row_to_model(self, row) -> Account:
-        return Account(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"],
-            account_type=row["account_type"],
-            opening_balance=row["opening_balance"],
-            created_at=row["created_at"],
+        with self._lock:
+            self._by_id = None
+            self._generation += 1
+
+    def _on_change(self, change: Change):
+        if change.ids and len(change.ids) <= _MAX_PATCHED_IDS:
+            self._reload(change.ids)
+        else:
+            self._invalidate_cache()
+
+    def _publish(self, *ids: int):
+        self._db.changes.publish(Change("account", ids=frozenset(ids), accounts=frozenset(ids)))
+
+    def _fetch_all(self, sql: str, params=()) -> list[Account]:
+        return fetch_all(self._db.get_connection(), Account, sql, params)
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[Account]:
+        return fetch_one(self._db.get_connection(), Account, sql, params)
+
+    def _load(self) -> dict[int, Account]:
+        # Reads may run on any thread (see services.async_facade)
+        by_id = self._by_id
+        while by_id is None:
+            generation = self._generation
+            accounts = self._fetch_all(f"SELECT {_COLUMNS} FROM accounts")
+            with self._lock:
+                if generation == self._generation:
+                    self._index(accounts)
+                by_id = self._by_id
+        return by_id
+
+    def _index(self, accounts: list[Account]):
+        # New containers each time, so a reader never sees one half-updated
+        self._all_cache = sorted(accounts, key=lambda a: a.name)
+        self._by_name = {a.name: a for a in accounts}
+        self._by_id = {a.id: a for a in accounts}
+
+    def _reload(self, ids: frozenset[int]):
+        """Replace the map's entries for `ids` with the committed rows."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        if self._by_id is None:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        accounts = self._fetch_all(
+            f"SELECT {_COLUMNS} FROM accounts WHERE id IN ({placeholders})", tuple(ids)
         )
+        others = [a for a in self._all_cache if a.id not in ids]
+        with self._lock:
+            if generation == self._generation and self._by_id is not None:
+                self._index(others + accounts)
+            else:
+                self._by_id = None
 
     def get_all(self) -> list[Account]:
-        if self._all_cache is None:
-            conn = self._db.get_connection()
-            rows = conn.execute(
-                "SELECT * FROM accounts ORDER BY name"
-            ).fetchall()
-            self._all_cache = [self._row_to_model(r) for r in rows]
+        """All accounts by name. The list is shared; do not modify it."""
+        self._load()
         return self._all_cache
 
     def get_by_id(self, account_id: int) -> Optional[Account]:
-        conn = self._db.get_connection()
-        row = conn.execute(
-            "SELECT * FROM accounts WHERE id = ?", (account_id,)
-        ).fetchone()
-        return self._row_to_model(row) if row else None
+        return self._load().get(account_id)
 
     def get_by_name(self, name: str) -> Optional[Account]:
-        conn = self._db.get_connection()
-        row = conn.execute(
-            "SELECT * FROM accounts WHERE name = ?", (name,)
-        ).fetchone()
-        return self._row_to_model(row) if row else None
+        self._load()
+        return self._by_name.get(name)
 
     def create(
         self,
         name: str,
         description: str = "",
         account_type: str = "checking",
-        opening_balance: float = 0.0,
+        opening_balance: int = 0,
     ) -> Account:
-        conn = self._db.get_connection()
-        cursor = conn.execute(
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO accounts(name, description, account_type, opening_balance) VALUES (?, ?, ?, ?)",
+                (name, description, account_type, opening_balance),
+            )
+        self._publish(cursor.lastrowid)
+        # Read directly: the map is patched only once an enclosing unit of work commits
+        return self._fetch_one(f"SELECT {_COLUMNS} FROM accounts WHERE id = ?", (cursor.lastrowid,))
+
+    def create_many(self, rows) -> list[int]:
+        """Insert (name, description, account_type, opening_balance) tuples in one
+        transaction. Returns the new ids."""
+        ids = self._db.insert_many(
             "INSERT INTO accounts(name, description, account_type, opening_balance) VALUES (?, ?, ?, ?)",
-            (name, description, account_type, opening_balance),
+            rows,
         )
-        conn.commit()
-        self._invalidate_cache()
-        return self.get_by_id(cursor.lastrowid)
+        self._publish(*ids)
+        return ids
 
     def update(
         self,
@@ -66,22 +133,20 @@ class AccountDAO:
         name: str,
         description: str = "",
         account_type: str = "checking",
-        opening_balance: float = 0.0,
+        opening_balance: int = 0,
     ) -> Account:
-        conn = self._db.get_connection()
-        conn.execute(
-            "UPDATE accounts SET name = ?, description = ?, account_type = ?, opening_balance = ? WHERE id = ?",
-            (name, description, account_type, opening_balance, account_id),
-        )
-        conn.commit()
-        self._invalidate_cache()
-        return self.get_by_id(account_id)
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE accounts SET name = ?, description = ?, account_type = ?, opening_balance = ? WHERE id = ?",
+                (name, description, account_type, opening_balance, account_id),
+            )
+        self._publish(account_id)
+        return self._fetch_one(f"SELECT {_COLUMNS} FROM accounts WHERE id = ?", (account_id,))
 
     def delete(self, account_id: int):
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
-        conn.commit()
-        self._invalidate_cache()
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
+        self._publish(account_id)
 
     def has_transactions(self, account_id: int) -> bool:
         conn = self._db.get_connection()
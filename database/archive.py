@@ -0,0 +1,130 @@
+"""Compaction of closed years into read-only snapshots.
+
+Once a year is over its budget_YYYY.db is never written again. archive_year()
+replaces the file with a VACUUM INTO copy: no WAL, no free pages, planner
+statistics gathered, and the year's month-end balances precomputed. The full
+schema is kept, so a later migration can still be
+applied before the year is archived again. The federation attaches archived
+files with immutable=1, which lets SQLite skip all locking and change
+detection on them, so a file another connection may still have open is never
+archived.
+"""
+import os
+import sqlite3
+from pathlib import Path
+from database.migrations import SCHEMA_VERSION, run_script
+
+
+# app_settings key holding the date a snapshot was taken.
+ARCHIVED_ON_KEY = "archived_on"
+
+_ARCHIVE_SCHEMA = """
+            DROP TABLE IF EXISTS archive_month_balances;
+            -- Written by older versions, never read
+            DROP TABLE IF EXISTS archive_year_totals;
+
+            -- Balance of each account at the end of each month of the year.
+            CREATE TABLE archive_month_balances (
+                account_id      INTEGER NOT NULL,
+                month           TEXT    NOT NULL,
+                closing_balance INTEGER NOT NULL,
+                PRIMARY KEY (account_id, month)
+            ) WITHOUT ROWID;
+"""
+
+
+def _read_only_uri(path: str, immutable: bool = False) -> str:
+    uri = Path(path).resolve().as_uri() + "?mode=ro"
+    return uri + "&immutable=1" if immutable else uri
+
+
+def is_current_archive(path: str) -> bool:
+    """True if `path` is a snapshot taken at the current schema version."""
+    try:
+        conn = sqlite3.connect(_read_only_uri(path), uri=True)
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                return False
+            row = conn.execute(
+                "SELECT 1 FROM app_settings WHERE key = ?", (ARCHIVED_ON_KEY,)
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def _fill_aggregates(conn: sqlite3.Connection, year: int):
+    conn.execute(f"""
+        WITH RECURSIVE months(n) AS (
+            SELECT 1 UNION ALL SELECT n + 1 FROM months WHERE n < 12
+        )
+        INSERT INTO archive_month_balances(account_id, month, closing_balance)
+        SELECT a.id, '{year}-' || printf('%02d', m.n),
+               COALESCE((
+                   SELECT SUM(t.amount * t.direction) FROM transactions t
+                   WHERE t.account_id = a.id
+                     AND t.date < '{year}-' || printf('%02d', m.n) || '-32'
+               ), 0)
+        FROM accounts a CROSS JOIN months m
+    """)
+
+
+def archive_year(path: str, year: int):
+    """Replace the closed year file at `path` with a compacted snapshot.
+
+    The snapshot is built beside the file and only moved over it once it passes
+    an integrity check, so a failure leaves the original untouched. Raises
+    sqlite3.OperationalError, without touching the file, if another connection
+    may have it open.
+    """
+    _check_not_in_use(path)
+    snapshot_path = path + ".archive"
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+
+    source = sqlite3.connect(path)
+    try:
+        source.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        source.execute("VACUUM INTO ?", (snapshot_path,))
+    finally:
+        source.close()
+
+    snapshot = sqlite3.connect(snapshot_path)
+    try:
+        with snapshot:
+            run_script(snapshot, _ARCHIVE_SCHEMA)
+            _fill_aggregates(snapshot, year)
+            snapshot.execute(
+                "INSERT OR REPLACE INTO app_settings(key, value) VALUES (?, date('now'))",
+                (ARCHIVED_ON_KEY,),
+            )
+        snapshot.execute("ANALYZE")
+        snapshot.execute("PRAGMA journal_mode = DELETE")
+        healthy = snapshot.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+    finally:
+        snapshot.close()
+
+    if not healthy:
+        os.remove(snapshot_path)
+        raise sqlite3.DatabaseError(f"Archive snapshot of {path} failed its integrity check.")
+    os.replace(snapshot_path, path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def _check_not_in_use(path: str):
+    """Raise sqlite3.OperationalError if another connection may have `path`
+    open: WAL sidecar files exist, or its write lock cannot be taken at once.
+    Replacing such a file could show a reader half of each version."""
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            raise sqlite3.OperationalError(f"{path} is open elsewhere ({suffix} file present).")
+    probe = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        probe.execute("BEGIN IMMEDIATE")
+        probe.execute("ROLLBACK")
+    finally:
+        probe.close()
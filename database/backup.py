@@ -0,0 +1,179 @@
+"""Online backups of the current year's file through the SQLite backup API.
+
+A backup copies the database page by page from a read-only connection, a few
+hundred pages per step, so it can run on a background thread while the app
+keeps writing. The source connection holds one read transaction for the whole
+copy, so every backup is a consistent snapshot of a single commit. Each copy
+is written beside its final name, integrity-checked, and only then renamed
+into place; the newest BACKUP_GENERATIONS are kept in a backups folder next to
+the database.
+
+Prior-year files are not backed up: they are archive snapshots that are never
+written again (see database.archive).
+"""
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from database.migrations import SCHEMA_VERSION
+
+if TYPE_CHECKING:
+    from database.db_manager import DatabaseManager
+
+# Backups of each year file kept before the oldest is deleted.
+BACKUP_GENERATIONS = 5
+
+# Pages copied per backup step; 256 pages of 4 KiB is 1 MiB.
+PAGES_PER_STEP = 256
+
+BACKUP_FOLDER = "backups"
+
+_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+
+Progress = Callable[[int, int], None]
+
+
+@dataclass(frozen=True, slots=True)
+class BackupInfo:
+    path: str
+    created: datetime
+    size: int  # bytes
+
+
+class BackupManager:
+    def __init__(self, db: "DatabaseManager"):
+        self._db = db
+
+    @property
+    def folder(self) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(self._db.db_path)), BACKUP_FOLDER)
+
+    def backup(self, progress: Progress | None = None) -> str:
+        """Copy the database into a new backup generation and return its path.
+
+        Safe to call from any thread; it uses connections of its own. progress
+        is called after each step with (pages copied, total pages). Raises
+        sqlite3.DatabaseError if the copy fails its integrity check.
+        """
+        path = self._copy(progress)
+        self._rotate()
+        return path
+
+    def _copy(self, progress: Progress | None) -> str:
+        os.makedirs(self.folder, exist_ok=True)
+        stem = Path(self._db.db_path).stem
+        created = datetime.now()
+        path = os.path.join(self.folder, f"{stem}-{created.strftime(_TIMESTAMP_FORMAT)}.db")
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+
+        source = sqlite3.connect(_read_only_uri(self._db.db_path), uri=True)
+        target = sqlite3.connect(partial)
+        try:
+            # Pin one snapshot: commits made during the copy are not seen, so
+            # they cannot make the backup restart
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            source.backup(
+                target, pages=PAGES_PER_STEP,
+                progress=(lambda _status, remaining, total: progress(total - remaining, total))
+                if progress else None,
+            )
+            # The copy is a standalone file, not a WAL database
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            source.close()
+            target.close()
+
+        problem = verify(partial)
+        if problem:
+            os.remove(partial)
+            raise sqlite3.DatabaseError(f"Backup failed verification: {problem}")
+        os.replace(partial, path)
+        return path
+
+    def list_backups(self) -> list[BackupInfo]:
+        """Backups of this database, newest first."""
+        stem = Path(self._db.db_path).stem
+        pattern = re.compile(rf"^{re.escape(stem)}-(\d{{8}}-\d{{6}}-\d{{6}})\.db$")
+        found = []
+        if os.path.isdir(self.folder):
+            for name in os.listdir(self.folder):
+                match = pattern.match(name)
+                if match:
+                    path = os.path.join(self.folder, name)
+                    found.append(BackupInfo(
+                        path=path,
+                        created=datetime.strptime(match.group(1), _TIMESTAMP_FORMAT),
+                        size=os.path.getsize(path),
+                    ))
+        return sorted(found, key=lambda b: b.created, reverse=True)
+
+    def restore(self, path: str) -> str:
+        """Replace the database's contents with the backup at `path`.
+
+        The backup is verified first, and the current state is itself backed up
+        before being overwritten; returns that safety backup's path. Runs on the
+        writer thread. An older backup is migrated to the current schema, and a
+        change of unknown scope is published to every entity.
+        """
+        problem = verify(path)
+        if problem:
+            raise ValueError(f"Cannot restore {os.path.basename(path)}: {problem}")
+        conn = self._db.get_connection()
+        if conn.in_transaction:
+            raise sqlite3.ProgrammingError("Cannot restore inside a transaction.")
+        # Not rotated yet: that could delete the backup being restored
+        safety = self._copy(None)
+        source = sqlite3.connect(_read_only_uri(path), uri=True)
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+        self._db.initialize()
+        self._db.changes.publish_all()
+        self._rotate()
+        return safety
+
+    def _rotate(self):
+        for old in self.list_backups()[BACKUP_GENERATIONS:]:
+            try:
+                os.remove(old.path)
+            except OSError:
+                pass
+
+
+def verify(path: str) -> str | None:
+    """Why the backup at `path` cannot be restored, or None if it can.
+
+    Checks that the file is intact (PRAGMA integrity_check), is a budget
+    database, and is not from a newer version of the app.
+    """
+    try:
+        conn = sqlite3.connect(_read_only_uri(path), uri=True)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            if result != "ok":
+                return f"integrity check failed ({result})"
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            has_ledger = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        return str(e)
+    if not has_ledger:
+        return "not a budget database"
+    if version > SCHEMA_VERSION:
+        return "made by a newer version of the app"
+    return None
+
+
+def _read_only_uri(path: str) -> str:
+    return Path(path).resolve().as_uri() + "?mode=ro"
@@ -1,71 +1,87 @@
 from typing import Optional
+from database.changes import Change
 from database.db_manager import DatabaseManager
+from database.rows import fetch_all, fetch_one
 from models.budget import Budget
 
 
 class BudgetDAO:
+    _UPSERT = """INSERT INTO budgets(category_id, month, limit_amount)
+                 VALUES (?, ?, ?)
+                 ON CONFLICT(category_id, month)
+                 DO UPDATE SET limit_amount = excluded.limit_amount"""
+
     def __init__(self, db: DatabaseManager):
         self._db = db
 
-    def _row_to_model(self, row, spent: float = 0.0) -> Budget:
-        return Budget(
-            id=row["id"],
-            category_id=row["category_id"],
-            category_name=row["category_name"] if "category_name" in row.keys() else "",
-            month=row["month"],
-            limit_amount=row["limit_amount"],
-            spent_amount=spent,
-            color_hex=row["color_hex"] if "color_hex" in row.keys() else "#888888",
-        )
+    def _fetch_all(self, sql: str, params=()) -> list[Budget]:
+        return fetch_all(self._db.get_connection(), Budget, sql, params)
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[Budget]:
+        return fetch_one(self._db.get_connection(), Budget, sql, params)
 
     def get_all(self) -> list[Budget]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             """SELECT b.*, c.name AS category_name, c.color_hex
                FROM budgets b JOIN categories c ON b.category_id = c.id
                ORDER BY b.month, c.name"""
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        )
 
     def get_by_month(self, month: str) -> list[Budget]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             """SELECT b.*, c.name AS category_name, c.color_hex
                FROM budgets b
                JOIN categories c ON b.category_id = c.id
                WHERE b.month = ?
                ORDER BY c.name""",
             (month,),
+        )
+
+    def get_totals_by_month(self, first_month: str, last_month: str) -> dict[str, int]:
+        """{month: sum of its limits} for the budgeted months in
+        [first_month, last_month]; months without budgets are absent."""
+        rows = self._db.get_connection().execute(
+            """SELECT month, SUM(limit_amount) FROM budgets
+               WHERE month BETWEEN ? AND ?
+               GROUP BY month""",
+            (first_month, last_month),
         ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        return {month: total for month, total in rows}
 
     def get_by_category_month(self, category_id: int, month: str) -> Optional[Budget]:
-        conn = self._db.get_connection()
-        row = conn.execute(
+        return self._fetch_one(
             """SELECT b.*, c.name AS category_name, c.color_hex
                FROM budgets b
                JOIN categories c ON b.category_id = c.id
                WHERE b.category_id = ? AND b.month = ?""",
             (category_id, month),
-        ).fetchone()
-        return self._row_to_model(row) if row else None
-
-    def upsert(self, category_id: int, month: str, limit_amount: float) -> Budget:
-        conn = self._db.get_connection()
-        conn.execute(
-            """INSERT INTO budgets(category_id, month, limit_amount)
-               VALUES (?, ?, ?)
-               ON CONFLICT(category_id, month)
-               DO UPDATE SET limit_amount = excluded.limit_amount""",
-            (category_id, month, limit_amount),
         )
-        conn.commit()
+
+    def upsert(self, category_id: int, month: str, limit_amount: int) -> Budget:
+        with self._db.transaction() as conn:
+            conn.execute(self._UPSERT, (category_id, month, limit_amount))
+        self._db.changes.publish(Change("budget", months=frozenset({month})))
         return self.get_by_category_month(category_id, month)
 
+    def upsert_many(self, rows) -> int:
+        """Upsert (category_id, month, limit_amount) tuples in one transaction.
+        Returns the number of rows written."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self._db.transaction() as conn:
+            conn.executemany(self._UPSERT, rows)
+        self._db.changes.publish(Change("budget", months=frozenset(r[1] for r in rows)))
+        return len(rows)
+
     def delete(self, budget_id: int):
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM budgets WHERE id = ?", (budget_id,))
-        conn.commit()
+        with self._db.transaction() as conn:
+            months = conn.execute(
+                "DELETE FROM budgets WHERE id = ? RETURNING month", (budget_id,)
+            ).fetchall()
+        self._db.changes.publish(
+            Change("budget", ids=frozenset({budget_id}), months=frozenset(r[0] for r in months))
+        )
 
     def copy_month(self, from_month: str, to_month: str) -> int:
         """Copy all budget limits from one month to another. Returns count copied."""
@@ -74,15 +90,6 @@ class BudgetDAO:
             "SELECT category_id, limit_amount FROM budgets WHERE month = ?",
             (from_month,),
         ).fetchall()
-        count = 0
-        for row in rows:
-            conn.execute(
-                """INSERT INTO budgets(category_id, month, limit_amount)
-                   VALUES (?, ?, ?)
-                   ON CONFLICT(category_id, month)
-                   DO UPDATE SET limit_amount = excluded.limit_amount""",
-                (row["category_id"], to_month, row["limit_amount"]),
-            )
-            count += 1
-        conn.commit()
-        return count
+        return self.upsert_many(
+            (row["category_id"], to_month, row["limit_amount"]) for row in rows
+        )
@@ -1,88 +1,154 @@
+import threading
 from typing import Optional
+from database.changes import Change
 from database.db_manager import DatabaseManager
+from database.rows import fetch_all, fetch_one
 from models.category import Category
 
+_CONVERTERS = {"is_system": bool}
+
+_TYPES = ("income", "expense", "both")
+
+# Larger changes reload the whole map rather than an IN list this long.
+_MAX_PATCHED_IDS = 500
+
 
 class CategoryDAO:
+    """Categories, served from an identity map read on first use.
+
+    The map holds one Category per id, indexed by id, by case-folded name and
+    by the transaction type each category can be used for, so lookups cost no
+    SQL. It is patched from the ChangeBus once a write commits, so rows of a
+    unit of work that rolls back never reach it; a change of unknown scope,
+    such as an import or another process writing, drops it.
+    """
+
     def __init__(self, db: DatabaseManager):
         self._db = db
-        self._all_cache: list | None = None
+        self._by_id: dict[int, Category] | None = None
+        # Bumped by every invalidation, so a load that raced one is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._by_name: dict[str, Category] = {}
+        self._by_type: dict[str, list[Category]] = {}
+        self._all_cache: list[Category] = []
+        db.changes.subscribe(self._on_change, "category")
+        # A load inside a unit of work may have read its uncommitted rows
+        db.changes.subscribe_discards(lambda _: self._invalidate_cache(), "category")
 
     def _invalidate_cache(self):
-        self._all_cache = None
-
-    def _row_to_model(self, row) -> Category:
-        return Category(
-            id=row["id"],
-            name=row["name"],
-            type=row["type"],
-            color_hex=row["color_hex"],
-            is_system=bool(row["is_system"]),
+        with self._lock:
+            self._by_id = None
+            self._generation += 1
+
+    def _on_change(self, change: Change):
+        if change.ids and len(change.ids) <= _MAX_PATCHED_IDS:
+            self._reload(change.ids)
+        else:
+            self._invalidate_cache()
+
+    def _publish(self, *ids: int):
+        self._db.changes.publish(Change("category", ids=frozenset(ids)))
+
+    def _fetch_all(self, sql: str, params=()) -> list[Category]:
+        return fetch_all(self._db.get_connection(), Category, sql, params, _CONVERTERS)
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[Category]:
+        return fetch_one(self._db.get_connection(), Category, sql, params, _CONVERTERS)
+
+    def _load(self) -> dict[int, Category]:
+        # Reads may run on any thread (see services.async_facade)
+        by_id = self._by_id
+        while by_id is None:
+            generation = self._generation
+            categories = self._fetch_all("SELECT * FROM categories")
+            with self._lock:
+                if generation == self._generation:
+                    self._index(categories)
+                by_id = self._by_id
+        return by_id
+
+    def _index(self, categories: list[Category]):
+        # New containers each time, so a reader never sees one half-updated
+        ordered = sorted(categories, key=lambda c: c.name)
+        self._all_cache = ordered
+        self._by_name = {c.name.casefold(): c for c in ordered}
+        self._by_type = {
+            t: [c for c in ordered if c.type in (t, "both")] for t in _TYPES
+        }
+        self._by_id = {c.id: c for c in ordered}
+
+    def _reload(self, ids: frozenset[int]):
+        """Replace the map's entries for `ids` with the committed rows."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        if self._by_id is None:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        categories = self._fetch_all(
+            f"SELECT * FROM categories WHERE id IN ({placeholders})", tuple(ids)
         )
+        others = [c for c in self._all_cache if c.id not in ids]
+        with self._lock:
+            if generation == self._generation and self._by_id is not None:
+                self._index(others + categories)
+            else:
+                self._by_id = None
 
     def get_all(self) -> list[Category]:
-        if self._all_cache is None:
-            conn = self._db.get_connection()
-            rows = conn.execute(
-                "SELECT * FROM categories ORDER BY name"
-            ).fetchall()
-            self._all_cache = [self._row_to_model(r) for r in rows]
+        """All categories by name. The list is shared; do not modify it."""
+        self._load()
         return self._all_cache
 
     def get_by_id(self, category_id: int) -> Optional[Category]:
-        conn = self._db.get_connection()
-        row = conn.execute(
-            "SELECT * FROM categories WHERE id = ?", (category_id,)
-        ).fetchone()
-        return self._row_to_model(row) if row else None
+        return self._load().get(category_id)
+
+    def get_by_name(self, name: str) -> Optional[Category]:
+        """The category called `name`, ignoring case."""
+        self._load()
+        return self._by_name.get(name.casefold())
 
     def get_by_type(self, type_filter: str) -> list[Category]:
         """type_filter: 'income', 'expense', or 'both'."""
-        conn = self._db.get_connection()
-        rows = conn.execute(
-            "SELECT * FROM categories WHERE type = ? OR type = 'both' ORDER BY name",
-            (type_filter,),
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        self._load()
+        return self._by_type[type_filter]
 
     def get_for_transaction_type(self, tx_type: str) -> list[Category]:
         """Get categories valid for income or expense transactions."""
-        if tx_type == "income":
-            rows = self._db.get_connection().execute(
-                "SELECT * FROM categories WHERE type IN ('income','both') ORDER BY name"
-            ).fetchall()
-        elif tx_type == "expense":
-            rows = self._db.get_connection().execute(
-                "SELECT * FROM categories WHERE type IN ('expense','both') ORDER BY name"
-            ).fetchall()
-        else:
-            rows = self._db.get_connection().execute(
-                "SELECT * FROM categories ORDER BY name"
-            ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        self._load()
+        if tx_type in ("income", "expense"):
+            return self._by_type[tx_type]
+        return self._all_cache
 
     def create(self, name: str, type_: str, color_hex: str = "#888888") -> Category:
-        conn = self._db.get_connection()
-        cursor = conn.execute(
-            "INSERT INTO categories(name, type, color_hex) VALUES (?, ?, ?)",
-            (name, type_, color_hex),
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO categories(name, type, color_hex) VALUES (?, ?, ?)",
+                (name, type_, color_hex),
+            )
+        self._publish(cursor.lastrowid)
+        # Read directly: the map is patched only once an enclosing unit of work commits
+        return self._fetch_one("SELECT * FROM categories WHERE id = ?", (cursor.lastrowid,))
+
+    def create_many(self, rows) -> list[int]:
+        """Insert (name, type, color_hex) tuples in one transaction. Returns the new ids."""
+        ids = self._db.insert_many(
+            "INSERT INTO categories(name, type, color_hex) VALUES (?, ?, ?)", rows
         )
-        conn.commit()
-        self._invalidate_cache()
-        return self.get_by_id(cursor.lastrowid)
+        self._publish(*ids)
+        return ids
 
     def update(self, category_id: int, name: str, type_: str, color_hex: str) -> Category:
-        conn = self._db.get_connection()
-        conn.execute(
-            "UPDATE categories SET name=?, type=?, color_hex=? WHERE id=?",
-            (name, type_, color_hex, category_id),
-        )
-        conn.commit()
-        self._invalidate_cache()
-        return self.get_by_id(category_id)
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE categories SET name=?, type=?, color_hex=? WHERE id=?",
+                (name, type_, color_hex, category_id),
+            )
+        self._publish(category_id)
+        return self._fetch_one("SELECT * FROM categories WHERE id = ?", (category_id,))
 
     def delete(self, category_id: int):
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-        conn.commit()
-        self._invalidate_cache()
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
+        self._publish(category_id)
@@ -0,0 +1,113 @@
+"""Change events published by the DAOs after each committed write.
+
+Subscribers (caches, tabs) register for the entities they depend on and are
+called on the writer thread once the write commits. Writes inside an enclosing
+unit of work are held until it commits and dropped if it rolls back; caches
+that may have read those uncommitted rows can ask to hear about the drop.
+
+Writes made by another process are noticed through PRAGMA data_version (see
+DatabaseManager.poll_external_changes) and published as changes of unknown
+scope to every entity.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+ENTITIES = ("account", "category", "transaction", "budget", "recurring")
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """One committed write to `entity`.
+
+    ids, months ('YYYY-MM') and accounts (ids) narrow what it touched. An empty
+    set means unknown, i.e. any.
+    """
+    entity: str
+    ids: frozenset[int] = frozenset()
+    months: frozenset[str] = frozenset()
+    accounts: frozenset[int] = frozenset()
+
+    @classmethod
+    def of_transactions(cls, rows: Iterable[tuple[int, int, str]]) -> "Change":
+        """Change for (id, account_id, date) transaction rows."""
+        rows = list(rows)
+        return cls(
+            "transaction",
+            ids=frozenset(r[0] for r in rows),
+            accounts=frozenset(r[1] for r in rows),
+            months=frozenset(r[2][:7] for r in rows),
+        )
+
+    def touches_account(self, account_id: int | None) -> bool:
+        return not self.accounts or account_id in self.accounts
+
+    def touches_month(self, month: str) -> bool:
+        return not self.months or month in self.months
+
+
+Subscriber = Callable[[Change], None]
+
+
+class ChangeBus:
+    def __init__(self):
+        self._subscribers: list[tuple[frozenset[str], Subscriber]] = []
+        self._discard_subscribers: list[tuple[frozenset[str], Subscriber]] = []
+        self._held: list[Change] | None = None
+
+    def subscribe(self, callback: Subscriber, *entities: str) -> Callable[[], None]:
+        """Call `callback` with every change to one of `entities` (all if none
+        are given). Returns a function that unsubscribes it."""
+        entry = (frozenset(entities or ENTITIES), callback)
+        self._subscribers.append(entry)
+        return lambda: self._subscribers.remove(entry)
+
+    def subscribe_discards(self, callback: Subscriber, *entities: str) -> Callable[[], None]:
+        """Call `callback` with every held change to one of `entities` (all if
+        none are given) that is dropped because its unit of work rolled back.
+        Returns a function that unsubscribes it."""
+        entry = (frozenset(entities or ENTITIES), callback)
+        self._discard_subscribers.append(entry)
+        return lambda: self._discard_subscribers.remove(entry)
+
+    def publish(self, change: Change):
+        if self._held is not None:
+            self._held.append(change)
+        else:
+            self._deliver([change], self._subscribers)
+
+    def publish_all(self):
+        """Publish a change of unknown scope to every entity."""
+        for entity in ENTITIES:
+            self.publish(Change(entity))
+
+    # ── Unit-of-work hooks, driven by DatabaseManager.transaction ────────────
+    def hold(self):
+        """Start holding changes until release() or discard()."""
+        self._held = []
+
+    def mark(self) -> int:
+        """Position to discard back to if a nested scope rolls back."""
+        return len(self._held) if self._held is not None else 0
+
+    def discard(self, mark: int | None = None):
+        """Drop the changes held since `mark`, or end the hold dropping all."""
+        if self._held is None:
+            return
+        if mark is None:
+            dropped, self._held = self._held, None
+        else:
+            dropped = self._held[mark:]
+            del self._held[mark:]
+        self._deliver(dropped, self._discard_subscribers)
+
+    def release(self):
+        """Deliver the held changes and end the hold."""
+        held, self._held = self._held or [], None
+        self._deliver(held, self._subscribers)
+
+    @staticmethod
+    def _deliver(changes: list[Change], subscribers: list[tuple[frozenset[str], Subscriber]]):
+        for change in changes:
+            for entities, callback in list(subscribers):
+                if change.entity in entities:
+                    callback(change)
@@ -1,147 +1,370 @@
 import sqlite3
 import os
+import re
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import date
-from utils.constants import DB_FILE, DEFAULT_CATEGORIES, DEFAULT_ACCOUNT_NAME, db_file_for_year
+from pathlib import Path
+from database.archive import archive_year, is_current_archive
+from database.backup import BackupManager
+from database.changes import Change, ChangeBus
+from database.maintenance import MaintenanceScheduler
+from database.migrations import MIGRATIONS, rebuild_checkpoints, rebuild_rollups
+from database.storage_profiles import (
+    STORAGE_PROFILE_KEY, STORAGE_PROFILES, StorageProfile, get_profile,
+)
+from utils.constants import DB_FILE, db_file_for_year
+
+
+# Idle read-only connections kept open for reuse by background threads.
+READER_POOL_SIZE = 4
+
+# SQLite allows ten attached databases per connection; keep one spare.
+MAX_PRIOR_YEARS = 9
+
+_YEAR_FILE = re.compile(r"^budget_(\d{4})\.db$")
+
+
+def _federated_view(name: str, select: str, period_column: str, prior_years: list[int]) -> str:
+    """SQL for a temp view unifying one query across the year files.
+
+    `select` is formatted with each file's schema. Ids are local to each file,
+    so the query should carry account and category names. Each period is served
+    by exactly one file: its own year's file when one is attached, the current
+    file otherwise. `period_column` holds a 'YYYY-MM' or 'YYYY-MM-DD' string.
+    """
+    years = ", ".join(f"'{y}'" for y in prior_years)
+    branches = [
+        select.format(schema="main")
+        + (f" WHERE substr({period_column}, 1, 4) NOT IN ({years})" if years else "")
+    ]
+    branches += [
+        select.format(schema=f"y{y}")
+        + f" WHERE {period_column} >= '{y}' AND {period_column} < '{y + 1}'"
+        for y in prior_years
+    ]
+    return f"CREATE TEMP VIEW {name} AS" + "\n            UNION ALL".join(branches)
+
+
+def _ledger_transactions_view(prior_years: list[int]) -> str:
+    """SQL for the temp view unifying transactions across the year files."""
+    return _federated_view("ledger_transactions", """
+            SELECT a.name AS account_name, c.name AS category_name,
+                   c.color_hex, t.date, t.type, t.amount * t.direction AS signed_amount,
+                   t.recurring_rule_id IS NOT NULL AS is_recurring
+            FROM {schema}.transactions t
+            JOIN {schema}.accounts a ON a.id = t.account_id
+            LEFT JOIN {schema}.categories c ON c.id = t.category_id""",
+        "t.date", prior_years)
 
 
 class DatabaseManager:
+    """Owns the SQLite connections for one database file.
+
+    The thread that creates the manager (the Tk main thread) gets the single
+    writer connection. Any other thread gets its own read-only WAL reader,
+    leased from a small pool, so background report queries never queue behind
+    — or see the uncommitted state of — the writer.
+    """
+
     def __init__(self, db_path: str | None = None):
         self.db_path = db_path or DB_FILE
         self._conn: sqlite3.Connection | None = None
+        self._writer_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._leased_readers: set[sqlite3.Connection] = set()
+        self._closed = False
+        self._tx_depth = 0
+        self._prior_years: dict[int, str] = {}
+        self._archived_years: set[int] = set()
+        self.changes = ChangeBus()
+        self.maintenance = MaintenanceScheduler(self)
+        self.backups = BackupManager(self)
+        self._data_version: int | None = None
+        # Replaced by the saved choice when the writer connection opens
+        self._storage_profile = get_profile(None)
 
     def get_connection(self) -> sqlite3.Connection:
+        """Return the connection for the calling thread.
+
+        The writer thread always gets the writer connection; other threads get
+        their own read-only reader connection.
+        """
+        if threading.get_ident() != self._writer_thread:
+            return self._get_reader()
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            # uri=True only so ATTACH accepts the read-only file: URIs; a plain
+            # path is still opened as a plain path
+            self._conn = sqlite3.connect(self.db_path, uri=True, check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
             self._conn.execute("PRAGMA foreign_keys = ON")
+            # Takes effect only on a new, empty file (see database.maintenance),
+            # and only before it is switched to WAL
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
             self._conn.execute("PRAGMA journal_mode = WAL")
+            self._storage_profile = get_profile(self._saved_profile_name(self._conn))
+            self._configure(self._conn, writer=True)
+            self._federate(self._conn)
         return self._conn
 
-    def initialize(self):
-        """Create schema and seed defaults."""
-        conn = self.get_connection()
-        self._create_schema(conn)
-        self._migrate_schema(conn)
-        self._seed_defaults(conn)
-        conn.commit()
-
-    def _migrate_schema(self, conn: sqlite3.Connection):
-        """Idempotent ALTER TABLE for columns added after initial release."""
-        cols = {row[1] for row in conn.execute("PRAGMA table_info(accounts)").fetchall()}
-        if "account_type" not in cols:
-            conn.execute(
-                "ALTER TABLE accounts ADD COLUMN account_type TEXT NOT NULL DEFAULT 'checking'"
-            )
-        if "opening_balance" not in cols:
-            conn.execute(
-                "ALTER TABLE accounts ADD COLUMN opening_balance REAL NOT NULL DEFAULT 0.0"
-            )
+    def _get_reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "reader", None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            conn = self._idle_readers.pop() if self._idle_readers else None
+        if conn is None:
+            conn = self._open_reader()
+        with self._lock:
+            self._leased_readers.add(conn)
+        self._local.reader = conn
+        # Hand the reader back to the pool once the thread object is gone
+        weakref.finalize(threading.current_thread(), self._release_reader, conn)
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        self._configure(conn, writer=False)
+        # Temp views cannot be created once query_only is on
+        self._federate(conn)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _release_reader(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._leased_readers.discard(conn)
+            if not self._closed and len(self._idle_readers) < READER_POOL_SIZE:
+                if not conn.in_transaction:
+                    # Pick up a storage profile chosen while it was leased
+                    self._configure(conn, writer=False)
+                    self._idle_readers.append(conn)
+                    return
+        conn.close()
+
+    # ── Prior-year federation ────────────────────────────────────────────────
+    def attach_prior_years(self, paths: dict[int, str]):
+        """Federate earlier budget_YYYY.db files into every connection, read-only.
+
+        Each file is first brought up to the current schema and compacted into
+        an archive snapshot (see database.archive), then attached as schema
+        "yYYYY". Only the newest MAX_PRIOR_YEARS files are used; a file that
+        cannot be opened is skipped, and one that cannot be archived (for
+        instance because another process still has it open) is attached as it
+        is.
+        """
+        for year in sorted(paths, reverse=True)[:MAX_PRIOR_YEARS]:
+            path = paths[year]
+            if not is_current_archive(path):
+                try:
+                    prior = DatabaseManager(path)
+                    try:
+                        prior.initialize()
+                    finally:
+                        prior.close()
+                except sqlite3.Error:
+                    continue
+                try:
+                    archive_year(path, year)
+                except (sqlite3.Error, OSError):
+                    pass
+            if is_current_archive(path):
+                self._archived_years.add(year)
+            self._prior_years[year] = path
+        if self._conn is not None:
+            self._federate(self._conn)
+        # Pooled readers were opened without the new files; open fresh ones
+        self._close_idle_readers()
+
+    def _close_idle_readers(self):
+        with self._lock:
+            idle, self._idle_readers = self._idle_readers, []
+        for conn in idle:
+            conn.close()
 
-    def _create_schema(self, conn: sqlite3.Connection):
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS accounts (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                name            TEXT    NOT NULL UNIQUE,
-                description     TEXT    NOT NULL DEFAULT '',
-                account_type    TEXT    NOT NULL DEFAULT 'checking',
-                opening_balance REAL    NOT NULL DEFAULT 0.0,
-                created_at      TEXT    NOT NULL DEFAULT (datetime('now'))
-            );
-
-            CREATE TABLE IF NOT EXISTS categories (
-                id         INTEGER PRIMARY KEY AUTOINCREMENT,
-                name       TEXT NOT NULL UNIQUE,
-                type       TEXT NOT NULL CHECK(type IN ('income','expense','both')),
-                color_hex  TEXT NOT NULL DEFAULT '#888888',
-                is_system  INTEGER NOT NULL DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS recurring_rules (
-                id            INTEGER PRIMARY KEY AUTOINCREMENT,
-                name          TEXT NOT NULL,
-                type          TEXT NOT NULL CHECK(type IN ('income','expense')),
-                amount        REAL NOT NULL CHECK(amount > 0),
-                account_id    INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
-                category_id   INTEGER NOT NULL REFERENCES categories(id),
-                description   TEXT NOT NULL DEFAULT '',
-                frequency     TEXT NOT NULL CHECK(frequency IN ('monthly','weekly','yearly')),
-                day_of_month  INTEGER,
-                day_of_week   INTEGER,
-                month_of_year INTEGER,
-                start_date    TEXT NOT NULL,
-                end_date      TEXT,
-                is_active     INTEGER NOT NULL DEFAULT 1,
-                last_applied  TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS transactions (
-                id                INTEGER PRIMARY KEY AUTOINCREMENT,
-                account_id        INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
-                type              TEXT NOT NULL CHECK(type IN ('income','expense','transfer')),
-                amount            REAL NOT NULL CHECK(amount > 0),
-                category_id       INTEGER REFERENCES categories(id) ON DELETE RESTRICT,
-                description       TEXT NOT NULL DEFAULT '',
-                date              TEXT NOT NULL,
-                cleared           INTEGER NOT NULL DEFAULT 0,
-                transfer_pair_id  INTEGER,
-                recurring_rule_id INTEGER REFERENCES recurring_rules(id) ON DELETE SET NULL,
-                created_at        TEXT NOT NULL DEFAULT (datetime('now')),
-                updated_at        TEXT NOT NULL DEFAULT (datetime('now'))
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_transactions_account_id   ON transactions(account_id);
-            CREATE INDEX IF NOT EXISTS idx_transactions_date         ON transactions(date);
-            CREATE INDEX IF NOT EXISTS idx_transactions_category_id  ON transactions(category_id);
-            CREATE INDEX IF NOT EXISTS idx_transactions_transfer_pair ON transactions(transfer_pair_id);
-            CREATE INDEX IF NOT EXISTS idx_budgets_month             ON budgets(month);
-
-            CREATE TABLE IF NOT EXISTS budgets (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_id  INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
-                month        TEXT NOT NULL,
-                limit_amount REAL NOT NULL CHECK(limit_amount >= 0),
-                UNIQUE(category_id, month)
-            );
-
-            CREATE TABLE IF NOT EXISTS app_settings (
-                key   TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS dismissed_reminders (
-                key     TEXT PRIMARY KEY,
-                expires TEXT NOT NULL
-            );
-        """)
-
-    def _seed_defaults(self, conn: sqlite3.Connection):
-        # Default settings
-        defaults = [
-            ("appearance_mode", "system"),
-            ("currency_symbol", "$"),
-            ("budget_alert_threshold", "0.80"),
-            ("last_account_id", ""),
-            ("date_format", "MM/DD/YYYY"),
-        ]
-        for key, value in defaults:
-            conn.execute(
-                "INSERT OR IGNORE INTO app_settings(key, value) VALUES (?, ?)",
-                (key, value),
-            )
+    def schema_for_date(self, date_str: str) -> str:
+        """Schema holding the ledger for the year of date_str (YYYY-MM[-DD])."""
+        year = int(date_str[:4])
+        return f"y{year}" if year in self._prior_years else "main"
+
+    def is_archived(self, schema: str) -> bool:
+        """True if `schema` is an attached archive snapshot (database.archive)."""
+        return schema.startswith("y") and int(schema[1:]) in self._archived_years
+
+    def _federate(self, conn: sqlite3.Connection):
+        """Attach any prior-year files `conn` lacks and (re)create the unified views."""
+        attached = {row[1] for row in conn.execute("PRAGMA database_list").fetchall()}
+        for year, path in sorted(self._prior_years.items()):
+            if f"y{year}" not in attached:
+                uri = Path(path).resolve().as_uri() + "?mode=ro"
+                if year in self._archived_years:
+                    uri += "&immutable=1"
+                conn.execute(f"ATTACH DATABASE ? AS y{year}", (uri,))
+        prior_years = sorted(self._prior_years, reverse=True)
+        conn.execute("DROP VIEW IF EXISTS temp.ledger_transactions")
+        conn.execute(_ledger_transactions_view(prior_years))
 
-        # Default categories
-        for cat in DEFAULT_CATEGORIES:
-            conn.execute(
-                """INSERT OR IGNORE INTO categories(name, type, color_hex, is_system)
-                   VALUES (?, ?, ?, ?)""",
-                (cat["name"], cat["type"], cat["color_hex"], cat["is_system"]),
-            )
+    @staticmethod
+    def _prior_year_files(folder: str, current_year: int) -> dict[int, str]:
+        """{year: path} for every budget_YYYY.db in folder older than current_year."""
+        found = {}
+        for name in os.listdir(folder):
+            match = _YEAR_FILE.match(name)
+            if match and int(match.group(1)) < current_year:
+                found[int(match.group(1))] = os.path.join(folder, name)
+        return found
+
+    # ── Storage profile ──────────────────────────────────────────────────────
+    @property
+    def storage_profile(self) -> StorageProfile:
+        """The profile the connections are tuned with (see database.storage_profiles)."""
+        return self._storage_profile
+
+    def set_storage_profile(self, name: str):
+        """Save `name` as the storage profile and apply it to the writer.
+
+        Idle readers are closed so the pool reopens them with the new settings;
+        readers leased to running threads pick them up when handed back.
+        """
+        if name not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile '{name}'.")
+        self.set_setting(STORAGE_PROFILE_KEY, name)
+        self._storage_profile = STORAGE_PROFILES[name]
+        self._configure(self.get_connection(), writer=True)
+        self._close_idle_readers()
+
+    def _configure(self, conn: sqlite3.Connection, writer: bool):
+        for statement in self._storage_profile.pragmas(writer):
+            conn.execute(statement)
+
+    @staticmethod
+    def _saved_profile_name(conn: sqlite3.Connection) -> str | None:
+        try:
+            row = conn.execute(
+                "SELECT value FROM app_settings WHERE key = ?", (STORAGE_PROFILE_KEY,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None  # a new file, not migrated yet
+        return row[0] if row else None
+
+    def initialize(self):
+        """Run any pending schema migrations.
 
-        # Default account
-        conn.execute(
-            "INSERT OR IGNORE INTO accounts(name, description) VALUES (?, ?)",
-            (DEFAULT_ACCOUNT_NAME, "Primary checking account"),
-        )
+        Each migration commits together with its PRAGMA user_version bump, so an
+        interrupted upgrade resumes where it stopped. A database that is already
+        current costs one PRAGMA read and no schema or seed work.
+        """
+        conn = self.get_connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= MIGRATIONS[-1][0]:
+            return
+        # Off while migrating so a table can be rebuilt without its drop
+        # cascading; it cannot be changed inside a transaction
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            for number, _description, migrate in MIGRATIONS:
+                if number <= version:
+                    continue
+                with self.transaction() as conn:
+                    migrate(conn)
+                    conn.execute(f"PRAGMA user_version = {number}")
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+    def rebuild_rollups(self):
+        """Recompute monthly_rollups and balance_checkpoints from the transactions table.
+
+        The triggers keep both tables exact; this is to repair a database that
+        was edited by hand.
+        """
+        with self.transaction() as conn:
+            rebuild_rollups(conn)
+            rebuild_checkpoints(conn)
+            self.changes.publish(Change("transaction"))
+
+    @contextmanager
+    def transaction(self):
+        """Unit of work on the writer connection; yields the connection.
+
+        The outermost scope commits on success and rolls back on error. A nested
+        scope is a SAVEPOINT: its writes commit with the outermost scope, and an
+        error inside it undoes only its own writes before propagating. DAO writes
+        open a scope of their own, so a standalone call commits immediately while
+        calls inside a service's scope share one commit.
+        """
+        if threading.get_ident() != self._writer_thread:
+            raise sqlite3.ProgrammingError(
+                "Writes must run on the thread that opened the database."
+            )
+        conn = self.get_connection()
+        depth = self._tx_depth
+        if depth:
+            conn.execute(f"SAVEPOINT uow_{depth}")
+        else:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            self.changes.hold()
+        mark = self.changes.mark()
+        self._tx_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._tx_depth -= 1
+            if depth and conn.in_transaction:
+                conn.execute(f"ROLLBACK TO uow_{depth}")
+                conn.execute(f"RELEASE uow_{depth}")
+                self.changes.discard(mark)
+            elif not depth:
+                conn.rollback()
+                self.changes.discard()
+            raise
+        self._tx_depth -= 1
+        if depth:
+            conn.execute(f"RELEASE uow_{depth}")
+        else:
+            try:
+                conn.commit()
+            except BaseException:
+                self.changes.discard()
+                raise
+            self.changes.release()
+
+    def poll_external_changes(self) -> bool:
+        """Publish a change of unknown scope to every entity if another
+        connection has committed to the database since the last poll.
+
+        PRAGMA data_version on the writer only moves for commits made through
+        other connections, such as another instance of the app.
+        """
+        version = self.get_connection().execute("PRAGMA data_version").fetchone()[0]
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        if changed:
+            self.changes.publish_all()
+        return changed
+
+    def insert_many(self, sql: str, rows) -> list[int]:
+        """Run one INSERT per parameter tuple with executemany, in one unit of work,
+        and return the new rowids in order without reading the rows back.
+
+        The ids are consecutive because the writer is the only connection that
+        inserts, so the tables' AUTOINCREMENT hands them out in sequence.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        with self.transaction() as conn:
+            conn.executemany(sql, rows)
+            last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last - len(rows) + 1, last + 1))
 
     def get_setting(self, key: str, default: str = "") -> str:
         conn = self.get_connection()
@@ -151,12 +374,11 @@ class DatabaseManager:
         return row["value"] if row else default
 
     def set_setting(self, key: str, value: str):
-        conn = self.get_connection()
-        conn.execute(
-            "INSERT OR REPLACE INTO app_settings(key, value) VALUES (?, ?)",
-            (key, value),
-        )
-        conn.commit()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO app_settings(key, value) VALUES (?, ?)",
+                (key, value),
+            )
 
     @staticmethod
     def open_for_current_year(db_folder: str | None = None) -> "DatabaseManager":
@@ -191,6 +413,11 @@ class DatabaseManager:
         db = DatabaseManager(current_db_path)
         db.initialize()
 
+        # Before the carryover, so the previous year is on the current schema
+        db.attach_prior_years(DatabaseManager._prior_year_files(
+            os.path.dirname(os.path.abspath(current_db_path)), current_year
+        ))
+
         # Budget carryover from previous year when this DB is new or incomplete
         if os.path.exists(prev_db_path):
             month_count = db.get_connection().execute(
@@ -198,7 +425,6 @@ class DatabaseManager:
             ).fetchone()[0]
             if month_count < 12:
                 DatabaseManager._carry_over_budgets(prev_db_path, db, current_year)
-
         return db
 
     @staticmethod
@@ -245,22 +471,29 @@ class DatabaseManager:
             if not rows:
                 return
 
-            conn = current_db.get_connection()
-            for month_num in range(1, 13):
-                month_str = f"{current_year}-{month_num:02d}"
-                for row in rows:
-                    conn.execute(
-                        """INSERT INTO budgets(category_id, month, limit_amount)
-                           VALUES (?, ?, ?)
-                           ON CONFLICT(category_id, month)
-                           DO UPDATE SET limit_amount = excluded.limit_amount""",
-                        (row["category_id"], month_str, row["limit_amount"]),
-                    )
-            conn.commit()
+            from database.budget_dao import BudgetDAO
+            BudgetDAO(current_db).upsert_many(
+                (row["category_id"], f"{current_year}-{month_num:02d}", row["limit_amount"])
+                for month_num in range(1, 13)
+                for row in rows
+            )
         except Exception:
             pass  # Carryover is best-effort; never crash startup
 
     def close(self):
+        """Close the writer and every reader. Safe to call more than once."""
+        if self._conn is not None and not self._closed:
+            self.maintenance.on_close()
+        with self._lock:
+            self._closed = True
+            readers = self._idle_readers + list(self._leased_readers)
+            self._idle_readers = []
+            self._leased_readers = set()
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
         if self._conn:
             self._conn.close()
             self._conn = None
@@ -9,20 +9,18 @@ class DismissedReminderDAO:
 
     def dismiss(self, key: str, expires: str) -> None:
         """Insert or replace a dismissal record. expires is YYYY-MM-DD."""
-        conn = self._db.get_connection()
-        conn.execute(
-            "INSERT OR REPLACE INTO dismissed_reminders(key, expires) VALUES (?, ?)",
-            (key, expires),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dismissed_reminders(key, expires) VALUES (?, ?)",
+                (key, expires),
+            )
 
     def get_active_keys(self, ref_date: str) -> set[str]:
         """Purge expired rows, then return the set of non-expired dismissed keys."""
-        conn = self._db.get_connection()
-        conn.execute(
-            "DELETE FROM dismissed_reminders WHERE expires < ?", (ref_date,)
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "DELETE FROM dismissed_reminders WHERE expires < ?", (ref_date,)
+            )
         rows = conn.execute(
             "SELECT key FROM dismissed_reminders WHERE expires >= ?", (ref_date,)
         ).fetchall()
@@ -30,6 +28,5 @@ class DismissedReminderDAO:
 
     def undismiss(self, key: str) -> None:
         """Remove a specific dismissal record."""
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM dismissed_reminders WHERE key = ?", (key,))
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM dismissed_reminders WHERE key = ?", (key,))
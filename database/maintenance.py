@@ -0,0 +1,117 @@
+"""Housekeeping SQLite does not do on its own.
+
+The scheduler checkpoints the WAL once the app has gone idle after writing,
+refreshes the planner statistics after bulk imports (ANALYZE) and on close
+(PRAGMA optimize), and compacts the file on request. All of it runs on the
+writer connection, on the thread that owns it, and only touches the main
+schema: attached prior-year files are read-only.
+
+The time each task last ran is kept in app_settings for the report shown in
+Settings.
+"""
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from database.changes import Change
+
+if TYPE_CHECKING:
+    from database.db_manager import DatabaseManager
+
+# Quiet period after the last committed write before the WAL is checkpointed.
+IDLE_SECONDS = 30
+
+# Free pages handed back to the file system per idle pass.
+INCREMENTAL_VACUUM_PAGES = 1000
+
+TASKS = ("checkpoint", "analyze", "optimize", "vacuum")
+
+_AUTO_VACUUM_MODES = ("none", "full", "incremental")
+
+
+class MaintenanceScheduler:
+    def __init__(self, db: "DatabaseManager"):
+        self._db = db
+        self._last_write: float | None = None
+        db.changes.subscribe(self._on_change)
+
+    def _on_change(self, _change: Change):
+        self._last_write = time.monotonic()
+
+    def on_idle(self) -> bool:
+        """Checkpoint the WAL, and release free pages if the file uses
+        incremental auto-vacuum, once IDLE_SECONDS have passed since the last
+        write. Returns True if it ran.
+
+        The checkpoint is PASSIVE: it copies what no reader still needs and
+        never waits for a reader, so it cannot stall the UI.
+        """
+        if self._last_write is None or time.monotonic() - self._last_write < IDLE_SECONDS:
+            return False
+        conn = self._db.get_connection()
+        if conn.in_transaction:
+            return False
+        self._last_write = None
+        # Recorded first so the setting's own write is checkpointed too
+        self._record("checkpoint")
+        conn.execute("PRAGMA main.wal_checkpoint(PASSIVE)")
+        if self._pragma(conn, "auto_vacuum") == 2:
+            conn.execute(f"PRAGMA main.incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+        return True
+
+    def analyze(self):
+        """Rebuild the planner statistics, e.g. after a bulk import."""
+        with self._db.transaction() as conn:
+            conn.execute("ANALYZE main")
+        self._record("analyze")
+
+    def on_close(self):
+        """Let SQLite refresh whatever statistics this session's queries
+        showed to be stale. Best effort: a failure never blocks closing."""
+        try:
+            self._db.get_connection().execute("PRAGMA main.optimize")
+            self._record("optimize")
+        except sqlite3.Error:
+            pass
+
+    def compact(self):
+        """Rewrite the file without its free pages and switch it to
+        incremental auto-vacuum, so later idle passes keep it compact."""
+        conn = self._db.get_connection()
+        conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM main")
+        self._record("vacuum")
+
+    def report(self) -> dict:
+        """Size and housekeeping state of the current year's file.
+
+        Keys: page_size, page_count, freelist_count (pages), file_bytes,
+        wal_bytes, auto_vacuum ('none' | 'full' | 'incremental') and
+        last_run {task: ISO timestamp or ''}.
+        """
+        conn = self._db.get_connection()
+        page_size = self._pragma(conn, "page_size")
+        page_count = self._pragma(conn, "page_count")
+        wal = self._db.db_path + "-wal"
+        return {
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": self._pragma(conn, "freelist_count"),
+            "file_bytes": page_size * page_count,
+            "wal_bytes": os.path.getsize(wal) if os.path.exists(wal) else 0,
+            "auto_vacuum": _AUTO_VACUUM_MODES[self._pragma(conn, "auto_vacuum")],
+            "last_run": {task: self._db.get_setting(_setting_key(task)) for task in TASKS},
+        }
+
+    def _record(self, task: str):
+        self._db.set_setting(_setting_key(task), datetime.now().isoformat(timespec="seconds"))
+
+    @staticmethod
+    def _pragma(conn: sqlite3.Connection, name: str) -> int:
+        return conn.execute(f"PRAGMA main.{name}").fetchone()[0]
+
+
+def _setting_key(task: str) -> str:
+    return f"maintenance_last_{task}"
@@ -0,0 +1,538 @@
+"""Numbered schema migrations for the year databases.
+
+PRAGMA user_version holds the number of the last migration applied.
+DatabaseManager.initialize() runs the pending ones in order, each in its own
+transaction together with the version bump, and does no schema or seed work
+at all when the database is already current. Append new migrations to
+MIGRATIONS; never edit or renumber one that has shipped.
+"""
+import re
+import sqlite3
+from utils.constants import DEFAULT_CATEGORIES, DEFAULT_ACCOUNT_NAME
+
+
+def _signed_amount(row: str) -> str:
+    """SQL for a transaction row's effect on its account balance."""
+    return f"({row}.amount * {row}.direction)"
+
+
+def _ensure_checkpoint(row: str) -> str:
+    """SQL creating the checkpoint for the month of `row` if it is missing, seeded
+    from the nearest earlier checkpoint plus the rows in between."""
+    month = f"substr({row}.date, 1, 7)"
+    prev = f"""FROM balance_checkpoints c
+                   WHERE c.account_id = {row}.account_id AND c.month < {month}
+                   ORDER BY c.month DESC LIMIT 1"""
+    return f"""
+                INSERT INTO balance_checkpoints(account_id, month, opening_balance)
+                SELECT {row}.account_id, {month},
+                    COALESCE((SELECT c.opening_balance {prev}), 0)
+                    + COALESCE((
+                        SELECT SUM({_signed_amount("t")}) FROM transactions t
+                        WHERE t.account_id = {row}.account_id
+                          AND t.date >= COALESCE((SELECT c.month {prev}) || '-01', '')
+                          AND t.date < {month} || '-01'
+                    ), 0)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM balance_checkpoints
+                    WHERE account_id = {row}.account_id AND month = {month}
+                );"""
+
+
+def _shift_checkpoints(row: str, sign: str) -> str:
+    """SQL adding (sign '+') or removing (sign '-') `row` from every later checkpoint."""
+    return f"""
+                UPDATE balance_checkpoints
+                SET opening_balance = opening_balance {sign} {_signed_amount(row)}
+                WHERE account_id = {row}.account_id
+                  AND month > substr({row}.date, 1, 7);"""
+
+
+_CHECKPOINT_SCHEMA = f"""
+            -- Account balance before the first transaction of each month that has had
+            -- activity; the register starts its running balance from these.
+            CREATE TABLE IF NOT EXISTS balance_checkpoints (
+                account_id      INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+                month           TEXT    NOT NULL,
+                opening_balance REAL    NOT NULL,
+                PRIMARY KEY (account_id, month)
+            ) WITHOUT ROWID;
+
+            CREATE TRIGGER IF NOT EXISTS trg_checkpoints_insert
+            AFTER INSERT ON transactions
+            BEGIN{_ensure_checkpoint("NEW")}{_shift_checkpoints("NEW", "+")}
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_checkpoints_delete
+            AFTER DELETE ON transactions
+            BEGIN{_shift_checkpoints("OLD", "-")}
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_checkpoints_update
+            AFTER UPDATE OF account_id, date, amount, direction ON transactions
+            BEGIN{_shift_checkpoints("OLD", "-")}{_ensure_checkpoint("NEW")}{_shift_checkpoints("NEW", "+")}
+            END;
+"""
+
+
+_BASE_SCHEMA = """
+            CREATE TABLE IF NOT EXISTS accounts (
+                id              INTEGER PRIMARY KEY AUTOINCREMENT,
+                name            TEXT    NOT NULL UNIQUE,
+                description     TEXT    NOT NULL DEFAULT '',
+                account_type    TEXT    NOT NULL DEFAULT 'checking',
+                opening_balance REAL    NOT NULL DEFAULT 0.0,
+                created_at      TEXT    NOT NULL DEFAULT (datetime('now'))
+            );
+
+            CREATE TABLE IF NOT EXISTS categories (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                name       TEXT NOT NULL UNIQUE,
+                type       TEXT NOT NULL CHECK(type IN ('income','expense','both')),
+                color_hex  TEXT NOT NULL DEFAULT '#888888',
+                is_system  INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS recurring_rules (
+                id            INTEGER PRIMARY KEY AUTOINCREMENT,
+                name          TEXT NOT NULL,
+                type          TEXT NOT NULL CHECK(type IN ('income','expense')),
+                amount        REAL NOT NULL CHECK(amount > 0),
+                account_id    INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+                category_id   INTEGER NOT NULL REFERENCES categories(id),
+                description   TEXT NOT NULL DEFAULT '',
+                frequency     TEXT NOT NULL CHECK(frequency IN ('monthly','weekly','yearly')),
+                day_of_month  INTEGER,
+                day_of_week   INTEGER,
+                month_of_year INTEGER,
+                start_date    TEXT NOT NULL,
+                end_date      TEXT,
+                is_active     INTEGER NOT NULL DEFAULT 1,
+                last_applied  TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS transactions (
+                id                INTEGER PRIMARY KEY AUTOINCREMENT,
+                account_id        INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+                type              TEXT NOT NULL CHECK(type IN ('income','expense','transfer')),
+                amount            REAL NOT NULL CHECK(amount > 0),
+                category_id       INTEGER REFERENCES categories(id) ON DELETE RESTRICT,
+                description       TEXT NOT NULL DEFAULT '',
+                date              TEXT NOT NULL,
+                cleared           INTEGER NOT NULL DEFAULT 0,
+                direction         INTEGER NOT NULL DEFAULT -1 CHECK(direction IN (-1, 1)),
+                transfer_pair_id  INTEGER,
+                recurring_rule_id INTEGER REFERENCES recurring_rules(id) ON DELETE SET NULL,
+                created_at        TEXT NOT NULL DEFAULT (datetime('now')),
+                updated_at        TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_transactions_date         ON transactions(date);
+            CREATE INDEX IF NOT EXISTS idx_transactions_category_id  ON transactions(category_id);
+            CREATE INDEX IF NOT EXISTS idx_transactions_transfer_pair ON transactions(transfer_pair_id);
+            CREATE INDEX IF NOT EXISTS idx_transactions_type_date_category
+                ON transactions(type, date, category_id, amount);
+
+            -- Allocates transfer_pair_id values; AUTOINCREMENT never hands out an id twice.
+            CREATE TABLE IF NOT EXISTS transfer_pairs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT
+            );
+
+            CREATE TABLE IF NOT EXISTS budgets (
+                id           INTEGER PRIMARY KEY AUTOINCREMENT,
+                category_id  INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+                month        TEXT NOT NULL,
+                limit_amount REAL NOT NULL CHECK(limit_amount >= 0),
+                UNIQUE(category_id, month)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_budgets_month             ON budgets(month);
+
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS dismissed_reminders (
+                key     TEXT PRIMARY KEY,
+                expires TEXT NOT NULL
+            );
+
+            -- Per account/category/month/type sums, kept exact by the triggers below.
+            -- category_id 0 stands for "no category" (transfers).
+            CREATE TABLE IF NOT EXISTS monthly_rollups (
+                account_id      INTEGER NOT NULL,
+                category_id     INTEGER NOT NULL,
+                month           TEXT    NOT NULL,
+                type            TEXT    NOT NULL,
+                total           REAL    NOT NULL DEFAULT 0,
+                tx_count        INTEGER NOT NULL DEFAULT 0,
+                recurring_total REAL    NOT NULL DEFAULT 0,
+                recurring_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (account_id, category_id, month, type)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_monthly_rollups_month
+                ON monthly_rollups(month, type, category_id);
+
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_insert
+            AFTER INSERT ON transactions
+            BEGIN
+                INSERT INTO monthly_rollups
+                    (account_id, category_id, month, type,
+                     total, tx_count, recurring_total, recurring_count)
+                VALUES (
+                    NEW.account_id, COALESCE(NEW.category_id, 0),
+                    substr(NEW.date, 1, 7), NEW.type, NEW.amount, 1,
+                    CASE WHEN NEW.recurring_rule_id IS NULL THEN 0 ELSE NEW.amount END,
+                    NEW.recurring_rule_id IS NOT NULL
+                )
+                ON CONFLICT(account_id, category_id, month, type) DO UPDATE SET
+                    total           = total + excluded.total,
+                    tx_count        = tx_count + 1,
+                    recurring_total = recurring_total + excluded.recurring_total,
+                    recurring_count = recurring_count + excluded.recurring_count;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_delete
+            AFTER DELETE ON transactions
+            BEGIN
+                UPDATE monthly_rollups SET
+                    total           = total - OLD.amount,
+                    tx_count        = tx_count - 1,
+                    recurring_total = recurring_total
+                        - CASE WHEN OLD.recurring_rule_id IS NULL THEN 0 ELSE OLD.amount END,
+                    recurring_count = recurring_count - (OLD.recurring_rule_id IS NOT NULL)
+                WHERE account_id = OLD.account_id
+                  AND category_id = COALESCE(OLD.category_id, 0)
+                  AND month = substr(OLD.date, 1, 7)
+                  AND type = OLD.type;
+                DELETE FROM monthly_rollups
+                WHERE account_id = OLD.account_id
+                  AND category_id = COALESCE(OLD.category_id, 0)
+                  AND month = substr(OLD.date, 1, 7)
+                  AND type = OLD.type
+                  AND tx_count = 0;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_update
+            AFTER UPDATE OF account_id, category_id, date, type, amount, recurring_rule_id
+            ON transactions
+            BEGIN
+                UPDATE monthly_rollups SET
+                    total           = total - OLD.amount,
+                    tx_count        = tx_count - 1,
+                    recurring_total = recurring_total
+                        - CASE WHEN OLD.recurring_rule_id IS NULL THEN 0 ELSE OLD.amount END,
+                    recurring_count = recurring_count - (OLD.recurring_rule_id IS NOT NULL)
+                WHERE account_id = OLD.account_id
+                  AND category_id = COALESCE(OLD.category_id, 0)
+                  AND month = substr(OLD.date, 1, 7)
+                  AND type = OLD.type;
+                DELETE FROM monthly_rollups
+                WHERE account_id = OLD.account_id
+                  AND category_id = COALESCE(OLD.category_id, 0)
+                  AND month = substr(OLD.date, 1, 7)
+                  AND type = OLD.type
+                  AND tx_count = 0;
+                INSERT INTO monthly_rollups
+                    (account_id, category_id, month, type,
+                     total, tx_count, recurring_total, recurring_count)
+                VALUES (
+                    NEW.account_id, COALESCE(NEW.category_id, 0),
+                    substr(NEW.date, 1, 7), NEW.type, NEW.amount, 1,
+                    CASE WHEN NEW.recurring_rule_id IS NULL THEN 0 ELSE NEW.amount END,
+                    NEW.recurring_rule_id IS NOT NULL
+                )
+                ON CONFLICT(account_id, category_id, month, type) DO UPDATE SET
+                    total           = total + excluded.total,
+                    tx_count        = tx_count + 1,
+                    recurring_total = recurring_total + excluded.recurring_total,
+                    recurring_count = recurring_count + excluded.recurring_count;
+            END;
+"""
+
+
+def run_script(conn: sqlite3.Connection, script: str):
+    """Execute a multi-statement script one statement at a time.
+    Unlike executescript() it does not commit first, so it stays inside the
+    caller's transaction."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+def rebuild_rollups(conn: sqlite3.Connection):
+    conn.execute("DELETE FROM monthly_rollups")
+    conn.execute("""
+        INSERT INTO monthly_rollups
+            (account_id, category_id, month, type,
+             total, tx_count, recurring_total, recurring_count)
+        SELECT account_id, COALESCE(category_id, 0), substr(date, 1, 7), type,
+               SUM(amount), COUNT(*),
+               SUM(CASE WHEN recurring_rule_id IS NULL THEN 0 ELSE amount END),
+               SUM(recurring_rule_id IS NOT NULL)
+        FROM transactions
+        GROUP BY account_id, COALESCE(category_id, 0), substr(date, 1, 7), type
+    """)
+
+
+def rebuild_checkpoints(conn: sqlite3.Connection):
+    conn.execute("DELETE FROM balance_checkpoints")
+    conn.execute(f"""
+        INSERT INTO balance_checkpoints(account_id, month, opening_balance)
+        SELECT account_id, month,
+               COALESCE(SUM(net) OVER (
+                   PARTITION BY account_id ORDER BY month
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0)
+        FROM (
+            SELECT t.account_id, substr(t.date, 1, 7) AS month,
+                   SUM({_signed_amount("t")}) AS net
+            FROM transactions t
+            GROUP BY t.account_id, substr(t.date, 1, 7)
+        )
+    """)
+
+
+def _column_names(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _drop_checkpoint_triggers(conn: sqlite3.Connection):
+    for name in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_checkpoints_{name}")
+
+
+def _add_transfer_direction(conn: sqlite3.Connection):
+    """Store each row's balance direction instead of inferring it.
+
+    Transfers used to be read as "the lower id of a pair is the debit"; that
+    convention is written out once here.
+    """
+    conn.execute(
+        "ALTER TABLE transactions ADD COLUMN direction INTEGER NOT NULL DEFAULT -1"
+        " CHECK(direction IN (-1, 1))"
+    )
+    conn.execute("""
+        UPDATE transactions SET direction = 1
+        WHERE type = 'income'
+           OR (type = 'transfer' AND EXISTS (
+                   SELECT 1 FROM transactions p
+                   WHERE p.transfer_pair_id = transactions.transfer_pair_id
+                     AND p.id < transactions.id
+               ))
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO transfer_pairs(id)
+        SELECT DISTINCT transfer_pair_id FROM transactions
+        WHERE transfer_pair_id IS NOT NULL
+    """)
+
+
+def _seed_defaults(conn: sqlite3.Connection):
+    # Default settings
+    defaults = [
+        ("appearance_mode", "system"),
+        ("currency_symbol", "$"),
+        ("budget_alert_threshold", "0.80"),
+        ("last_account_id", ""),
+        ("date_format", "MM/DD/YYYY"),
+    ]
+    for key, value in defaults:
+        conn.execute(
+            "INSERT OR IGNORE INTO app_settings(key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    # Default categories
+    for cat in DEFAULT_CATEGORIES:
+        conn.execute(
+            """INSERT OR IGNORE INTO categories(name, type, color_hex, is_system)
+               VALUES (?, ?, ?, ?)""",
+            (cat["name"], cat["type"], cat["color_hex"], cat["is_system"]),
+        )
+
+    # Default account
+    conn.execute(
+        "INSERT OR IGNORE INTO accounts(name, description) VALUES (?, ?)",
+        (DEFAULT_ACCOUNT_NAME, "Primary checking account"),
+    )
+
+
+def _baseline(conn: sqlite3.Connection):
+    """Bring a new database, or one from before versioning, to the baseline schema.
+
+    Databases from before versioning can be in any earlier shape, so every step
+    checks what is already there.
+    """
+    # Older checkpoint triggers must go before any backfill below fires them
+    _drop_checkpoint_triggers(conn)
+    run_script(conn, _BASE_SCHEMA)
+
+    cols = _column_names(conn, "accounts")
+    if "account_type" not in cols:
+        conn.execute(
+            "ALTER TABLE accounts ADD COLUMN account_type TEXT NOT NULL DEFAULT 'checking'"
+        )
+    if "opening_balance" not in cols:
+        conn.execute(
+            "ALTER TABLE accounts ADD COLUMN opening_balance REAL NOT NULL DEFAULT 0.0"
+        )
+    if "direction" not in _column_names(conn, "transactions"):
+        _add_transfer_direction(conn)
+
+    # Covers get_by_account's ordering and the checkpoint/balance sums
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_balance"
+        " ON transactions(account_id, date, direction, amount)"
+    )
+    # Superseded by idx_transactions_balance
+    conn.execute("DROP INDEX IF EXISTS idx_transactions_account_id")
+    conn.execute("DROP INDEX IF EXISTS idx_transactions_account_date")
+
+    run_script(conn, _CHECKPOINT_SCHEMA)
+    rebuild_rollups(conn)
+    rebuild_checkpoints(conn)
+    _seed_defaults(conn)
+
+
+# Columns holding money; stored as integer cents from migration 2 on.
+_MONEY_COLUMNS = {
+    "accounts": ("opening_balance",),
+    "recurring_rules": ("amount",),
+    "transactions": ("amount",),
+    "budgets": ("limit_amount",),
+    "monthly_rollups": ("total", "recurring_total"),
+    "balance_checkpoints": ("opening_balance",),
+}
+
+
+def _integer_cents(conn: sqlite3.Connection):
+    """Rebuild every money column as INTEGER cents.
+
+    A REAL column hands back floats however its values are stored, so each
+    table is recreated from its own definition with the column type changed,
+    following SQLite's procedure for altering a table. initialize() runs
+    migrations with foreign keys off, so dropping accounts does not cascade.
+    Renames use legacy mode because the triggers, which reference the tables
+    by name, are dropped first and recreated at the end.
+    """
+    objects = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master"
+        " WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+        " AND tbl_name IN (%s)" % ", ".join("?" * len(_MONEY_COLUMNS)),
+        tuple(_MONEY_COLUMNS),
+    ).fetchall()
+    for kind, name, _sql in objects:
+        if kind == "trigger":
+            conn.execute(f"DROP TRIGGER {name}")
+    sequences = dict(conn.execute("SELECT name, seq FROM sqlite_sequence").fetchall())
+
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        for table, money in _MONEY_COLUMNS.items():
+            sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            sql = re.sub(
+                rf"^CREATE TABLE(?: IF NOT EXISTS)? {table}\b",
+                f"CREATE TABLE _new_{table}", sql,
+            )
+            for column in money:
+                sql = re.sub(
+                    rf"\b({column}\s+)REAL\b([^,]*?)DEFAULT 0\.0\b",
+                    r"\1INTEGER\2DEFAULT 0", sql,
+                )
+                sql = re.sub(rf"\b({column}\s+)REAL\b", r"\1INTEGER", sql)
+            conn.execute(sql)
+
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            select = ", ".join(
+                f"CAST(ROUND({c} * 100) AS INTEGER)" if c in money else c for c in columns
+            )
+            conn.execute(
+                f"INSERT INTO _new_{table}({', '.join(columns)}) SELECT {select} FROM {table}"
+            )
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE _new_{table} RENAME TO {table}")
+            if table in sequences:
+                conn.execute(
+                    "UPDATE sqlite_sequence SET seq = ? WHERE name = ?",
+                    (sequences[table], table),
+                )
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+
+    for kind, _name, sql in sorted(objects, key=lambda o: o[0] != "index"):
+        conn.execute(sql)
+    # Sums of rounded rows, not rounded sums of the old REAL totals
+    rebuild_rollups(conn)
+    rebuild_checkpoints(conn)
+
+
+_SEARCH_SCHEMA = """
+            -- Full-text index over each transaction's description and category name;
+            -- rowid is the transaction id. prefix= keeps search-as-you-type cheap.
+            CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+                description, category,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '1 2 3'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS trg_fts_insert
+            AFTER INSERT ON transactions
+            BEGIN
+                INSERT INTO transactions_fts(rowid, description, category)
+                VALUES (NEW.id, NEW.description,
+                        COALESCE((SELECT name FROM categories WHERE id = NEW.category_id), ''));
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_fts_delete
+            AFTER DELETE ON transactions
+            BEGIN
+                DELETE FROM transactions_fts WHERE rowid = OLD.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_fts_update
+            AFTER UPDATE OF description, category_id ON transactions
+            BEGIN
+                UPDATE transactions_fts SET
+                    description = NEW.description,
+                    category = COALESCE((SELECT name FROM categories WHERE id = NEW.category_id), '')
+                WHERE rowid = NEW.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_fts_category_rename
+            AFTER UPDATE OF name ON categories
+            BEGIN
+                UPDATE transactions_fts SET category = NEW.name
+                WHERE rowid IN (SELECT id FROM transactions WHERE category_id = NEW.id);
+            END;
+"""
+
+
+def _full_text_search(conn: sqlite3.Connection):
+    """Index transaction descriptions and category names for the register search."""
+    run_script(conn, _SEARCH_SCHEMA)
+    conn.execute("DELETE FROM transactions_fts")
+    conn.execute("""
+        INSERT INTO transactions_fts(rowid, description, category)
+        SELECT t.id, t.description, COALESCE(c.name, '')
+        FROM transactions t LEFT JOIN categories c ON c.id = t.category_id
+    """)
+
+
+# (number, description, function). Each runs once, in its own transaction.
+MIGRATIONS = [
+    (1, "Baseline schema, rollups, balance checkpoints, transfer direction", _baseline),
+    (2, "Store money as integer cents", _integer_cents),
+    (3, "Full-text search index over transactions", _full_text_search),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
@@ -1,32 +1,24 @@
 from typing import Optional
+from database.changes import Change
 from database.db_manager import DatabaseManager
+from database.rows import fetch_all, fetch_one
 from models.recurring_rule import RecurringRule
 
+_CONVERTERS = {"is_active": bool}
+
 
 class RecurringDAO:
     def __init__(self, db: DatabaseManager):
         self._db = db
 
-    def _row_to_model(self, row) -> RecurringRule:
-        return RecurringRule(
-            id=row["id"],
-            name=row["name"],
-            type=row["type"],
-            amount=row["amount"],
-            account_id=row["account_id"],
-            category_id=row["category_id"],
-            description=row["description"],
-            frequency=row["frequency"],
-            start_date=row["start_date"],
-            is_active=bool(row["is_active"]),
-            day_of_month=row["day_of_month"],
-            day_of_week=row["day_of_week"],
-            month_of_year=row["month_of_year"],
-            end_date=row["end_date"],
-            last_applied=row["last_applied"],
-            account_name=row["account_name"] if "account_name" in row.keys() else "",
-            category_name=row["category_name"] if "category_name" in row.keys() else "",
-        )
+    def _publish(self, *ids: int):
+        self._db.changes.publish(Change("recurring", ids=frozenset(ids)))
+
+    def _fetch_all(self, sql: str, params=()) -> list[RecurringRule]:
+        return fetch_all(self._db.get_connection(), RecurringRule, sql, params, _CONVERTERS)
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[RecurringRule]:
+        return fetch_one(self._db.get_connection(), RecurringRule, sql, params, _CONVERTERS)
 
     def _select(self) -> str:
         return """
@@ -39,31 +31,53 @@ class RecurringDAO:
         """
 
     def get_all(self) -> list[RecurringRule]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             self._select() + " ORDER BY r.name"
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        )
 
     def get_active(self) -> list[RecurringRule]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             self._select() + " WHERE r.is_active = 1 ORDER BY r.name"
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        )
 
     def get_by_id(self, rule_id: int) -> Optional[RecurringRule]:
-        conn = self._db.get_connection()
-        row = conn.execute(
+        return self._fetch_one(
             self._select() + " WHERE r.id = ?", (rule_id,)
-        ).fetchone()
-        return self._row_to_model(row) if row else None
+        )
+
+    _INSERT = """INSERT INTO recurring_rules
+                 (name, type, amount, account_id, category_id, description,
+                  frequency, start_date, day_of_month, day_of_week,
+                  month_of_year, end_date, is_active)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    @staticmethod
+    def _insert_params(
+        name: str,
+        type_: str,
+        amount: int,
+        account_id: int,
+        category_id: int,
+        description: str,
+        frequency: str,
+        start_date: str,
+        day_of_month: int | None = None,
+        day_of_week: int | None = None,
+        month_of_year: int | None = None,
+        end_date: str | None = None,
+        is_active: bool = True,
+    ) -> tuple:
+        return (
+            name, type_, amount, account_id, category_id, description,
+            frequency, start_date, day_of_month, day_of_week,
+            month_of_year, end_date, 1 if is_active else 0,
+        )
 
     def create(
         self,
         name: str,
         type_: str,
-        amount: float,
+        amount: int,
         account_id: int,
         category_id: int,
         description: str,
@@ -74,28 +88,31 @@ class RecurringDAO:
         month_of_year: int | None = None,
         end_date: str | None = None,
     ) -> RecurringRule:
-        conn = self._db.get_connection()
-        cursor = conn.execute(
-            """INSERT INTO recurring_rules
-               (name, type, amount, account_id, category_id, description,
-                frequency, start_date, day_of_month, day_of_week,
-                month_of_year, end_date)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                name, type_, amount, account_id, category_id, description,
-                frequency, start_date, day_of_month, day_of_week,
-                month_of_year, end_date,
-            ),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                self._INSERT,
+                self._insert_params(
+                    name, type_, amount, account_id, category_id, description,
+                    frequency, start_date, day_of_month, day_of_week,
+                    month_of_year, end_date,
+                ),
+            )
+        self._publish(cursor.lastrowid)
         return self.get_by_id(cursor.lastrowid)
 
+    def create_many(self, rows: list[dict]) -> list[int]:
+        """Insert many rules in one transaction and return their ids in order.
+        Each row holds create()'s keyword arguments, plus an optional is_active."""
+        ids = self._db.insert_many(self._INSERT, (self._insert_params(**r) for r in rows))
+        self._publish(*ids)
+        return ids
+
     def update(
         self,
         rule_id: int,
         name: str,
         type_: str,
-        amount: float,
+        amount: int,
         account_id: int,
         category_id: int,
         description: str,
@@ -107,39 +124,49 @@ class RecurringDAO:
         end_date: str | None = None,
         is_active: bool = True,
     ) -> RecurringRule:
-        conn = self._db.get_connection()
-        conn.execute(
-            """UPDATE recurring_rules SET
-               name=?, type=?, amount=?, account_id=?, category_id=?,
-               description=?, frequency=?, start_date=?, day_of_month=?,
-               day_of_week=?, month_of_year=?, end_date=?, is_active=?
-               WHERE id=?""",
-            (
-                name, type_, amount, account_id, category_id, description,
-                frequency, start_date, day_of_month, day_of_week,
-                month_of_year, end_date, 1 if is_active else 0, rule_id,
-            ),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                """UPDATE recurring_rules SET
+                   name=?, type=?, amount=?, account_id=?, category_id=?,
+                   description=?, frequency=?, start_date=?, day_of_month=?,
+                   day_of_week=?, month_of_year=?, end_date=?, is_active=?
+                   WHERE id=?""",
+                (
+                    name, type_, amount, account_id, category_id, description,
+                    frequency, start_date, day_of_month, day_of_week,
+                    month_of_year, end_date, 1 if is_active else 0, rule_id,
+                ),
+            )
+        self._publish(rule_id)
         return self.get_by_id(rule_id)
 
     def set_active(self, rule_id: int, is_active: bool):
-        conn = self._db.get_connection()
-        conn.execute(
-            "UPDATE recurring_rules SET is_active = ? WHERE id = ?",
-            (1 if is_active else 0, rule_id),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE recurring_rules SET is_active = ? WHERE id = ?",
+                (1 if is_active else 0, rule_id),
+            )
+        self._publish(rule_id)
 
     def update_last_applied(self, rule_id: int, date_str: str):
-        conn = self._db.get_connection()
-        conn.execute(
-            "UPDATE recurring_rules SET last_applied = ? WHERE id = ?",
-            (date_str, rule_id),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE recurring_rules SET last_applied = ? WHERE id = ?",
+                (date_str, rule_id),
+            )
+        self._publish(rule_id)
+
+    def update_last_applied_many(self, rows):
+        """Set last_applied for many rules in one transaction from (rule_id, date_str) pairs."""
+        rows = list(rows)
+        with self._db.transaction() as conn:
+            conn.executemany(
+                "UPDATE recurring_rules SET last_applied = ? WHERE id = ?",
+                [(date_str, rule_id) for rule_id, date_str in rows],
+            )
+        self._publish(*(rule_id for rule_id, _ in rows))
 
     def delete(self, rule_id: int):
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM recurring_rules WHERE id = ?", (rule_id,))
-        conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM recurring_rules WHERE id = ?", (rule_id,))
+        self._publish(rule_id)
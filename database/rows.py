@@ -0,0 +1,93 @@
+"""Materialization of query results into model instances.
+
+A RowMapper is built once per query from cursor.description and resolves each
+model field to its column position, so rows are read as plain tuples with no
+sqlite3.Row name lookups or keys() calls per row. A model field the query does
+not select keeps its default, which lets a query project away columns that
+nobody reads.
+"""
+import sqlite3
+from dataclasses import MISSING, fields
+from operator import itemgetter
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RowMapper:
+    """Builds `model` instances from the tuple rows of one query.
+
+    converters maps a field name to a function applied to its column value,
+    e.g. {"cleared": bool} for the 0/1 flags SQLite stores.
+    """
+
+    def __init__(self, model: type[T], description, converters: dict[str, Callable] | None = None):
+        columns = {d[0]: i for i, d in enumerate(description)}
+        positional: list[int] = []
+        self._keywords: list[tuple[str, int]] = []
+        # Fields go by position until the first one the query does not select
+        skipped = False
+        for f in fields(model):
+            if f.name not in columns:
+                if f.default is MISSING and f.default_factory is MISSING:
+                    raise ValueError(f"Query does not select {model.__name__}.{f.name}.")
+                skipped = True
+            elif skipped:
+                self._keywords.append((f.name, columns[f.name]))
+            else:
+                positional.append(columns[f.name])
+        self._model = model
+        self._args = _tuple_getter(positional)
+        self._converters = [
+            (name, fn) for name, fn in (converters or {}).items() if name in columns
+        ]
+
+    def __call__(self, row: tuple) -> T:
+        if self._keywords:
+            obj = self._model(*self._args(row), **{n: row[i] for n, i in self._keywords})
+        else:
+            obj = self._model(*self._args(row))
+        for name, convert in self._converters:
+            setattr(obj, name, convert(getattr(obj, name)))
+        return obj
+
+
+def _tuple_getter(positions: list[int]) -> Callable[[tuple], tuple]:
+    if not positions:
+        return lambda row: ()
+    if len(positions) == 1:
+        index = positions[0]
+        return lambda row: (row[index],)
+    return itemgetter(*positions)
+
+
+def _execute(conn: sqlite3.Connection, sql: str, params) -> sqlite3.Cursor:
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def fetch_all(
+    conn: sqlite3.Connection,
+    model: type[T],
+    sql: str,
+    params=(),
+    converters: dict[str, Callable] | None = None,
+) -> list[T]:
+    """Run `sql` and return every row as a `model` instance."""
+    cursor = _execute(conn, sql, params)
+    mapper = RowMapper(model, cursor.description, converters)
+    return [mapper(row) for row in cursor.fetchall()]
+
+
+def fetch_one(
+    conn: sqlite3.Connection,
+    model: type[T],
+    sql: str,
+    params=(),
+    converters: dict[str, Callable] | None = None,
+) -> Optional[T]:
+    """Run `sql` and return its first row as a `model` instance, or None."""
+    cursor = _execute(conn, sql, params)
+    row = cursor.fetchone()
+    return RowMapper(model, cursor.description, converters)(row) if row else None
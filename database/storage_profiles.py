@@ -0,0 +1,84 @@
+"""Named SQLite tuning profiles for the database connections.
+
+Each profile trades durability against speed through the per-connection
+PRAGMAs below. The chosen profile is stored in app_settings and applied by
+DatabaseManager to the writer and every reader. Compare them on a copy of
+your own data with benchmarks/storage_profiles.py.
+"""
+from dataclasses import dataclass
+
+# app_settings key holding the chosen profile's name.
+STORAGE_PROFILE_KEY = "storage_profile"
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    name: str
+    label: str
+    description: str
+    synchronous: str          # OFF | NORMAL | FULL
+    cache_size: int           # PRAGMA cache_size; negative is KiB
+    mmap_size: int            # bytes of the file read through mmap, 0 = none
+    temp_store: str           # DEFAULT | FILE | MEMORY
+    wal_autocheckpoint: int   # WAL pages before an automatic checkpoint
+
+    def pragmas(self, writer: bool) -> list[str]:
+        """PRAGMA statements configuring one connection with this profile."""
+        statements = [
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+        if writer:
+            statements += [
+                f"PRAGMA synchronous = {self.synchronous}",
+                f"PRAGMA wal_autocheckpoint = {self.wal_autocheckpoint}",
+            ]
+        return statements
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    p.name: p for p in (
+        StorageProfile(
+            name="durable",
+            label="Durable",
+            description="Every save is flushed to disk before it returns. "
+                        "Slowest writes; nothing is lost on power failure.",
+            synchronous="FULL",
+            cache_size=-2_000,
+            mmap_size=0,
+            temp_store="DEFAULT",
+            wal_autocheckpoint=1_000,
+        ),
+        StorageProfile(
+            name="balanced",
+            label="Balanced",
+            description="The log is flushed at checkpoints only. A power failure "
+                        "can undo the last few saves but cannot damage the file.",
+            synchronous="NORMAL",
+            cache_size=-16_000,
+            mmap_size=64 * 1024 * 1024,
+            temp_store="MEMORY",
+            wal_autocheckpoint=1_000,
+        ),
+        StorageProfile(
+            name="fast-local",
+            label="Fast (local disk)",
+            description="Nothing is flushed; the operating system decides when to "
+                        "write. Fastest, but a power failure or OS crash can "
+                        "corrupt the file. Keep backups.",
+            synchronous="OFF",
+            cache_size=-64_000,
+            mmap_size=256 * 1024 * 1024,
+            temp_store="MEMORY",
+            wal_autocheckpoint=4_000,
+        ),
+    )
+}
+
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+
+def get_profile(name: str | None) -> StorageProfile:
+    """The profile called `name`, or the default one if there is none."""
+    return STORAGE_PROFILES.get(name or "", STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE])
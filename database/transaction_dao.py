@@ -1,43 +1,62 @@
+import re
+from bisect import bisect_right
 from typing import Optional
+from database.changes import Change
 from database.db_manager import DatabaseManager
+from database.rows import fetch_all, fetch_one
 from models.transaction import Transaction
+from utils.date_helpers import month_range
+
+
+# A row's effect on its account balance.
+_SIGNED_AMOUNT = "t.amount * t.direction"
+
+_CONVERTERS = {"cleared": bool}
+
+# Period of a row for each balance history granularity. A week is keyed by
+# the Sunday it ends on.
+_PERIODS = {
+    "day": "t.date",
+    "week": "date(t.date, 'weekday 0')",
+    "month": "substr(t.date, 1, 7)",
+}
+
+
+def _match_query(text: str) -> str | None:
+    """FTS5 query matching every word of `text` as a prefix, or None if it has
+    no words. Each word is quoted, so FTS5 operators typed by the user are
+    searched for literally."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
 
 
 class TransactionDAO:
     def __init__(self, db: DatabaseManager):
         self._db = db
 
-    def _row_to_model(self, row) -> Transaction:
-        return Transaction(
-            id=row["id"],
-            account_id=row["account_id"],
-            type=row["type"],
-            amount=row["amount"],
-            category_id=row["category_id"],
-            category_name=row["category_name"] if "category_name" in row.keys() else "",
-            description=row["description"],
-            date=row["date"],
-            cleared=bool(row["cleared"]),
-            transfer_pair_id=row["transfer_pair_id"],
-            recurring_rule_id=row["recurring_rule_id"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+    def _fetch_all(self, sql: str, params=()) -> list[Transaction]:
+        return fetch_all(self._db.get_connection(), Transaction, sql, params, _CONVERTERS)
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[Transaction]:
+        return fetch_one(self._db.get_connection(), Transaction, sql, params, _CONVERTERS)
 
     def _select(self) -> str:
+        # created_at/updated_at are left out: nothing reads them
         return """
-            SELECT t.*,
-                   COALESCE(c.name, '') AS category_name
+            SELECT t.id, t.account_id, t.type, t.amount, t.category_id,
+                   COALESCE(c.name, '') AS category_name,
+                   t.description, t.date, t.cleared, t.direction,
+                   t.transfer_pair_id, t.recurring_rule_id
             FROM transactions t
             LEFT JOIN categories c ON t.category_id = c.id
         """
 
     def get_all(self) -> list[Transaction]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             self._select() + " ORDER BY t.date ASC, t.id ASC"
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        )
 
     def get_by_account(
         self,
@@ -47,13 +66,28 @@ class TransactionDAO:
         cleared_filter: str | None = None,
         search: str | None = None,
     ) -> list[Transaction]:
-        conn = self._db.get_connection()
-        sql = self._select() + " WHERE t.account_id = ?"
+        where, params = self._register_filter(
+            account_id, month, type_filter, cleared_filter, search
+        )
+        return self._fetch_all(
+            self._select() + where + " ORDER BY t.date ASC, t.id ASC", params
+        )
+
+    @staticmethod
+    def _register_filter(
+        account_id: int,
+        month: str | None,
+        type_filter: str | None,
+        cleared_filter: str | None,
+        search: str | None,
+    ) -> tuple[str, list]:
+        """WHERE clause and params shared by the register queries."""
+        sql = " WHERE t.account_id = ?"
         params: list = [account_id]
 
         if month:
-            sql += " AND strftime('%Y-%m', t.date) = ?"
-            params.append(month)
+            sql += " AND t.date BETWEEN ? AND ?"
+            params.extend(month_range(month))
         if type_filter and type_filter != "all":
             sql += " AND t.type = ?"
             params.append(type_filter)
@@ -61,271 +95,436 @@ class TransactionDAO:
             sql += " AND t.cleared = 1"
         elif cleared_filter == "pending":
             sql += " AND t.cleared = 0"
-        if search:
-            sql += " AND (t.description LIKE ? OR COALESCE(c.name,'') LIKE ?)"
-            params.extend([f"%{search}%", f"%{search}%"])
+        match = _match_query(search) if search else None
+        if match:
+            sql += """ AND t.id IN (SELECT rowid FROM transactions_fts
+                                    WHERE transactions_fts MATCH ?)"""
+            params.append(match)
+        return sql, params
 
-        sql += " ORDER BY t.date ASC, t.id ASC"
-        rows = conn.execute(sql, params).fetchall()
-        return [self._row_to_model(r) for r in rows]
+    def get_page(
+        self,
+        account_id: int,
+        month: str | None = None,
+        type_filter: str | None = None,
+        cleared_filter: str | None = None,
+        search: str | None = None,
+        after: tuple[str, int] | None = None,
+        before: tuple[str, int] | None = None,
+        limit: int = 100,
+    ) -> list[Transaction]:
+        """Up to `limit` register rows in (date, id) order, seeking past the
+        (date, id) key `after`, or ending just before the key `before`.
+        The seek is an index range, so any page costs the same."""
+        where, params = self._register_filter(
+            account_id, month, type_filter, cleared_filter, search
+        )
+        if before:
+            where += " AND (t.date, t.id) < (?, ?)"
+            params.extend(before)
+            order = "DESC"
+        else:
+            if after:
+                where += " AND (t.date, t.id) > (?, ?)"
+                params.extend(after)
+            order = "ASC"
+        txs = self._fetch_all(
+            self._select() + where + f" ORDER BY t.date {order}, t.id {order} LIMIT ?",
+            params + [limit],
+        )
+        return txs[::-1] if before else txs
 
-    def get_by_id(self, tx_id: int) -> Optional[Transaction]:
+    def count(
+        self,
+        account_id: int,
+        month: str | None = None,
+        type_filter: str | None = None,
+        cleared_filter: str | None = None,
+        search: str | None = None,
+        before: tuple[str, int] | None = None,
+    ) -> int:
+        """Number of register rows matching the filters, optionally only those
+        before the (date, id) key `before`."""
         conn = self._db.get_connection()
-        row = conn.execute(
-            self._select() + " WHERE t.id = ?", (tx_id,)
-        ).fetchone()
-        return self._row_to_model(row) if row else None
+        where, params = self._register_filter(
+            account_id, month, type_filter, cleared_filter, search
+        )
+        if before:
+            where += " AND (t.date, t.id) < (?, ?)"
+            params.extend(before)
+        return conn.execute(
+            "SELECT COUNT(*) FROM transactions t" + where, params
+        ).fetchone()[0]
 
-    def get_by_transfer_pair(self, pair_id: int) -> list[Transaction]:
+    def get_running_balances(
+        self, account_id: int, first: tuple[str, int], last: tuple[str, int]
+    ) -> dict[int, int]:
+        """{tx_id: balance after the row} for every row of the account from the
+        (date, id) key `first` through `last`, whatever the register filters.
+        Starts from the month checkpoint of `first`."""
         conn = self._db.get_connection()
+        month_start = first[0][:7] + "-01"
+        opening = self.get_opening_balance(account_id, first[0][:7])
         rows = conn.execute(
-            self._select() + " WHERE t.transfer_pair_id = ?", (pair_id,)
+            f"""SELECT id, balance FROM (
+                    SELECT t.id, t.date,
+                           ? + SUM({_SIGNED_AMOUNT}) OVER (ORDER BY t.date, t.id) AS balance
+                    FROM transactions t
+                    WHERE t.account_id = ?
+                      AND t.date >= ?
+                      AND (t.date, t.id) <= (?, ?)
+                )
+                WHERE (date, id) >= (?, ?)""",
+            (opening, account_id, month_start, *last, *first),
         ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+        return {r["id"]: r["balance"] for r in rows}
 
-    def get_by_transfer_pair_ids(self, pair_ids: list[int]) -> dict[int, list["Transaction"]]:
-        """Fetch all rows for multiple transfer_pair_ids in a single query.
-        Returns {pair_id: [tx, ...]}."""
-        if not pair_ids:
-            return {}
-        conn = self._db.get_connection()
-        placeholders = ",".join("?" * len(pair_ids))
-        rows = conn.execute(
-            self._select() + f" WHERE t.transfer_pair_id IN ({placeholders})", pair_ids
-        ).fetchall()
-        result: dict[int, list[Transaction]] = {}
-        for row in rows:
-            tx = self._row_to_model(row)
-            result.setdefault(tx.transfer_pair_id, []).append(tx)
-        return result
+    def get_by_id(self, tx_id: int) -> Optional[Transaction]:
+        return self._fetch_one(
+            self._select() + " WHERE t.id = ?", (tx_id,)
+        )
+
+    def get_by_transfer_pair(self, pair_id: int) -> list[Transaction]:
+        return self._fetch_all(
+            self._select() + " WHERE t.transfer_pair_id = ?", (pair_id,)
+        )
 
     def get_by_category_and_month(self, category_id: int, month: str) -> list[Transaction]:
-        conn = self._db.get_connection()
-        rows = conn.execute(
+        return self._fetch_all(
             self._select() + """
-            WHERE t.category_id = ?
-              AND strftime('%Y-%m', t.date) = ?
-              AND t.type = 'expense'
+            WHERE t.type = 'expense'
+              AND t.date BETWEEN ? AND ?
+              AND t.category_id = ?
             """,
-            (category_id, month),
-        ).fetchall()
-        return [self._row_to_model(r) for r in rows]
+            (*month_range(month), category_id),
+        )
 
-    def get_spending_by_category(self, month: str) -> dict[int, float]:
+    def get_spending_by_category(self, month: str) -> dict[int, int]:
         """Sum of expense amounts per category_id for the given month (all accounts)."""
         conn = self._db.get_connection()
         rows = conn.execute(
-            """SELECT category_id, SUM(amount) as total
-               FROM transactions
-               WHERE type = 'expense'
-                 AND strftime('%Y-%m', date) = ?
-                 AND category_id IS NOT NULL
+            """SELECT category_id, SUM(total) as total
+               FROM monthly_rollups
+               WHERE month = ?
+                 AND type = 'expense'
+                 AND category_id != 0
                GROUP BY category_id""",
             (month,),
         ).fetchall()
         return {r["category_id"]: r["total"] for r in rows}
 
-    def get_totals_for_month(self, month: str) -> dict:
-        """Return income and expense totals across all accounts for the given month."""
-        conn = self._db.get_connection()
-        row = conn.execute(
-            """SELECT
-                SUM(CASE WHEN type='income'  THEN amount ELSE 0 END) AS income,
-                SUM(CASE WHEN type='expense' THEN amount ELSE 0 END) AS expense
-               FROM transactions
-               WHERE strftime('%Y-%m', date) = ?""",
-            (month,),
-        ).fetchone()
-        return {
-            "income":  row["income"]  or 0.0,
-            "expense": row["expense"] or 0.0,
-        }
-
     def get_totals_by_account(self, account_id: int, month: str) -> dict:
         """Return income, expense totals for one account/month."""
         conn = self._db.get_connection()
         row = conn.execute(
             """SELECT
-                SUM(CASE WHEN type='income' THEN amount ELSE 0 END) AS income,
-                SUM(CASE WHEN type='expense' THEN amount ELSE 0 END) AS expense
-               FROM transactions
+                SUM(CASE WHEN type='income' THEN total ELSE 0 END) AS income,
+                SUM(CASE WHEN type='expense' THEN total ELSE 0 END) AS expense
+               FROM monthly_rollups
                WHERE account_id = ?
-                 AND strftime('%Y-%m', date) = ?""",
+                 AND month = ?""",
             (account_id, month),
         ).fetchone()
         return {
-            "income": row["income"] or 0.0,
-            "expense": row["expense"] or 0.0,
+            "income": row["income"] or 0,
+            "expense": row["expense"] or 0,
         }
 
+    _INSERT = """INSERT INTO transactions
+                 (account_id, type, amount, category_id, description, date,
+                  cleared, direction, transfer_pair_id, recurring_rule_id)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    @staticmethod
+    def _insert_params(
+        account_id: int,
+        type_: str,
+        amount: int,
+        date: str,
+        description: str = "",
+        category_id: int | None = None,
+        cleared: bool = False,
+        transfer_pair_id: int | None = None,
+        recurring_rule_id: int | None = None,
+        direction: int | None = None,
+    ) -> tuple:
+        if direction is None:
+            direction = 1 if type_ == "income" else -1
+        return (
+            account_id, type_, amount, category_id, description, date,
+            1 if cleared else 0, direction, transfer_pair_id, recurring_rule_id,
+        )
+
     def create(
         self,
         account_id: int,
         type_: str,
-        amount: float,
+        amount: int,
         date: str,
         description: str = "",
         category_id: int | None = None,
         cleared: bool = False,
         transfer_pair_id: int | None = None,
         recurring_rule_id: int | None = None,
+        direction: int | None = None,
     ) -> Transaction:
-        conn = self._db.get_connection()
-        cursor = conn.execute(
-            """INSERT INTO transactions
-               (account_id, type, amount, category_id, description, date,
-                cleared, transfer_pair_id, recurring_rule_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                account_id, type_, amount, category_id, description, date,
-                1 if cleared else 0, transfer_pair_id, recurring_rule_id,
-            ),
-        )
+        """Insert a transaction. direction is +1 (credit) or -1 (debit) and defaults
+        from the type; transfers should always pass it."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                self._INSERT,
+                self._insert_params(
+                    account_id, type_, amount, date, description, category_id,
+                    cleared, transfer_pair_id, recurring_rule_id, direction,
+                ),
+            )
+        self._db.changes.publish(Change.of_transactions([(cursor.lastrowid, account_id, date)]))
         return self.get_by_id(cursor.lastrowid)
 
+    def create_many(self, rows: list[dict]) -> list[int]:
+        """Insert many transactions in one transaction and return their ids in order.
+        Each row holds create()'s keyword arguments."""
+        ids = self._db.insert_many(self._INSERT, (self._insert_params(**r) for r in rows))
+        self._db.changes.publish(Change.of_transactions(
+            (tx_id, r["account_id"], r["date"]) for tx_id, r in zip(ids, rows)
+        ))
+        return ids
+
     def update(
         self,
         tx_id: int,
         type_: str,
-        amount: float,
+        amount: int,
         date: str,
         description: str = "",
         category_id: int | None = None,
         cleared: bool = False,
     ) -> Transaction:
-        conn = self._db.get_connection()
-        conn.execute(
-            """UPDATE transactions
-               SET type=?, amount=?, category_id=?, description=?, date=?,
-                   cleared=?, updated_at=datetime('now')
-               WHERE id=?""",
-            (type_, amount, category_id, description, date,
-             1 if cleared else 0, tx_id),
+        with self._db.transaction() as conn:
+            touched = conn.execute(
+                "SELECT id, account_id, date FROM transactions WHERE id = ?", (tx_id,)
+            ).fetchall()
+            conn.execute(
+                """UPDATE transactions
+                   SET type=?, amount=?, category_id=?, description=?, date=?,
+                       cleared=?, updated_at=datetime('now'),
+                       direction = CASE ? WHEN 'income'  THEN 1
+                                          WHEN 'expense' THEN -1
+                                          ELSE direction END
+                   WHERE id=?""",
+                (type_, amount, category_id, description, date,
+                 1 if cleared else 0, type_, tx_id),
+            )
+        self._db.changes.publish(
+            Change.of_transactions(touched + [(r[0], r[1], date) for r in touched])
         )
-        conn.commit()
         return self.get_by_id(tx_id)
 
     def set_cleared(self, tx_id: int, cleared: bool):
-        conn = self._db.get_connection()
-        conn.execute(
-            "UPDATE transactions SET cleared=?, updated_at=datetime('now') WHERE id=?",
-            (1 if cleared else 0, tx_id),
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            touched = conn.execute(
+                """UPDATE transactions SET cleared=?, updated_at=datetime('now') WHERE id=?
+                   RETURNING id, account_id, date""",
+                (1 if cleared else 0, tx_id),
+            ).fetchall()
+        self._db.changes.publish(Change.of_transactions(touched))
 
     def delete(self, tx_id: int):
-        conn = self._db.get_connection()
-        conn.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
-        conn.commit()
+        with self._db.transaction() as conn:
+            touched = conn.execute(
+                "DELETE FROM transactions WHERE id = ? RETURNING id, account_id, date", (tx_id,)
+            ).fetchall()
+        self._db.changes.publish(Change.of_transactions(touched))
 
     def delete_by_transfer_pair(self, pair_id: int):
-        conn = self._db.get_connection()
-        conn.execute(
-            "DELETE FROM transactions WHERE transfer_pair_id = ?", (pair_id,)
-        )
-        conn.commit()
+        with self._db.transaction() as conn:
+            touched = conn.execute(
+                """DELETE FROM transactions WHERE transfer_pair_id = ?
+                   RETURNING id, account_id, date""",
+                (pair_id,),
+            ).fetchall()
+            conn.execute("DELETE FROM transfer_pairs WHERE id = ?", (pair_id,))
+        self._db.changes.publish(Change.of_transactions(touched))
 
-    def get_balances_as_of(self, as_of_date: str | None = None) -> dict[int, float]:
+    def get_balances_as_of(self, as_of_date: str | None = None) -> dict[int, int]:
         """Return {account_id: balance} for all accounts using a single aggregate query.
         If as_of_date (YYYY-MM-DD) is given, only transactions on or before that date
-        are included.  Respects the debit/credit transfer convention (lower id = debit)."""
+        are included."""
         conn = self._db.get_connection()
-        date_clause = "AND t.date <= ?" if as_of_date else ""
+        date_clause = "WHERE t.date <= ?" if as_of_date else ""
         params = (as_of_date,) if as_of_date else ()
         rows = conn.execute(f"""
-            WITH transfer_debit AS (
-                SELECT MIN(id) AS debit_id, transfer_pair_id
-                FROM transactions
-                WHERE type = 'transfer'
-                GROUP BY transfer_pair_id
-            )
-            SELECT
-                t.account_id,
-                SUM(
-                    CASE t.type
-                        WHEN 'income'   THEN  t.amount
-                        WHEN 'expense'  THEN -t.amount
-                        WHEN 'transfer' THEN
-                            CASE WHEN t.id = td.debit_id THEN -t.amount ELSE t.amount END
-                        ELSE 0
-                    END
-                ) AS balance
+            SELECT t.account_id, SUM({_SIGNED_AMOUNT}) AS balance
             FROM transactions t
-            LEFT JOIN transfer_debit td ON t.transfer_pair_id = td.transfer_pair_id
-            WHERE 1=1 {date_clause}
+            {date_clause}
             GROUP BY t.account_id
         """, params).fetchall()
         return {r["account_id"]: r["balance"] for r in rows}
 
-    def get_next_transfer_pair_id(self) -> int:
+    def get_account_balances_as_of(self, as_of_date: str) -> list[dict]:
+        """[{name, account_type, opening_balance, balance}] for every account of the
+        year file that holds as_of_date, as of that date (YYYY-MM-DD).
+        The sum runs inside that file; only one row per account comes back."""
+        schema = self._db.schema_for_date(as_of_date)
         conn = self._db.get_connection()
-        row = conn.execute(
-            "SELECT COALESCE(MAX(transfer_pair_id), 0) + 1 AS next_id FROM transactions"
-        ).fetchone()
-        return row["next_id"]
-
-    def get_monthly_totals(
-        self, account_id: int | None, months: int = 6
-    ) -> list[dict]:
-        """Return list of {month, income, expense} for the last N months."""
-        conn = self._db.get_connection()
-        where = "WHERE account_id = ?" if account_id else "WHERE 1=1"
-        params = [account_id] if account_id else []
+        if self._db.is_archived(schema) and as_of_date == month_range(as_of_date[:7])[1]:
+            # Month-end balances of a closed year are stored in its snapshot
+            rows = conn.execute(
+                f"""SELECT a.name, a.account_type, a.opening_balance,
+                           COALESCE(b.closing_balance, 0) AS balance
+                    FROM {schema}.accounts a
+                    LEFT JOIN {schema}.archive_month_balances b
+                           ON b.account_id = a.id AND b.month = ?""",
+                (as_of_date[:7],),
+            ).fetchall()
+            return [dict(r) for r in rows]
         rows = conn.execute(
-            f"""SELECT strftime('%Y-%m', date) AS month,
-                       SUM(CASE WHEN type='income' THEN amount ELSE 0 END) AS income,
-                       SUM(CASE WHEN type='expense' THEN amount ELSE 0 END) AS expense
-                FROM transactions
-                {where}
-                GROUP BY month
-                ORDER BY month DESC
-                LIMIT ?""",
-            params + [months],
+            f"""SELECT a.name, a.account_type, a.opening_balance,
+                       COALESCE(SUM({_SIGNED_AMOUNT}), 0) AS balance
+                FROM {schema}.accounts a
+                LEFT JOIN {schema}.transactions t
+                       ON t.account_id = a.id AND t.date <= ?
+                GROUP BY a.id""",
+            (as_of_date,),
         ).fetchall()
-        return [dict(r) for r in reversed(rows)]
+        return [dict(r) for r in rows]
 
-    def get_avg_monthly_nonrecurring(self, account_id, months: int = 6) -> dict:
-        """Average monthly income/expense from non-recurring transactions over last N months."""
-        conn = self._db.get_connection()
-        where_acct = "AND account_id = ?" if account_id else ""
-        params = [account_id] if account_id else []
-        rows = conn.execute(
-            f"""SELECT strftime('%Y-%m', date) AS month,
-                       SUM(CASE WHEN type='income' THEN amount ELSE 0 END) AS income,
-                       SUM(CASE WHEN type='expense' THEN amount ELSE 0 END) AS expense
-                FROM transactions
-                WHERE recurring_rule_id IS NULL
-                  {where_acct}
-                GROUP BY month
-                ORDER BY month DESC
-                LIMIT ?""",
-            params + [months],
+    def get_account_balance_history(
+        self, period_ends: list[str], granularity: str = "month"
+    ) -> dict[str, list[dict]]:
+        """{end: [{name, account_type, opening_balance, balance}]} for each
+        period end date (YYYY-MM-DD), as get_account_balances_as_of(end) gives
+        it, in one query whatever the number of periods.
+
+        Each year file involved is read once: its rows up to the last end are
+        summed per account and period (day, week ending Sunday, or month), and a
+        running SUM() OVER each account turns those into period-end balances.
+        Archived years at month granularity read their stored balances.
+        """
+        if not period_ends:
+            return {}
+        period_sql = _PERIODS[granularity]
+        schemas = sorted({self._db.schema_for_date(end) for end in period_ends})
+        branches, params = [], []
+        for schema in schemas:
+            if granularity == "month" and self._db.is_archived(schema):
+                branches.append(f"""
+                    SELECT '{schema}' AS schema, a.id AS account_id, a.name,
+                           a.account_type, a.opening_balance,
+                           b.month AS period, b.closing_balance AS balance
+                    FROM {schema}.accounts a
+                    LEFT JOIN {schema}.archive_month_balances b ON b.account_id = a.id""")
+                continue
+            branches.append(f"""
+                SELECT '{schema}' AS schema, a.id AS account_id, a.name,
+                       a.account_type, a.opening_balance, d.period,
+                       SUM(d.delta) OVER (PARTITION BY a.id ORDER BY d.period) AS balance
+                FROM {schema}.accounts a
+                LEFT JOIN (
+                    SELECT t.account_id, {period_sql} AS period,
+                           SUM({_SIGNED_AMOUNT}) AS delta
+                    FROM {schema}.transactions t
+                    WHERE t.date <= ?
+                    GROUP BY t.account_id, period
+                ) d ON d.account_id = a.id""")
+            params.append(max(period_ends))
+        rows = self._db.get_connection().execute(
+            " UNION ALL ".join(branches) + " ORDER BY schema, account_id, period", params
         ).fetchall()
-        count = len(rows)
-        if count == 0:
-            return {"income": 0.0, "expense": 0.0}
-        return {
-            "income": sum(r["income"] for r in rows) / count,
-            "expense": sum(r["expense"] for r in rows) / count,
-        }
 
-    def get_expense_by_category(self, month: str, account_id: int | None = None) -> list[dict]:
+        # {schema: {account_id: (account, [period, ...], [balance, ...])}}
+        accounts: dict[str, dict[int, tuple[dict, list, list]]] = {}
+        for r in rows:
+            by_id = accounts.setdefault(r["schema"], {})
+            if r["account_id"] not in by_id:
+                by_id[r["account_id"]] = (
+                    {"name": r["name"], "account_type": r["account_type"],
+                     "opening_balance": r["opening_balance"]},
+                    [], [],
+                )
+            if r["period"] is not None:
+                _, periods, balances = by_id[r["account_id"]]
+                periods.append(r["period"])
+                balances.append(r["balance"])
+
+        result = {}
+        for end in period_ends:
+            key = end[:7] if granularity == "month" else end
+            result[end] = []
+            for account, periods, balances in accounts.get(self._db.schema_for_date(end), {}).values():
+                i = bisect_right(periods, key)
+                result[end].append({**account, "balance": balances[i - 1] if i else 0})
+        return result
+
+    def get_opening_balance(self, account_id: int, month: str) -> int:
+        """Balance of the account before the first transaction of `month`.
+        Starts from the nearest balance checkpoint, so only reads rows between it
+        and the month (none, when the month itself has a checkpoint)."""
         conn = self._db.get_connection()
-        where = "AND t.account_id = ?" if account_id else ""
-        params = [month]
-        if account_id:
-            params.append(account_id)
-        rows = conn.execute(
-            f"""SELECT COALESCE(c.name,'Uncategorized') AS category,
-                       COALESCE(c.color_hex,'#888888') AS color_hex,
-                       SUM(t.amount) AS total
+        checkpoint = conn.execute(
+            """SELECT month, opening_balance FROM balance_checkpoints
+               WHERE account_id = ? AND month <= ?
+               ORDER BY month DESC LIMIT 1""",
+            (account_id, month),
+        ).fetchone()
+        if checkpoint and checkpoint["month"] == month:
+            return checkpoint["opening_balance"]
+        start = checkpoint["month"] + "-01" if checkpoint else ""
+        row = conn.execute(
+            f"""SELECT COALESCE(SUM({_SIGNED_AMOUNT}), 0) AS net
+                FROM transactions t
+                WHERE t.account_id = ? AND t.date >= ? AND t.date < ?""",
+            (account_id, start, month + "-01"),
+        ).fetchone()
+        return (checkpoint["opening_balance"] if checkpoint else 0) + row["net"]
+
+    def get_current_balance(self, account_id: int) -> int:
+        """Balance of the account including every transaction, from its latest checkpoint."""
+        conn = self._db.get_connection()
+        checkpoint = conn.execute(
+            """SELECT month, opening_balance FROM balance_checkpoints
+               WHERE account_id = ?
+               ORDER BY month DESC LIMIT 1""",
+            (account_id,),
+        ).fetchone()
+        if not checkpoint:
+            return 0
+        row = conn.execute(
+            f"""SELECT COALESCE(SUM({_SIGNED_AMOUNT}), 0) AS net
                 FROM transactions t
-                LEFT JOIN categories c ON t.category_id = c.id
-                WHERE t.type = 'expense'
-                  AND strftime('%Y-%m', t.date) = ?
-                  {where}
-                GROUP BY t.category_id
-                ORDER BY total DESC""",
-            params,
+                WHERE t.account_id = ? AND t.date >= ?""",
+            (account_id, checkpoint["month"] + "-01"),
+        ).fetchone()
+        return checkpoint["opening_balance"] + row["net"]
+
+    def get_next_transfer_pair_id(self) -> int:
+        """Allocate a new transfer_pair_id. Call inside the transaction() that
+        inserts the transfer so an abandoned id is rolled back with it."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute("INSERT INTO transfer_pairs DEFAULT VALUES")
+        return cursor.lastrowid
+
+    def allocate_transfer_pair_ids(self, count: int) -> list[int]:
+        """Allocate `count` transfer_pair_ids at once."""
+        return self._db.insert_many("INSERT INTO transfer_pairs DEFAULT VALUES", [()] * count)
+
+    def get_ledger_columns(self) -> list[tuple]:
+        """Every transaction of every attached year as (account_name,
+        category_name, color_hex, type, day, month, signed_amount, is_recurring)
+        tuples, in one scan. day is the date's proleptic ordinal
+        (date.toordinal()) and month counts months since year 0 (year * 12 +
+        month - 1). Rows with no category have '' and '#888888'."""
+        cursor = self._db.get_connection().cursor()
+        cursor.row_factory = None
+        return cursor.execute(
+            """SELECT account_name,
+                      COALESCE(category_name, ''),
+                      COALESCE(color_hex, '#888888'),
+                      type,
+                      CAST(julianday(date) - 1721424.5 AS INTEGER),
+                      CAST(substr(date, 1, 4) AS INTEGER) * 12
+                          + CAST(substr(date, 6, 2) AS INTEGER) - 1,
+                      signed_amount,
+                      is_recurring
+               FROM ledger_transactions"""
         ).fetchall()
-        return [dict(r) for r in rows]
@@ -23,6 +23,7 @@ from services.forecast_service import ForecastService
 from services.net_worth_service import NetWorthService
 from services.category_service import CategoryService
 from services.data_service import DataService
+from services.async_facade import AsyncFacade
 
 from ui.app_window import AppWindow
 from utils.app_config import get_db_folder
@@ -47,16 +48,19 @@ def main():
 
     # ── Services ─────────────────────────────────────────────────────────────
     account_svc = AccountService(account_dao)
-    tx_svc = TransactionService(tx_dao, account_dao)
+    tx_svc = TransactionService(db, tx_dao, account_dao)
     budget_svc = BudgetService(budget_dao, tx_dao, category_dao)
-    recurring_svc = RecurringService(recurring_dao, tx_dao)
-    report_svc = ReportService(tx_dao, account_dao)
+    recurring_svc = RecurringService(db, recurring_dao, tx_dao)
+    report_svc = ReportService(tx_dao, account_dao, db.changes)
     reminder_svc = ReminderService(recurring_svc, budget_svc)
-    forecast_svc = ForecastService(recurring_svc, budget_dao, tx_dao)
+    forecast_svc = ForecastService(recurring_svc, budget_dao, report_svc, db.changes)
     net_worth_svc = NetWorthService(account_svc, tx_svc)
     category_svc = CategoryService(category_dao)
     data_svc = DataService(db, account_dao, category_dao, budget_dao, recurring_dao, tx_dao, tx_svc)
 
+    # ── Background reads for the tabs ────────────────────────────────────────
+    facade = AsyncFacade()
+
     # ── Apply due recurring rules ────────────────────────────────────────────
     new_transactions = recurring_svc.apply_due_rules()
 
@@ -92,6 +96,7 @@ def main():
         net_worth_service=net_worth_svc,
         category_service=category_svc,
         category_dao=category_dao,
+        facade=facade,
         db=db,
         data_service=data_svc,
         dismissed_reminder_dao=dismissed_reminder_dao,
@@ -101,12 +106,14 @@ def main():
         date_format=date_format,
     )
 
-    # Save last-used account on close
+    # Save last-used account on close; the window and the background reads go
+    # before the connections
     def on_close():
         if app._current_account:
             db.set_setting("last_account_id", str(app._current_account.id))
-        db.close()
         app.destroy()
+        facade.close()
+        db.close()
 
     app.protocol("WM_DELETE_WINDOW", on_close)
     app.mainloop()
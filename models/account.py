@@ -11,13 +11,13 @@ ACCOUNT_TYPE_LABELS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     id: int
     name: str
     description: str = ""
     account_type: str = "checking"
-    opening_balance: float = 0.0
+    opening_balance: int = 0    # cents
     created_at: str = ""
 
     @property
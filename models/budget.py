@@ -1,14 +1,14 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Budget:
     id: int
     category_id: int
     category_name: str
     month: str          # 'YYYY-MM'
-    limit_amount: float
-    spent_amount: float = 0.0
+    limit_amount: int       # cents
+    spent_amount: int = 0   # cents
     color_hex: str = "#888888"
 
     @property
@@ -18,5 +18,5 @@ class Budget:
         return self.spent_amount / self.limit_amount
 
     @property
-    def remaining(self) -> float:
-        return max(0.0, self.limit_amount - self.spent_amount)
+    def remaining(self) -> int:
+        return max(0, self.limit_amount - self.spent_amount)
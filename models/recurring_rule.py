@@ -2,12 +2,12 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class RecurringRule:
     id: int
     name: str
     type: str               # 'income' | 'expense'
-    amount: float
+    amount: int             # cents
     account_id: int
     category_id: int
     description: str
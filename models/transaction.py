@@ -1,19 +1,44 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: int
     account_id: int
     type: str               # 'income' | 'expense' | 'transfer'
-    amount: float
+    amount: int             # cents
     category_id: Optional[int]
     category_name: str
     description: str
     date: str               # 'YYYY-MM-DD'
     cleared: bool
+    direction: int = -1     # +1 credits the account, -1 debits it
     transfer_pair_id: Optional[int] = None
     recurring_rule_id: Optional[int] = None
     created_at: str = ""
     updated_at: str = ""
+
+    @property
+    def signed_amount(self) -> int:
+        return self.amount * self.direction
+
+
+@dataclass
+class TransactionPage:
+    """One page of the register: rows paired with their running balances."""
+    rows: list[tuple[Transaction, int]] = field(default_factory=list)
+    total: int = 0          # rows matching the filters, across all pages
+    offset: int = 0         # rows matching the filters before this page
+    has_prev: bool = False
+    has_next: bool = False
+
+    @property
+    def first_key(self) -> tuple[str, int] | None:
+        """(date, id) of the first row; pass as `before` for the previous page."""
+        return (self.rows[0][0].date, self.rows[0][0].id) if self.rows else None
+
+    @property
+    def last_key(self) -> tuple[str, int] | None:
+        """(date, id) of the last row; pass as `after` for the next page."""
+        return (self.rows[-1][0].date, self.rows[-1][0].id) if self.rows else None
@@ -17,7 +17,7 @@ class AccountService:
         name: str,
         description: str = "",
         account_type: str = "checking",
-        opening_balance: float = 0.0,
+        opening_balance: int = 0,
     ) -> Account:
         name = name.strip()
         if not name:
@@ -34,7 +34,7 @@ class AccountService:
         name: str,
         description: str = "",
         account_type: str = "checking",
-        opening_balance: float = 0.0,
+        opening_balance: int = 0,
     ) -> Account:
         name = name.strip()
         if not name:
@@ -75,9 +75,9 @@ class AccountService:
             )
 
     @staticmethod
-    def _sanitize_opening_balance(account_type: str, opening_balance: float) -> float:
+    def _sanitize_opening_balance(account_type: str, opening_balance: int) -> int:
         if account_type not in DEBT_ACCOUNT_TYPES:
-            return 0.0
+            return 0
         if opening_balance < 0:
             raise ValueError("Opening balance must be 0 or greater.")
         return opening_balance
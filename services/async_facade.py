@@ -0,0 +1,137 @@
+"""Non-blocking reads for the UI.
+
+AsyncFacade runs an asyncio event loop on a thread of its own. Service methods
+wrapped with wrap() become coroutines that run on a small executor of database
+threads, each holding one of DatabaseManager's read-only WAL readers, so a
+long query never blocks the Tk thread and never waits for the writer. A tab
+writes its loading as a coroutine, submits it, and gets the result back on the
+Tk thread, which polls for finished coroutines with after():
+
+    async def fetch():
+        return await asyncio.gather(reports.get_year_over_year(month), ...)
+    facade.submit(self, fetch(), self._show)
+
+Writes stay synchronous on the Tk thread, which owns the writer connection.
+"""
+import asyncio
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Hashable
+
+from database.db_manager import READER_POOL_SIZE
+
+# How often the Tk thread looks for finished coroutines while any are pending.
+_POLL_MS = 15
+
+
+class AsyncService:
+    """Awaitable view of a service: calling a method returns a coroutine that
+    runs it on the facade's database executor."""
+
+    def __init__(self, facade: "AsyncFacade", service):
+        self._facade = facade
+        self._service = service
+
+    def __getattr__(self, name: str):
+        method = getattr(self._service, name)
+
+        async def call(*args, **kwargs):
+            return await self._facade.run(method, *args, **kwargs)
+        return call
+
+
+class AsyncFacade:
+    def __init__(self, workers: int = READER_POOL_SIZE):
+        # One reader per worker thread, as many as the pool keeps open
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="db-read")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="service-loop", daemon=True
+        )
+        self._thread.start()
+        self._latest: dict[Hashable, Future] = {}
+        # Finished coroutines, handed from the loop thread to the Tk thread:
+        # Tk may only be called from its own thread
+        self._ready: queue.SimpleQueue = queue.SimpleQueue()
+        self._polling = False
+
+    def wrap(self, service) -> AsyncService:
+        return AsyncService(self, service)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn on a database thread and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def submit(
+        self,
+        widget,
+        coro: Awaitable,
+        on_result: Callable[[Any], None],
+        on_error: Callable[[BaseException], None] | None = None,
+        key: Hashable | None = None,
+    ):
+        """Run coro on the event loop, then call on_result (or on_error) on the
+        Tk thread through widget.after(). Call it from the Tk thread.
+
+        key defaults to the widget: a result is dropped if a newer coroutine
+        was submitted under the same key, or if the widget no longer exists.
+        Without on_error an exception is raised on the Tk thread, where Tk
+        reports it like any other callback error.
+        """
+        key = widget if key is None else key
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        self._latest[key] = future
+
+        def deliver():
+            if self._latest.get(key) is not future:
+                return  # superseded by a newer submit
+            del self._latest[key]
+            if not widget.winfo_exists():
+                return
+            error = future.exception()
+            if error is None:
+                on_result(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                raise error
+
+        future.add_done_callback(lambda _future: self._ready.put((widget, key, future, deliver)))
+        if not self._polling:
+            self._polling = True
+            self._poll(widget.winfo_toplevel())
+
+    def _poll(self, root):
+        """On the Tk thread: schedule the delivery of every finished coroutine,
+        then look again after _POLL_MS while any result is still pending."""
+        while not self._ready.empty():
+            widget, key, future, deliver = self._ready.get()
+            try:
+                widget.after(0, deliver)
+            except tk.TclError:
+                # The widget is gone
+                if self._latest.get(key) is future:
+                    del self._latest[key]
+        try:
+            if self._latest:
+                root.after(_POLL_MS, self._poll, root)
+                return
+        except tk.TclError:
+            pass  # the window is gone
+        self._polling = False
+
+    def discard(self, key: Hashable):
+        """Drop the result of the coroutine last submitted under key, if it is
+        still pending."""
+        self._latest.pop(key, None)
+
+    def close(self):
+        """Stop the event loop and the database threads. Pending results are
+        not delivered."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -23,10 +23,10 @@ class BudgetService:
         budgets = self._budget_dao.get_by_month(month)
         spending = self._tx_dao.get_spending_by_category(month)
         for b in budgets:
-            b.spent_amount = spending.get(b.category_id, 0.0)
+            b.spent_amount = spending.get(b.category_id, 0)
         return budgets
 
-    def upsert(self, category_id: int, month: str, limit_amount: float) -> Budget:
+    def upsert(self, category_id: int, month: str, limit_amount: int) -> Budget:
         if limit_amount < 0:
             raise ValueError("Budget limit must be non-negative.")
         return self._budget_dao.upsert(category_id, month, limit_amount)
@@ -0,0 +1,65 @@
+"""Monte Carlo model of the cash flow that recurring rules do not cover.
+
+Each category's non-recurring income and expense is fitted from its monthly
+history as a chance of any activity in a month and a log-normal amount when
+there is some. simulate() draws thousands of paths over the forecast horizon
+at once. Each category is one set of array operations over every path and
+month, so 10,000 paths take a fraction of a second.
+
+Categories are drawn independently of each other and of earlier months.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+SIMULATION_PATHS = 10_000
+
+# Calendar months of history each category is fitted on.
+HISTORY_MONTHS = 12
+
+# Fixed so that refreshing a view does not move its bands.
+SIMULATION_SEED = 20_240_601
+
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryFits:
+    """One entry per fitted category: the share of months with any activity
+    (p) and the mean and standard deviation of the log of the monthly amount
+    in those months (mu, sigma)."""
+    p: np.ndarray
+    mu: np.ndarray
+    sigma: np.ndarray
+
+
+def fit(history: np.ndarray) -> CategoryFits:
+    """Fit the categories of a (categories, months) array of monthly totals in
+    cents. Categories with no activity in the window are left out."""
+    active = history > 0
+    keep = active.any(axis=1)
+    history, active = history[keep], active[keep]
+    counts = active.sum(axis=1)
+    logs = np.where(active, np.log(np.maximum(history, 1)), 0.0)
+    mu = logs.sum(axis=1) / counts
+    sigma = np.sqrt(np.where(active, (logs - mu[:, None]) ** 2, 0.0).sum(axis=1) / counts)
+    return CategoryFits(p=counts / history.shape[1], mu=mu, sigma=sigma)
+
+
+def simulate(fits: CategoryFits, months: int, paths: int, rng: np.random.Generator) -> np.ndarray:
+    """Total of the fitted categories on each path and month, shape
+    (paths, months), in cents."""
+    total = np.zeros((paths, months))
+    for p, mu, sigma in zip(fits.p, fits.mu, fits.sigma):
+        # Amounts are drawn only for the months with activity, in single
+        # precision, and summed in double precision
+        occurs = rng.random((paths, months), dtype=np.float32) < p
+        z = rng.standard_normal(int(occurs.sum()), dtype=np.float32)
+        total[occurs] += np.exp(mu + sigma * z)
+    return total
+
+
+def bands(values: np.ndarray) -> np.ndarray:
+    """PERCENTILES of a (paths, periods) array across paths, shape
+    (len(PERCENTILES), periods), rounded to whole cents."""
+    return np.rint(np.percentile(values, PERCENTILES, axis=0)).astype(np.int64)
@@ -16,8 +16,7 @@ class CategoryService:
         name = name.strip()
         if not name:
             raise ValueError("Category name cannot be empty.")
-        existing = [c.name.lower() for c in self._dao.get_all()]
-        if name.lower() in existing:
+        if self._dao.get_by_name(name):
             raise ValueError(f"A category named '{name}' already exists.")
         return self._dao.create(name, type_, color_hex)
 
@@ -25,8 +24,8 @@ class CategoryService:
         name = name.strip()
         if not name:
             raise ValueError("Category name cannot be empty.")
-        existing = [c for c in self._dao.get_all() if c.id != category_id]
-        if any(c.name.lower() == name.lower() for c in existing):
+        existing = self._dao.get_by_name(name)
+        if existing and existing.id != category_id:
             raise ValueError(f"A category named '{name}' already exists.")
         return self._dao.update(category_id, name, type_, color_hex)
 
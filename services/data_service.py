@@ -4,6 +4,7 @@ recurring rules, transactions) as JSON or CSV-in-ZIP.
 import csv
 import io
 import json
+import sqlite3
 import zipfile
 from datetime import datetime
 
@@ -14,7 +15,8 @@ from database.budget_dao import BudgetDAO
 from database.recurring_dao import RecurringDAO
 from database.transaction_dao import TransactionDAO
 from services.transaction_service import TransactionService
-from utils.date_helpers import today_str
+from utils.currency import from_cents, to_cents
+from utils.date_helpers import parse_date, today_str
 
 
 class DataService:
@@ -129,7 +131,7 @@ class DataService:
                 "name": a.name,
                 "description": a.description,
                 "account_type": a.account_type,
-                "opening_balance": a.opening_balance,
+                "opening_balance": from_cents(a.opening_balance),
             }
             for a in self._account_dao.get_all()
         ]
@@ -150,7 +152,7 @@ class DataService:
             {
                 "category_name": b.category_name,
                 "month": b.month,
-                "limit_amount": b.limit_amount,
+                "limit_amount": from_cents(b.limit_amount),
             }
             for b in self._budget_dao.get_all()
         ]
@@ -161,7 +163,7 @@ class DataService:
             result.append({
                 "name": r.name,
                 "type": r.type,
-                "amount": r.amount,
+                "amount": from_cents(r.amount),
                 "account_name": r.account_name,
                 "category_name": r.category_name,
                 "description": r.description,
@@ -181,30 +183,17 @@ class DataService:
         # Build account id → name map (one DB round-trip)
         acct_name_map = {a.id: a.name for a in self._account_dao.get_all()}
 
-        # Build pair_map: pair_id → [tx, tx] sorted by id
-        pair_map: dict[int, list] = {}
-        for tx in all_txs:
-            if tx.transfer_pair_id is not None:
-                pair_map.setdefault(tx.transfer_pair_id, []).append(tx)
-        for txs in pair_map.values():
-            txs.sort(key=lambda t: t.id)
-
         # Assign sequential group numbers per pair
         pair_groups: dict[int, int] = {}
-        counter = 0
-        for pair_id in sorted(pair_map.keys()):
-            counter += 1
-            pair_groups[pair_id] = counter
+        for pair_id in sorted({tx.transfer_pair_id for tx in all_txs
+                               if tx.transfer_pair_id is not None}):
+            pair_groups[pair_id] = len(pair_groups) + 1
 
         result = []
         for tx in all_txs:
             if tx.transfer_pair_id is not None:
-                pair = pair_map.get(tx.transfer_pair_id, [])
-                group = pair_groups.get(tx.transfer_pair_id)
-                if len(pair) == 2:
-                    role = "debit" if tx.id == pair[0].id else "credit"
-                else:
-                    role = "debit"
+                group = pair_groups[tx.transfer_pair_id]
+                role = "credit" if tx.direction > 0 else "debit"
             else:
                 group = None
                 role = None
@@ -212,7 +201,7 @@ class DataService:
             result.append({
                 "date": tx.date,
                 "type": tx.type,
-                "amount": tx.amount,
+                "amount": from_cents(tx.amount),
                 "account_name": acct_name_map.get(tx.account_id, ""),
                 "category_name": tx.category_name or "",
                 "description": tx.description,
@@ -225,6 +214,23 @@ class DataService:
 
     # ── Private import ────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _bulk_create(create_many, rows: list, group: int = 1) -> list[int | None]:
+        """Insert rows through a DAO create_many in one batch. If the database
+        rejects any row, retry `group` rows at a time so the rest still import;
+        the rows of a rejected group get None in place of an id."""
+        try:
+            return create_many(rows)
+        except sqlite3.Error:
+            ids: list[int | None] = []
+            for i in range(0, len(rows), group):
+                chunk = rows[i:i + group]
+                try:
+                    ids.extend(create_many(chunk))
+                except sqlite3.Error:
+                    ids.extend([None] * len(chunk))
+            return ids
+
     def _import_data(
         self,
         accounts: list[dict],
@@ -233,6 +239,33 @@ class DataService:
         recurring: list[dict],
         transactions: list[dict],
         mode: str,
+    ) -> dict:
+        """Run the whole import as one unit of work: a failed import leaves the
+        database as it was, and a successful one costs a single commit."""
+        try:
+            with self._db.transaction() as conn:
+                stats = self._import_rows(
+                    conn, accounts, categories, budgets, recurring, transactions, mode
+                )
+                # Replace mode deletes with plain SQL; announce everything
+                self._db.changes.publish_all()
+        finally:
+            # get_all() caches may hold rows from a rolled-back import
+            self._account_dao._invalidate_cache()
+            self._category_dao._invalidate_cache()
+        # The planner's statistics predate the imported rows
+        self._db.maintenance.analyze()
+        return stats
+
+    def _import_rows(
+        self,
+        conn,
+        accounts: list[dict],
+        categories: list[dict],
+        budgets: list[dict],
+        recurring: list[dict],
+        transactions: list[dict],
+        mode: str,
     ) -> dict:
         stats = {
             "accounts": 0,
@@ -242,8 +275,6 @@ class DataService:
             "transactions": 0,
         }
 
-        conn = self._db.get_connection()
-
         # Replace mode: clear all user data in FK-safe order
         if mode == "replace":
             conn.execute("DELETE FROM transactions")
@@ -255,7 +286,8 @@ class DataService:
                 pass  # Table may not exist on very old DBs
             conn.execute("DELETE FROM categories WHERE is_system = 0")
             conn.execute("DELETE FROM accounts")
-            conn.commit()
+            self._account_dao._invalidate_cache()
+            self._category_dao._invalidate_cache()
 
         # Build name → id maps for existing entities
         existing_accts = {a.name: a.id for a in self._account_dao.get_all()}
@@ -263,60 +295,69 @@ class DataService:
 
         # ── Accounts ──────────────────────────────────────────────────────────
         acct_map = dict(existing_accts)
+        new_accts: dict[str, tuple] = {}
         for a in accounts:
             name = (a.get("name") or "").strip()
-            if not name:
+            if not name or name in acct_map or name in new_accts:
+                continue  # Already exists — skip in both merge and replace
+            try:
+                opening_balance = to_cents(a.get("opening_balance") or 0.0)
+            except (TypeError, ValueError):
                 continue
-            if name in acct_map:
-                pass  # Already exists — skip in both merge and replace
-            else:
-                new_a = self._account_dao.create(
-                    name,
-                    a.get("description") or "",
-                    a.get("account_type") or "checking",
-                    float(a.get("opening_balance") or 0.0),
-                )
-                acct_map[name] = new_a.id
+            new_accts[name] = (
+                name,
+                a.get("description") or "",
+                a.get("account_type") or "checking",
+                opening_balance,
+            )
+        for name, acct_id in zip(
+            new_accts, self._bulk_create(self._account_dao.create_many, list(new_accts.values()))
+        ):
+            if acct_id is not None:
+                acct_map[name] = acct_id
                 stats["accounts"] += 1
 
         # ── Categories ────────────────────────────────────────────────────────
         cat_map = dict(existing_cats)
+        new_cats: dict[str, tuple] = {}
         for c in categories:
             name = (c.get("name") or "").strip()
-            if not name:
-                continue
-            if name in cat_map:
-                pass  # Already exists (system or user)
-            else:
-                new_c = self._category_dao.create(
-                    name, c.get("type") or "both", c.get("color_hex") or "#888888"
-                )
-                cat_map[name] = new_c.id
+            if not name or name in cat_map or name in new_cats:
+                continue  # Already exists (system or user)
+            new_cats[name] = (name, c.get("type") or "both", c.get("color_hex") or "#888888")
+        for name, cat_id in zip(
+            new_cats, self._bulk_create(self._category_dao.create_many, list(new_cats.values()))
+        ):
+            if cat_id is not None:
+                cat_map[name] = cat_id
                 stats["categories"] += 1
 
         # ── Budgets ───────────────────────────────────────────────────────────
+        existing_budgets: set[tuple] = set()
+        if mode == "merge":
+            existing_budgets = {(b.category_id, b.month) for b in self._budget_dao.get_all()}
+        budget_rows: dict[tuple, int] = {}
         for b in budgets:
             cat_name = (b.get("category_name") or "").strip()
             month = (b.get("month") or "").strip()
             try:
-                limit = float(b.get("limit_amount") or 0)
+                limit = to_cents(b.get("limit_amount") or 0)
             except (TypeError, ValueError):
                 continue
             cat_id = cat_map.get(cat_name)
-            if not cat_id or not month:
+            if not cat_id or not month or (cat_id, month) in existing_budgets:
                 continue
-            if mode == "merge":
-                existing = self._budget_dao.get_by_category_month(cat_id, month)
-                if existing:
-                    continue
-            self._budget_dao.upsert(cat_id, month, limit)
-            stats["budgets"] += 1
+            budget_rows[(cat_id, month)] = limit
+        stats["budgets"] += self._budget_dao.upsert_many(
+            (cat_id, month, limit) for (cat_id, month), limit in budget_rows.items()
+        )
 
         # ── Recurring rules ───────────────────────────────────────────────────
         existing_recurring = {
             (r.name, r.account_id): r
             for r in self._recurring_dao.get_all()
         }
+        rule_rows: list[dict] = []
         for r in recurring:
             acct_name = (r.get("account_name") or "").strip()
             cat_name = (r.get("category_name") or "").strip()
@@ -333,25 +374,30 @@ class DataService:
                 is_active = str(is_active).strip() in ("1", "True", "true")
 
             try:
-                new_rule = self._recurring_dao.create(
-                    name=name,
-                    type_=r.get("type") or "expense",
-                    amount=float(r.get("amount") or 0),
-                    account_id=acct_id,
-                    category_id=cat_id,
-                    description=r.get("description") or "",
-                    frequency=r.get("frequency") or "monthly",
-                    start_date=r.get("start_date") or today_str(),
-                    day_of_month=r.get("day_of_month"),
-                    day_of_week=r.get("day_of_week"),
-                    month_of_year=r.get("month_of_year"),
-                    end_date=r.get("end_date") or None,
-                )
-                if not is_active:
-                    self._recurring_dao.set_active(new_rule.id, False)
-                stats["recurring"] += 1
-            except Exception:
-                pass
+                amount = to_cents(r.get("amount") or 0)
+            except (TypeError, ValueError):
+                continue
+            if amount <= 0:
+                continue
+            rule_rows.append({
+                "name": name,
+                "type_": r.get("type") or "expense",
+                "amount": amount,
+                "account_id": acct_id,
+                "category_id": cat_id,
+                "description": r.get("description") or "",
+                "frequency": r.get("frequency") or "monthly",
+                "start_date": r.get("start_date") or today_str(),
+                "day_of_month": r.get("day_of_month"),
+                "day_of_week": r.get("day_of_week"),
+                "month_of_year": r.get("month_of_year"),
+                "end_date": r.get("end_date") or None,
+                "is_active": is_active,
+            })
+        stats["recurring"] += sum(
+            rule_id is not None
+            for rule_id in self._bulk_create(self._recurring_dao.create_many, rule_rows)
+        )
 
         # ── Transactions ──────────────────────────────────────────────────────
         # Build existing-tx key set for merge dedup
@@ -366,6 +412,7 @@ class DataService:
         transfers = [t for t in transactions if t.get("transfer_group")]
 
         # Pass 1: non-transfer transactions
+        tx_rows: list[dict] = []
         for t in non_transfers:
             acct_name = (t.get("account_name") or "").strip()
             acct_id = acct_map.get(acct_name)
@@ -376,9 +423,11 @@ class DataService:
             date_ = t.get("date") or ""
             type_ = t.get("type") or "expense"
             try:
-                amount = float(t.get("amount") or 0)
+                amount = to_cents(t.get("amount") or 0)
             except (TypeError, ValueError):
                 continue
+            if amount <= 0:
+                continue
             desc = t.get("description") or ""
             cleared = bool(t.get("cleared", False))
 
@@ -388,19 +437,18 @@ class DataService:
                     continue
                 existing_tx_keys.add(key)
 
-            try:
-                self._tx_dao.create(
-                    account_id=acct_id,
-                    type_=type_,
-                    amount=amount,
-                    date=date_,
-                    description=desc,
-                    category_id=cat_id,
-                    cleared=cleared,
-                )
-                stats["transactions"] += 1
-            except Exception:
-                pass
+            tx_rows.append({
+                "account_id": acct_id,
+                "type_": type_,
+                "amount": amount,
+                "date": date_,
+                "description": desc,
+                "category_id": cat_id,
+                "cleared": cleared,
+            })
+        stats["transactions"] += sum(
+            tx_id is not None for tx_id in self._bulk_create(self._tx_dao.create_many, tx_rows)
+        )
 
         # Pass 2: transfers — group by transfer_group int
         transfer_groups: dict[int, list] = {}
@@ -409,6 +457,7 @@ class DataService:
             if g is not None:
                 transfer_groups.setdefault(int(g), []).append(t)
 
+        legs: list[tuple[dict, dict]] = []
         for group, txs in transfer_groups.items():
             if len(txs) != 2:
                 continue
@@ -417,14 +466,16 @@ class DataService:
 
             from_acct_id = acct_map.get((debit.get("account_name") or "").strip())
             to_acct_id = acct_map.get((credit.get("account_name") or "").strip())
-            if not from_acct_id or not to_acct_id:
+            if not from_acct_id or not to_acct_id or from_acct_id == to_acct_id:
                 continue
 
             date_ = debit.get("date") or ""
             try:
-                amount = float(debit.get("amount") or 0)
+                amount = to_cents(debit.get("amount") or 0)
             except (TypeError, ValueError):
                 continue
+            if amount <= 0 or not parse_date(date_):
+                continue
             desc = debit.get("description") or ""
 
             if mode == "merge":
@@ -432,10 +483,22 @@ class DataService:
                 if key in existing_tx_keys:
                     continue
 
-            try:
-                self._tx_svc.create_transfer(from_acct_id, to_acct_id, amount, date_, desc)
-                stats["transactions"] += 2
-            except Exception:
-                pass
+            leg = {"type_": "transfer", "amount": amount, "date": date_, "description": desc}
+            legs.append((
+                {**leg, "account_id": from_acct_id, "direction": -1},
+                {**leg, "account_id": to_acct_id, "direction": 1},
+            ))
+
+        pair_ids = self._tx_dao.allocate_transfer_pair_ids(len(legs))
+        transfer_rows = [
+            {**side, "transfer_pair_id": pair_id}
+            for pair_id, pair in zip(pair_ids, legs)
+            for side in pair
+        ]
+        # Both legs of a transfer are retried together, so none is left half-imported
+        stats["transactions"] += sum(
+            tx_id is not None
+            for tx_id in self._bulk_create(self._tx_dao.create_many, transfer_rows, group=2)
+        )
 
         return stats
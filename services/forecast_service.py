@@ -1,12 +1,32 @@
 import calendar
+import threading
 from datetime import date
 
+import numpy as np
+
+from database.changes import ChangeBus
+from services import cash_flow_simulation as simulation
+
 
 class ForecastService:
-    def __init__(self, recurring_svc, budget_dao, transaction_dao):
+    def __init__(self, recurring_svc, budget_dao, report_svc, changes: ChangeBus | None = None):
         self._recurring_svc = recurring_svc
         self._budget_dao = budget_dao
-        self._tx_dao = transaction_dao
+        self._report_svc = report_svc
+        # Monthly forecasts and simulated paths by (account_id, source, first
+        # month, last month, data version); any committed write starts a new
+        # version
+        self._cache: dict[tuple, list[dict] | np.ndarray] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        if changes:
+            changes.subscribe(lambda _: self.invalidate())
+
+    def invalidate(self):
+        """Drop the cached forecasts; the next one is computed again."""
+        with self._lock:
+            self._cache.clear()
+            self._version += 1
 
     def _monthly_periods(self) -> list[tuple[int, int]]:
         """(year, month) tuples from this month through December of next year."""
@@ -24,32 +44,57 @@ class ForecastService:
 
     def get_monthly_forecast(self, account_id, source: int) -> list[dict]:
         """
-        [{month:'YYYY-MM', income:float, expense:float, net:float}]
+        [{month:'YYYY-MM', income, expense, net}] in cents
         from current month through December of next year.
         source: 1=recurring only, 2=recurring+budgets, 3=recurring+history
         """
+        periods = self._monthly_periods()
+        cached = self._cached(
+            (account_id, source, periods[0], periods[-1]),
+            lambda: self._compute_monthly(account_id, source, periods),
+        )
+        return [dict(row) for row in cached]
+
+    def _cached(self, key: tuple, compute):
+        version = self._version
+        key += (version,)
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            with self._lock:
+                if version == self._version:
+                    self._cache[key] = value
+        return value
+
+    def _compute_monthly(self, account_id, source: int, periods: list[tuple[int, int]]) -> list[dict]:
         avg_nonrecurring = None
         if source == 3:
-            avg_nonrecurring = self._tx_dao.get_avg_monthly_nonrecurring(account_id, months=6)
+            avg_nonrecurring = self._report_svc.get_avg_monthly_nonrecurring(account_id, months=6)
+
+        first_year, first_month = periods[0]
+        last_year, last_month = periods[-1]
+        recurring = self._recurring_svc.plan().monthly_totals(
+            date(first_year, first_month, 1),
+            date(last_year, last_month, calendar.monthrange(last_year, last_month)[1]),
+            account_id,
+        )
+        budgets = {}
+        if source == 2:
+            budgets = self._budget_dao.get_totals_by_month(
+                f"{first_year}-{first_month:02d}", f"{last_year}-{last_month:02d}"
+            )
 
         result = []
-        for year, month in self._monthly_periods():
+        for year, month in periods:
             month_str = f"{year}-{month:02d}"
-            _, last_day = calendar.monthrange(year, month)
-            month_start = date(year, month, 1)
-            month_end = date(year, month, last_day)
-
-            projected = self._recurring_svc.project_for_period(account_id, month_start, month_end)
-            rec_income = sum(p["amount"] for p in projected if p["type"] == "income")
-            rec_expense = sum(p["amount"] for p in projected if p["type"] == "expense")
+            rec_income, rec_expense = recurring.get((year, month), (0, 0))
 
             if source == 1:
                 income = rec_income
                 expense = rec_expense
             elif source == 2:
                 income = rec_income
-                budgets = self._budget_dao.get_by_month(month_str)
-                expense = sum(b.limit_amount for b in budgets) if budgets else rec_expense
+                expense = budgets.get(month_str, rec_expense)
             else:  # source == 3
                 income = rec_income
                 expense = rec_expense + avg_nonrecurring["expense"]
@@ -63,9 +108,70 @@ class ForecastService:
 
         return result
 
+    def get_simulated_forecast(self, account_id, annual: bool = False) -> list[dict]:
+        """
+        Monte Carlo forecast over the same horizon as get_monthly_forecast:
+        recurring amounts plus non-recurring income and expense simulated per
+        category from the last HISTORY_MONTHS months, on SIMULATION_PATHS
+        paths. Percentiles across paths, in cents:
+        monthly: [{month:'YYYY-MM', p10, p50, p90, balance_p10, balance_p50,
+                   balance_p90}] of the month's net and of the cumulative net
+                  since the start of this month
+        annual:  [{year:int, p10, p50, p90}] of each year's net, for the years
+                  the horizon covers
+        """
+        periods = self._monthly_periods()
+        paths = self._cached(
+            (account_id, "simulated", periods[0], periods[-1]),
+            lambda: self._simulate(account_id, periods),
+        )
+        if annual:
+            years = sorted({year for year, _ in periods})
+            column_years = np.array([year for year, _ in periods])
+            by_year = np.stack([paths[:, column_years == year].sum(axis=1) for year in years], axis=1)
+            p10, p50, p90 = simulation.bands(by_year)
+            return [
+                {"year": year, "p10": int(a), "p50": int(b), "p90": int(c)}
+                for year, a, b, c in zip(years, p10, p50, p90)
+            ]
+        p10, p50, p90 = simulation.bands(paths)
+        b10, b50, b90 = simulation.bands(np.cumsum(paths, axis=1))
+        return [
+            {
+                "month": f"{year}-{month:02d}",
+                "p10": int(p10[i]), "p50": int(p50[i]), "p90": int(p90[i]),
+                "balance_p10": int(b10[i]), "balance_p50": int(b50[i]),
+                "balance_p90": int(b90[i]),
+            }
+            for i, (year, month) in enumerate(periods)
+        ]
+
+    def _simulate(self, account_id, periods: list[tuple[int, int]]) -> np.ndarray:
+        """Net cash flow of each simulated path and month, shape (paths, months)."""
+        recurring = self._recurring_svc.plan().monthly_totals(
+            date(*periods[0], 1),
+            date(*periods[-1], calendar.monthrange(*periods[-1])[1]),
+            account_id,
+        )
+        rec_net = np.array([
+            income - expense
+            for income, expense in (recurring.get(p, (0, 0)) for p in periods)
+        ], dtype=np.float64)
+
+        income, expense = self._report_svc.get_category_history(
+            account_id, simulation.HISTORY_MONTHS
+        )
+        rng = np.random.default_rng(simulation.SIMULATION_SEED)
+        months, count = len(periods), simulation.SIMULATION_PATHS
+        return (
+            rec_net
+            + simulation.simulate(simulation.fit(income), months, count, rng)
+            - simulation.simulate(simulation.fit(expense), months, count, rng)
+        )
+
     def get_annual_forecast(self, account_id, source: int) -> list[dict]:
         """
-        [{year:int, income:float, expense:float, net:float}]
+        [{year:int, income, expense, net}] in cents
         for current year through current_year+9 (10 years).
         """
         today = date.today()
@@ -76,15 +182,15 @@ class ForecastService:
         for row in monthly:
             yr = int(row["month"][:4])
             if yr not in by_year:
-                by_year[yr] = {"income": 0.0, "expense": 0.0}
+                by_year[yr] = {"income": 0, "expense": 0}
             by_year[yr]["income"] += row["income"]
             by_year[yr]["expense"] += row["expense"]
 
         # Steady-state annual from last 12 months of the monthly forecast
         last_12 = monthly[-12:] if len(monthly) >= 12 else monthly
         n = max(len(last_12), 1)
-        steady_income = sum(m["income"] for m in last_12) * (12 / n)
-        steady_expense = sum(m["expense"] for m in last_12) * (12 / n)
+        steady_income = round(sum(m["income"] for m in last_12) * 12 / n)
+        steady_expense = round(sum(m["expense"] for m in last_12) * 12 / n)
 
         result = []
         for i in range(10):
@@ -0,0 +1,165 @@
+"""Columnar in-memory copy of the ledger for the reports.
+
+A LedgerFrame holds every transaction of every attached year as parallel NumPy
+arrays, read in one query. The reports are group-bys over those arrays, so
+switching the month or account of a view costs no SQL.
+"""
+import numpy as np
+
+TYPES = ("income", "expense", "transfer")
+_INCOME, _EXPENSE, _TRANSFER = range(len(TYPES))
+
+
+def month_index(month: str) -> int:
+    """'YYYY-MM' as the frame's month code, months since year 0."""
+    return int(month[:4]) * 12 + int(month[5:7]) - 1
+
+
+def month_label(index: int) -> str:
+    """Inverse of month_index()."""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _encode(values) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """(distinct values in sorted order, code of each value, first row of each)."""
+    names, first, codes = np.unique(
+        np.array(values, dtype=str), return_index=True, return_inverse=True
+    )
+    return names.tolist(), codes.astype(np.int32), first
+
+
+class LedgerFrame:
+    """The ledger as columns, one entry per transaction.
+
+    day is the date's ordinal (date.toordinal()), month a month_index() code,
+    amount the signed effect in cents on the account, type an index into TYPES,
+    and account / category indexes into the accounts / categories name lists.
+    Category '' is "no category".
+    """
+
+    def __init__(self, rows: list[tuple]):
+        columns = list(zip(*rows)) if rows else [()] * 8
+        self.accounts, self.account, _ = _encode(columns[0])
+        self.categories, self.category, first = _encode(columns[1])
+        self.category_colors = [columns[2][i] for i in first]
+        type_names, type_codes, _ = _encode(columns[3])
+        to_type = np.array(
+            [TYPES.index(t) if t in TYPES else _TRANSFER for t in type_names], dtype=np.int8
+        )
+        self.type = to_type[type_codes]
+        self.day = np.array(columns[4], dtype=np.int32)
+        self.month = np.array(columns[5], dtype=np.int32)
+        self.amount = np.array(columns[6], dtype=np.int64)
+        self.recurring = np.array(columns[7], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def _mask(self, account: str | None = None, first_month: int | None = None,
+              last_month: int | None = None) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if account is not None:
+            code = self.accounts.index(account) if account in self.accounts else -1
+            mask &= self.account == code
+        if first_month is not None:
+            mask &= self.month >= first_month
+        if last_month is not None:
+            mask &= self.month <= last_month
+        return mask
+
+    def _totals_by(self, keys: np.ndarray, mask: np.ndarray):
+        """(distinct keys, income, expense) over the rows in mask, grouped by key.
+
+        One bincount over key * 3 + type sums every (key, type) pair. Its float
+        sums of whole cents stay exact below 2**53.
+        """
+        distinct, inverse = np.unique(keys[mask], return_inverse=True)
+        sums = np.bincount(
+            inverse * len(TYPES) + self.type[mask],
+            weights=self.amount[mask],
+            minlength=len(distinct) * len(TYPES),
+        )
+        sums = np.rint(sums).astype(np.int64).reshape(-1, len(TYPES))
+        return distinct, sums[:, _INCOME], -sums[:, _EXPENSE]
+
+    def monthly_totals(self, account: str | None = None, months: int = 6) -> list[dict]:
+        """[{month, income, expense}] for the last `months` months with any
+        transaction, oldest first."""
+        if months <= 0:
+            return []
+        distinct, income, expense = self._totals_by(self.month, self._mask(account))
+        return [
+            {"month": month_label(m), "income": int(i), "expense": int(e)}
+            for m, i, e in zip(distinct[-months:], income[-months:], expense[-months:])
+        ]
+
+    def monthly_series(self, first_month: int, last_month: int,
+                       account: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(income, expense) arrays with one entry per calendar month from
+        first_month through last_month, zero where a month has no rows."""
+        mask = self._mask(account, first_month, last_month)
+        size = max(last_month - first_month + 1, 0)
+        sums = np.bincount(
+            (self.month[mask] - first_month) * len(TYPES) + self.type[mask],
+            weights=self.amount[mask],
+            minlength=size * len(TYPES),
+        )
+        sums = np.rint(sums).astype(np.int64).reshape(-1, len(TYPES))
+        return sums[:, _INCOME], -sums[:, _EXPENSE]
+
+    def category_series(self, first_month: int, last_month: int,
+                        account: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Non-recurring (income, expense) arrays of shape (categories, months):
+        each category's totals per calendar month from first_month through
+        last_month, zero where it has no rows."""
+        mask = self._mask(account, first_month, last_month) & ~self.recurring
+        size = max(last_month - first_month + 1, 0)
+        cells = len(self.categories) * size
+        sums = np.bincount(
+            (self.category[mask] * size + self.month[mask] - first_month) * len(TYPES)
+            + self.type[mask],
+            weights=self.amount[mask],
+            minlength=cells * len(TYPES),
+        )
+        sums = np.rint(sums).astype(np.int64).reshape(len(self.categories), size, len(TYPES))
+        return sums[:, :, _INCOME], -sums[:, :, _EXPENSE]
+
+    def totals(self, first_month: int, last_month: int, account: str | None = None) -> dict:
+        """{income, expense} from first_month through last_month."""
+        income, expense = self.monthly_series(first_month, last_month, account)
+        return {"income": int(income.sum()), "expense": int(expense.sum())}
+
+    def category_totals(self, month: int, account: str | None = None) -> list[dict]:
+        """[{category, color_hex, total}] of one month's expenses, largest first."""
+        mask = self._mask(account, month, month) & (self.type == _EXPENSE)
+        distinct, _, expense = self._totals_by(self.category, mask)
+        order = np.argsort(-expense, kind="stable")
+        return [
+            {
+                "category": self.categories[distinct[i]] or "Uncategorized",
+                "color_hex": self.category_colors[distinct[i]],
+                "total": int(expense[i]),
+            }
+            for i in order
+        ]
+
+    def nonrecurring_average(self, account: str | None = None, months: int = 6) -> dict:
+        """Average monthly {income, expense} not generated by recurring rules,
+        over the last `months` months that have any such transaction."""
+        mask = self._mask(account) & ~self.recurring
+        distinct, income, expense = self._totals_by(self.month, mask)
+        count = min(len(distinct), months)
+        if count == 0:
+            return {"income": 0, "expense": 0}
+        return {
+            "income": round(int(income[-count:].sum()) / count),
+            "expense": round(int(expense[-count:].sum()) / count),
+        }
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` entries; the first window - 1 entries
+    average what is available."""
+    sums = np.cumsum(values, dtype=np.float64)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums / np.minimum(np.arange(1, len(values) + 1), window)
@@ -1,9 +1,14 @@
+from datetime import date, timedelta
+from models.account import DEBT_ACCOUNT_TYPES
 from services.account_service import AccountService
 from services.transaction_service import TransactionService
 from utils.date_helpers import (
-    today, current_month_str, format_month, add_months, month_range, friendly_month,
+    today, current_month_str, format_date, format_month, add_months, month_range,
+    friendly_month,
 )
 
+GRANULARITIES = ("day", "week", "month")
+
 
 class NetWorthService:
     def __init__(self, account_service: AccountService, tx_service: TransactionService):
@@ -16,14 +21,14 @@ class NetWorthService:
         balances = self._tx_svc.get_balances_as_of()  # all transactions, no date cap
         assets = []
         liabilities = []
-        total_assets = 0.0
-        total_liabilities = 0.0
+        total_assets = 0
+        total_liabilities = 0
 
         for account in accounts:
-            balance = balances.get(account.id, 0.0)
+            balance = balances.get(account.id, 0)
 
             if account.is_debt_account:
-                amount_owed = max(0.0, account.opening_balance - balance)
+                amount_owed = max(0, account.opening_balance - balance)
                 liabilities.append({"name": account.name, "amount_owed": amount_owed})
                 total_liabilities += amount_owed
             else:
@@ -40,31 +45,52 @@ class NetWorthService:
         }
 
     def get_monthly_history(self, months: int = 12) -> list[dict]:
-        """Return net worth per month for the past `months` months, oldest first."""
+        """Return net worth per month for the past `months` months, oldest first.
+        Months before this year are read from that year's database file."""
         today_date = today()
-        month_start = today_date.replace(day=1)
-
-        # Build month list oldest → newest
-        month_list = [
-            format_month(add_months(month_start, -i))
-            for i in range(months - 1, -1, -1)
+        first = add_months(today_date.replace(day=1), -(months - 1))
+        return [
+            {"month": row["period"], "net_worth": row["net_worth"]}
+            for row in self.get_history(first, today_date, "month")
         ]
 
-        accounts = self._acct_svc.get_all()
+    def get_history(self, first: date, last: date, granularity: str = "month") -> list[dict]:
+        """[{period, net_worth}] at the end of every day, week or month from the
+        one holding `first` through the one holding `last`, oldest first.
+        period is 'YYYY-MM' for months, else the end date: weeks end on Sunday.
+        One query, however many periods."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of {', '.join(GRANULARITIES)}.")
+        ends = _period_ends(first, last, granularity)
+        history = self._tx_svc.get_account_balance_history(ends, granularity)
 
         result = []
-        for month_str in month_list:
-            _, month_end = month_range(month_str)
-            balances = self._tx_svc.get_balances_as_of(month_end)
-            net_worth = 0.0
-
-            for account in accounts:
-                balance = balances.get(account.id, 0.0)
-                if account.is_debt_account:
-                    net_worth -= max(0.0, account.opening_balance - balance)
+        for end in ends:
+            net_worth = 0
+            for account in history[end]:
+                balance = account["balance"]
+                if account["account_type"] in DEBT_ACCOUNT_TYPES:
+                    net_worth -= max(0, account["opening_balance"] - balance)
                 else:
                     net_worth += balance
+            period = end[:7] if granularity == "month" else end
+            result.append({"period": period, "net_worth": net_worth})
+        return result
 
-            result.append({"month": month_str, "net_worth": net_worth})
 
-        return result
+def _period_ends(first: date, last: date, granularity: str) -> list[str]:
+    """End dates (YYYY-MM-DD) of the periods from the one holding `first`
+    through the one holding `last`."""
+    if granularity == "month":
+        ends, month = [], first.replace(day=1)
+        while month <= last:
+            ends.append(month_range(format_month(month))[1])
+            month = add_months(month, 1)
+        return ends
+    step = 7 if granularity == "week" else 1
+    end = first + timedelta(days=(6 - first.weekday()) % 7) if step == 7 else first
+    ends = []
+    while end - timedelta(days=step - 1) <= last:
+        ends.append(format_date(end))
+        end += timedelta(days=step)
+    return ends
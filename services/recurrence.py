@@ -0,0 +1,168 @@
+"""Recurrence engine shared by catch-up, reminders and the forecast.
+
+compile_rule() parses a RecurringRule once into a Schedule. The weekly
+cadences become a step in days from an anchor date, and monthly and yearly
+become a step in months with a target day. Either way the occurrences in a
+window are an arithmetic progression, a range of day ordinals or of month
+indexes. The first occurrence, the count and the list of dates in a window
+are found in closed form, never by walking from the rule's start.
+
+A RecurrencePlan holds the compiled active rules. It expands all of them over
+a whole horizon in one pass, totalled by month and account.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from models.recurring_rule import RecurringRule
+from utils.constants import WEEK_INTERVALS
+from utils.date_helpers import parse_date
+
+Month = tuple[int, int]  # (year, month)
+
+
+def _month_index(d: date) -> int:
+    """Months since year 0, as in services.ledger_frame."""
+    return d.year * 12 + d.month - 1
+
+
+def _resolve_dom(target_day: int, year: int, month: int) -> int:
+    """Calendar day for a day_of_month value: 0 means the last day of the
+    month, anything else is clamped to the month's length."""
+    last = calendar.monthrange(year, month)[1]
+    return last if target_day == 0 else min(target_day, last)
+
+
+@dataclass(frozen=True, slots=True)
+class Schedule:
+    """A rule's cadence with its dates parsed.
+
+    Day cadences (step_days > 0) fall on anchor + k * step_days. Month
+    cadences (step_months > 0) fall on target_day of every month index
+    congruent to phase modulo step_months. A rule with an unknown frequency
+    has neither and never occurs.
+    """
+    rule: RecurringRule
+    start: date
+    end: date | None
+    last_applied: date | None
+    step_days: int = 0
+    anchor: int = 0       # ordinal of the first occurrence of a day cadence
+    step_months: int = 0
+    phase: int = 0        # month index modulo step_months
+    target_day: int = 0   # 0 = last day of the month
+
+    def _occurrence(self, month: int) -> date:
+        """The occurrence in month index `month` of a month cadence."""
+        year, m = divmod(month, 12)
+        return date(year, m + 1, _resolve_dom(self.target_day, year, m + 1))
+
+    def _range(self, first: date, last: date) -> range:
+        """Occurrences in [first, last] within the rule's own start and end
+        dates: day ordinals for a day cadence, month indexes for a month
+        cadence."""
+        lo = max(first, self.start)
+        hi = min(last, self.end) if self.end else last
+        if lo > hi:
+            return range(0)
+        if self.step_days:
+            step = self.step_days
+            k_lo = max(0, -(-(lo.toordinal() - self.anchor) // step))
+            k_hi = (hi.toordinal() - self.anchor) // step
+            return range(self.anchor + k_lo * step, self.anchor + k_hi * step + 1, step)
+        if self.step_months:
+            step = self.step_months
+            m_lo = _month_index(lo)
+            m_lo += (self.phase - m_lo) % step
+            if self._occurrence(m_lo) < lo:
+                m_lo += step
+            m_hi = _month_index(hi)
+            m_hi -= (m_hi - self.phase) % step
+            if self._occurrence(m_hi) > hi:
+                m_hi -= step
+            return range(m_lo, max(m_lo, m_hi + 1), step)
+        return range(0)
+
+    def count(self, first: date, last: date) -> int:
+        """How many times the rule falls due in [first, last]."""
+        return len(self._range(first, last))
+
+    def occurrences(self, first: date, last: date) -> list[date]:
+        """Due dates in [first, last], in order."""
+        points = self._range(first, last)
+        if self.step_days:
+            return [date.fromordinal(p) for p in points]
+        return [self._occurrence(m) for m in points]
+
+    def next_due(self, after: date) -> date | None:
+        """First due date after `after` that has not been applied yet, or None
+        once the rule has ended."""
+        search_from = after + timedelta(days=1)
+        if self.last_applied:
+            search_from = max(search_from, self.last_applied + timedelta(days=1))
+        points = self._range(search_from, self.end or date.max)
+        if not points:
+            return None
+        if self.step_days:
+            return date.fromordinal(points[0])
+        return self._occurrence(points[0])
+
+
+def compile_rule(rule: RecurringRule) -> Schedule:
+    start = parse_date(rule.start_date)
+    end = parse_date(rule.end_date) if rule.end_date else None
+    last_applied = parse_date(rule.last_applied) if rule.last_applied else None
+    target_day = start.day if rule.day_of_month is None else rule.day_of_month
+
+    if rule.frequency in WEEK_INTERVALS:
+        target_dow = start.weekday() if rule.day_of_week is None else rule.day_of_week
+        anchor = start + timedelta(days=(target_dow - start.weekday()) % 7)
+        return Schedule(rule, start, end, last_applied,
+                        step_days=WEEK_INTERVALS[rule.frequency], anchor=anchor.toordinal())
+    if rule.frequency == "monthly":
+        return Schedule(rule, start, end, last_applied, step_months=1, target_day=target_day)
+    if rule.frequency == "yearly":
+        target_month = rule.month_of_year or start.month
+        return Schedule(rule, start, end, last_applied, step_months=12,
+                        phase=target_month - 1, target_day=target_day)
+    return Schedule(rule, start, end, last_applied)
+
+
+class RecurrencePlan:
+    """Compiled schedules of a set of rules, usually the active ones."""
+
+    def __init__(self, rules: list[RecurringRule]):
+        self.schedules = [compile_rule(rule) for rule in rules]
+
+    def project(self, first: date, last: date) -> dict[tuple[Month, int], list[int]]:
+        """Recurring totals in [first, last] as {((year, month), account_id):
+        [income, expense]} in cents. Months without occurrences are absent."""
+        totals: dict[tuple[int, int], list[int]] = {}
+        for schedule in self.schedules:
+            rule = schedule.rule
+            column = 0 if rule.type == "income" else 1
+            points = schedule._range(first, last)
+            if schedule.step_days:
+                months = [_month_index(date.fromordinal(p)) for p in points]
+            else:
+                months = points  # a month cadence falls once per month index
+            for month in months:
+                bucket = totals.get((month, rule.account_id))
+                if bucket is None:
+                    bucket = totals[(month, rule.account_id)] = [0, 0]
+                bucket[column] += rule.amount
+        return {
+            ((month // 12, month % 12 + 1), account): bucket
+            for (month, account), bucket in totals.items()
+        }
+
+    def monthly_totals(self, first: date, last: date, account_id=None) -> dict[Month, tuple[int, int]]:
+        """{(year, month): (income, expense)} in [first, last] for one account,
+        or for all of them when account_id is None."""
+        result: dict[Month, tuple[int, int]] = {}
+        for (month, account), (income, expense) in self.project(first, last).items():
+            if account_id is not None and account != account_id:
+                continue
+            prior_income, prior_expense = result.get(month, (0, 0))
+            result[month] = (prior_income + income, prior_expense + expense)
+        return result
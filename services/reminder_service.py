@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from datetime import date, timedelta
 from services.recurring_service import RecurringService
 from services.budget_service import BudgetService
+from utils.currency import format_currency
 from utils.date_helpers import today, current_month_str, format_date, next_month
 from utils.constants import UPCOMING_REMINDER_DAYS, BUDGET_ALERT_THRESHOLD
 
@@ -84,7 +85,7 @@ class ReminderService:
                         title=f"{rule.name} is overdue",
                         detail=(
                             f"Was due on {next_due.strftime('%b %d')} · "
-                            f"${rule.amount:,.2f} · {rule.category_name} · "
+                            f"{format_currency(rule.amount)} · {rule.category_name} · "
                             f"Rule is inactive"
                         ),
                         key=f"recurring:{rule.id}",
@@ -100,7 +101,7 @@ class ReminderService:
                     title=f"{rule.name} due {day_label}",
                     detail=(
                         f"Due on {next_due.strftime('%b %d')} · "
-                        f"${rule.amount:,.2f} · {rule.category_name} · "
+                        f"{format_currency(rule.amount)} · {rule.category_name} · "
                         f"Account: {rule.account_name}"
                     ),
                     key=f"recurring:{rule.id}",
@@ -120,8 +121,8 @@ class ReminderService:
                     severity="error",
                     title=f"{budget.category_name} is over budget",
                     detail=(
-                        f"Spent ${budget.spent_amount:,.2f} of "
-                        f"${budget.limit_amount:,.2f} limit "
+                        f"Spent {format_currency(budget.spent_amount)} of "
+                        f"{format_currency(budget.limit_amount)} limit "
                         f"({pct*100:.0f}%)"
                     ),
                     key=f"budget:{budget.category_id}",
@@ -132,8 +133,8 @@ class ReminderService:
                     severity="warning",
                     title=f"{budget.category_name} near budget limit",
                     detail=(
-                        f"Spent ${budget.spent_amount:,.2f} of "
-                        f"${budget.limit_amount:,.2f} limit "
+                        f"Spent {format_currency(budget.spent_amount)} of "
+                        f"{format_currency(budget.limit_amount)} limit "
                         f"({pct*100:.0f}%)"
                     ),
                     key=f"budget:{budget.category_id}",
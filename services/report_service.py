@@ -1,20 +1,74 @@
+import threading
+
+import numpy as np
+
 from database.transaction_dao import TransactionDAO
 from database.account_dao import AccountDAO
+from database.changes import ChangeBus
+from services.ledger_frame import LedgerFrame, month_index, rolling_mean
+from utils.currency import format_amount
 from utils.date_helpers import current_month_str
 
 
 class ReportService:
-    def __init__(self, tx_dao: TransactionDAO, account_dao: AccountDAO):
+    """Report views over a LedgerFrame of the whole ledger.
+
+    The frame is read once and reused by every view until a change to the
+    ledger is published on `changes`, or invalidate() is called.
+    """
+
+    def __init__(
+        self, tx_dao: TransactionDAO, account_dao: AccountDAO, changes: ChangeBus | None = None
+    ):
         self._tx_dao = tx_dao
         self._account_dao = account_dao
+        self._frame: LedgerFrame | None = None
+        # Bumped by every invalidation, so a frame read before one is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        if changes:
+            changes.subscribe(lambda _: self.invalidate(), "transaction", "account", "category")
+
+    def invalidate(self):
+        """Drop the cached frame; the next report reads the ledger again."""
+        with self._lock:
+            self._frame = None
+            self._generation += 1
+
+    def _ledger(self) -> LedgerFrame:
+        frame = self._frame
+        if frame is None:
+            generation = self._generation
+            frame = LedgerFrame(self._tx_dao.get_ledger_columns())
+            with self._lock:
+                if generation == self._generation:
+                    self._frame = frame
+        return frame
+
+    def _account_name(self, account_id: int | None) -> str | None:
+        # The frame knows accounts by name, which also matches prior-year files
+        if not account_id:
+            return None
+        acct = self._account_dao.get_by_id(account_id)
+        return acct.name if acct else ""
 
     def get_monthly_chart_data(
-        self, account_id: int | None = None, months: int = 6
+        self, account_id: int | None = None, months: int = 6, window: int = 3
     ) -> list[dict]:
-        """Return list of {month, income, expense, net} for bar chart."""
-        rows = self._tx_dao.get_monthly_totals(account_id, months)
+        """Return list of {month, income, expense, net, net_avg} for bar chart.
+        net_avg is the trailing `window`-month average of net."""
+        frame = self._ledger()
+        account = self._account_name(account_id)
+        rows = frame.monthly_totals(account, months)
+        if not rows:
+            return rows
+        first = month_index(rows[0]["month"]) - (window - 1)
+        last = month_index(rows[-1]["month"])
+        income, expense = frame.monthly_series(first, last, account)
+        net_avg = rolling_mean(income - expense, window)
         for row in rows:
-            row["net"] = row.get("income", 0) - row.get("expense", 0)
+            row["net"] = row["income"] - row["expense"]
+            row["net_avg"] = round(float(net_avg[month_index(row["month"]) - first]))
         return rows
 
     def get_category_breakdown(
@@ -22,18 +76,44 @@ class ReportService:
     ) -> list[dict]:
         """Return [{category, color_hex, total}, ...] for pie chart."""
         m = month or current_month_str()
-        return self._tx_dao.get_expense_by_category(m, account_id)
+        return self._ledger().category_totals(month_index(m), self._account_name(account_id))
 
-    def get_summary(
+    def get_year_over_year(
         self, month: str | None = None, account_id: int | None = None
     ) -> dict:
-        m = month or current_month_str()
-        if account_id:
-            totals = self._tx_dao.get_totals_by_account(account_id, m)
-        else:
-            totals = self._tx_dao.get_totals_for_month(m)
-        totals["net"] = totals["income"] - totals["expense"]
-        return totals
+        """{income, expense, net} of the month and of the same month a year
+        earlier, and the same for the year to date:
+        {month, prior_month, ytd, prior_ytd}."""
+        frame = self._ledger()
+        account = self._account_name(account_id)
+        m = month_index(month or current_month_str())
+        january = m - m % 12
+        periods = {
+            "month": (m, m),
+            "prior_month": (m - 12, m - 12),
+            "ytd": (january, m),
+            "prior_ytd": (january - 12, m - 12),
+        }
+        result = {}
+        for key, (first, last) in periods.items():
+            totals = frame.totals(first, last, account)
+            totals["net"] = totals["income"] - totals["expense"]
+            result[key] = totals
+        return result
+
+    def get_avg_monthly_nonrecurring(self, account_id: int | None, months: int = 6) -> dict:
+        """Average monthly {income, expense} of transactions not created by
+        recurring rules, over the last `months` months that have any."""
+        return self._ledger().nonrecurring_average(self._account_name(account_id), months)
+
+    def get_category_history(
+        self, account_id: int | None, months: int = 12
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Non-recurring (income, expense) per category and month over the
+        `months` calendar months before the current one, as arrays of shape
+        (categories, months) in cents."""
+        last = month_index(current_month_str()) - 1
+        return self._ledger().category_series(last - months + 1, last, self._account_name(account_id))
 
     def export_csv(
         self, account_id: int | None, month: str | None = None
@@ -61,7 +141,7 @@ class ReportService:
                 tx.type,
                 tx.category_name or "",
                 tx.description,
-                f"{tx.amount:.2f}",
+                format_amount(tx.amount),
                 "Yes" if tx.cleared else "No",
                 account_map.get(tx.account_id, ""),
             ])
@@ -1,11 +1,13 @@
-from models.transaction import Transaction
+from models.transaction import Transaction, TransactionPage
+from database.db_manager import DatabaseManager
 from database.transaction_dao import TransactionDAO
 from database.account_dao import AccountDAO
 from utils.date_helpers import parse_date
 
 
 class TransactionService:
-    def __init__(self, tx_dao: TransactionDAO, account_dao: AccountDAO):
+    def __init__(self, db: DatabaseManager, tx_dao: TransactionDAO, account_dao: AccountDAO):
+        self._db = db
         self._dao = tx_dao
         self._account_dao = account_dao
 
@@ -28,53 +30,93 @@ class TransactionService:
         type_filter: str | None = None,
         cleared_filter: str | None = None,
         search: str | None = None,
-    ) -> list[tuple[Transaction, float]]:
-        """Returns transactions paired with running balance for display."""
-        # Always get ALL transactions for balance calculation
-        all_tx = self._dao.get_by_account(account_id)
-        filtered = self._dao.get_by_account(
-            account_id, month, type_filter, cleared_filter, search
+    ) -> list[tuple[Transaction, int]]:
+        """Returns transactions paired with running balance for display.
+
+        With a month, the balance starts from that month's checkpoint and only
+        the month's rows are read; without one, the whole history is walked.
+        """
+        balance = self._dao.get_opening_balance(account_id, month) if month else 0
+        all_tx = self._dao.get_by_account(account_id, month)
+        has_filters = (
+            (type_filter and type_filter != "all")
+            or cleared_filter in ("cleared", "pending")
+            or search
         )
-
-        # Pre-fetch all transfer pairs in a single batch query
-        transfer_pair_ids = list({
-            tx.transfer_pair_id for tx in all_tx
-            if tx.type == "transfer" and tx.transfer_pair_id is not None
-        })
-        pair_map = self._dao.get_by_transfer_pair_ids(transfer_pair_ids)
+        if has_filters:
+            filtered = self._dao.get_by_account(
+                account_id, month, type_filter, cleared_filter, search
+            )
+        else:
+            filtered = all_tx
 
         # Build running balance map: tx.id → cumulative balance
-        balance = 0.0
-        balance_map: dict[int, float] = {}
+        balance_map: dict[int, int] = {}
         for tx in all_tx:
-            if tx.type == "income":
-                balance += tx.amount
-            elif tx.type == "expense":
-                balance -= tx.amount
-            elif tx.type == "transfer":
-                # Debit side: negative; credit side: positive
-                # Convention: the row with the lower id is the debit (from-account)
-                if tx.transfer_pair_id:
-                    pair = pair_map.get(tx.transfer_pair_id, [])
-                    if len(pair) == 2:
-                        debit_id = min(p.id for p in pair)
-                        if tx.id == debit_id:
-                            balance -= tx.amount
-                        else:
-                            balance += tx.amount
-                    else:
-                        balance -= tx.amount
-                else:
-                    balance -= tx.amount
+            balance += tx.signed_amount
             balance_map[tx.id] = balance
 
-        return [(tx, balance_map.get(tx.id, 0.0)) for tx in filtered]
+        return [(tx, balance_map.get(tx.id, 0)) for tx in filtered]
+
+    def get_page(
+        self,
+        account_id: int,
+        month: str | None = None,
+        type_filter: str | None = None,
+        cleared_filter: str | None = None,
+        search: str | None = None,
+        after: tuple[str, int] | None = None,
+        before: tuple[str, int] | None = None,
+        jump_to: str | None = None,
+        page_size: int = 100,
+    ) -> TransactionPage:
+        """One register page with running balances, seeking on (date, id).
+
+        Pass a page's last_key as `after` for the next page or its first_key as
+        `before` for the previous one; jump_to (YYYY-MM-DD) starts the page at
+        the first row on or after that date. A seek past the last row returns
+        the last page instead. Only the page's rows are read, plus the
+        unfiltered rows they span for the balances.
+        """
+        filters = (account_id, month, type_filter, cleared_filter, search)
+        if jump_to:
+            after, before = (jump_to, 0), None
+        txs = self._dao.get_page(*filters, after=after, before=before, limit=page_size)
+        if not txs and after:
+            txs = self._dao.get_page(*filters, before=after, limit=page_size)
+        total = self._dao.count(*filters)
+        if not txs:
+            return TransactionPage(total=total)
+
+        page = TransactionPage(total=total)
+        balances = self._dao.get_running_balances(
+            account_id, (txs[0].date, txs[0].id), (txs[-1].date, txs[-1].id)
+        )
+        page.rows = [(tx, balances.get(tx.id, 0)) for tx in txs]
+        page.offset = self._dao.count(*filters, before=page.first_key)
+        page.has_prev = page.offset > 0
+        page.has_next = page.offset + len(txs) < total
+        return page
+
+    def get_current_balance(self, account_id: int) -> int:
+        """Balance of one account including every transaction."""
+        return self._dao.get_current_balance(account_id)
 
-    def get_balances_as_of(self, as_of_date: str | None = None) -> dict[int, float]:
+    def get_balances_as_of(self, as_of_date: str | None = None) -> dict[int, int]:
         """Return {account_id: balance} for all accounts via a single SQL aggregate.
         as_of_date is YYYY-MM-DD; omit to include all transactions."""
         return self._dao.get_balances_as_of(as_of_date)
 
+    def get_account_balances_as_of(self, as_of_date: str) -> list[dict]:
+        """Per-account balances from the year file that holds as_of_date (YYYY-MM-DD)."""
+        return self._dao.get_account_balances_as_of(as_of_date)
+
+    def get_account_balance_history(
+        self, period_ends: list[str], granularity: str = "month"
+    ) -> dict[str, list[dict]]:
+        """get_account_balances_as_of() for many period end dates in one query."""
+        return self._dao.get_account_balance_history(period_ends, granularity)
+
     def get_totals(self, account_id: int, month: str) -> dict:
         totals = self._dao.get_totals_by_account(account_id, month)
         totals["net"] = totals["income"] - totals["expense"]
@@ -84,7 +126,7 @@ class TransactionService:
         self,
         account_id: int,
         type_: str,
-        amount: float,
+        amount: int,
         date: str,
         category_id: int,
         description: str = "",
@@ -107,7 +149,7 @@ class TransactionService:
         self,
         from_account_id: int,
         to_account_id: int,
-        amount: float,
+        amount: int,
         date: str,
         description: str = "",
     ) -> tuple[Transaction, Transaction]:
@@ -119,8 +161,7 @@ class TransactionService:
         if not parse_date(date):
             raise ValueError("Invalid date.")
 
-        conn = self._dao._db.get_connection()
-        try:
+        with self._db.transaction():
             pair_id = self._dao.get_next_transfer_pair_id()
             debit = self._dao.create(
                 account_id=from_account_id,
@@ -131,6 +172,7 @@ class TransactionService:
                 category_id=None,
                 cleared=False,
                 transfer_pair_id=pair_id,
+                direction=-1,
             )
             credit = self._dao.create(
                 account_id=to_account_id,
@@ -141,18 +183,15 @@ class TransactionService:
                 category_id=None,
                 cleared=False,
                 transfer_pair_id=pair_id,
+                direction=1,
             )
-            conn.commit()
-            return debit, credit
-        except Exception:
-            conn.rollback()
-            raise
+        return debit, credit
 
     def update(
         self,
         tx_id: int,
         type_: str,
-        amount: float,
+        amount: int,
         date: str,
         category_id: int | None,
         description: str = "",
@@ -175,7 +214,7 @@ class TransactionService:
     def get_transfer_pair(self, pair_id: int) -> list[Transaction]:
         return self._dao.get_by_transfer_pair(pair_id)
 
-    def _validate(self, type_: str, amount: float, date: str):
+    def _validate(self, type_: str, amount: int, date: str):
         if type_ not in ("income", "expense", "transfer"):
             raise ValueError(f"Invalid type: {type_}")
         if amount <= 0:
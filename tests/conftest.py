@@ -0,0 +1,41 @@
+import pytest
+
+from database.account_dao import AccountDAO
+from database.category_dao import CategoryDAO
+from database.db_manager import DatabaseManager
+from database.transaction_dao import TransactionDAO
+from services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A migrated DatabaseManager on an empty file of its own."""
+    manager = DatabaseManager(str(tmp_path / "budget.db"))
+    manager.initialize()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def account_dao(db):
+    return AccountDAO(db)
+
+
+@pytest.fixture
+def category_dao(db):
+    return CategoryDAO(db)
+
+
+@pytest.fixture
+def tx_dao(db):
+    return TransactionDAO(db)
+
+
+@pytest.fixture
+def tx_service(db, tx_dao, account_dao):
+    return TransactionService(db, tx_dao, account_dao)
+
+
+@pytest.fixture
+def expense_category(category_dao):
+    return category_dao.get_for_transaction_type("expense")[0]
@@ -0,0 +1,68 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from services.ledger_frame import LedgerFrame, month_index, month_label
+
+
+def _row(account, category, type_, day, amount, recurring=False):
+    """A frame row as the ledger query returns it; amount is signed cents."""
+    d = date.fromisoformat(day)
+    return (account, category, "#888888", type_, d.toordinal(),
+            month_index(day[:7]), amount, recurring)
+
+
+@pytest.fixture
+def frame():
+    return LedgerFrame([
+        _row("Everyday", "Salary", "income", "2024-01-31", 300000, recurring=True),
+        _row("Everyday", "Food", "expense", "2024-01-05", -4550),
+        _row("Everyday", "Food", "expense", "2024-03-09", -1250),
+        _row("Rainy day", "", "transfer", "2024-03-10", 10000),
+        _row("Rainy day", "Gifts", "income", "2024-04-01", 2000),
+    ])
+
+
+def test_month_codes_round_trip():
+    assert month_label(month_index("2024-12")) == "2024-12"
+    assert month_index("2025-01") - month_index("2024-12") == 1
+
+
+def test_monthly_totals_takes_the_last_months_with_rows(frame):
+    assert frame.monthly_totals(months=2) == [
+        {"month": "2024-03", "income": 0, "expense": 1250},
+        {"month": "2024-04", "income": 2000, "expense": 0},
+    ]
+    assert [m["month"] for m in frame.monthly_totals(months=12)] == [
+        "2024-01", "2024-03", "2024-04",
+    ]
+    assert frame.monthly_totals("Everyday", months=1) == [
+        {"month": "2024-03", "income": 0, "expense": 1250},
+    ]
+
+
+@pytest.mark.parametrize("months", [0, -3])
+def test_monthly_totals_of_no_months_is_empty(frame, months):
+    # A slice [-0:] would have returned every month
+    assert frame.monthly_totals(months=months) == []
+
+
+def test_monthly_series_fills_empty_months(frame):
+    income, expense = frame.monthly_series(month_index("2024-01"), month_index("2024-04"))
+    assert income.tolist() == [300000, 0, 0, 2000]
+    assert expense.tolist() == [4550, 0, 1250, 0]
+    income, expense = frame.monthly_series(month_index("2024-05"), month_index("2024-04"))
+    assert income.size == expense.size == 0
+
+
+def test_nonrecurring_average_leaves_out_recurring_rows(frame):
+    assert frame.nonrecurring_average("Everyday", months=6) == {"income": 0, "expense": 2900}
+
+
+def test_empty_frame():
+    frame = LedgerFrame([])
+    assert len(frame) == 0
+    assert frame.monthly_totals(months=6) == []
+    income, _ = frame.monthly_series(month_index("2024-01"), month_index("2024-03"))
+    assert np.array_equal(income, [0, 0, 0])
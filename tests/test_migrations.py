@@ -0,0 +1,93 @@
+import sqlite3
+
+from database.db_manager import DatabaseManager
+from database.migrations import MIGRATIONS, SCHEMA_VERSION
+
+
+def _version_one(path) -> DatabaseManager:
+    """A database left at migration 1, with money stored as REAL."""
+    db = DatabaseManager(str(path))
+    with db.transaction() as conn:
+        MIGRATIONS[0][2](conn)
+        conn.execute("PRAGMA user_version = 1")
+    return db
+
+
+def _column_types(conn: sqlite3.Connection, table: str) -> dict[str, str]:
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_integer_cents_converts_money_columns(tmp_path):
+    db = _version_one(tmp_path / "budget.db")
+    conn = db.get_connection()
+    with db.transaction():
+        account = conn.execute(
+            "INSERT INTO accounts(name, opening_balance) VALUES ('Old', 100.1)"
+        ).lastrowid
+        category = conn.execute("SELECT id FROM categories WHERE type = 'expense'").fetchone()[0]
+        # 0.1 + 0.2 and 19.99 are not exact in binary floating point
+        for amount, date in ((0.1 + 0.2, "2024-01-05"), (19.99, "2024-01-20"), (5.005, "2024-02-01")):
+            conn.execute(
+                "INSERT INTO transactions(account_id, type, amount, category_id, date)"
+                " VALUES (?, 'expense', ?, ?, ?)",
+                (account, amount, category, date),
+            )
+        conn.execute(
+            "INSERT INTO budgets(category_id, month, limit_amount) VALUES (?, '2024-01', 250.75)",
+            (category,),
+        )
+    db.initialize()
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        for table, column in (("accounts", "opening_balance"), ("transactions", "amount"),
+                              ("budgets", "limit_amount"), ("monthly_rollups", "total")):
+            assert _column_types(conn, table)[column] == "INTEGER"
+
+        assert conn.execute(
+            "SELECT opening_balance FROM accounts WHERE id = ?", (account,)
+        ).fetchone()[0] == 10010
+        amounts = [row[0] for row in conn.execute("SELECT amount FROM transactions ORDER BY date")]
+        assert amounts == [30, 1999, 501]
+        assert all(type(a) is int for a in amounts)
+        assert conn.execute("SELECT limit_amount FROM budgets").fetchone()[0] == 25075
+
+        # Rollups and checkpoints are rebuilt from the rounded rows
+        rollups = dict(conn.execute(
+            "SELECT month, total FROM monthly_rollups WHERE account_id = ?", (account,)
+        ).fetchall())
+        assert rollups == {"2024-01": 2029, "2024-02": 501}
+        checkpoint = conn.execute(
+            "SELECT opening_balance FROM balance_checkpoints"
+            " WHERE account_id = ? AND month = '2024-02'", (account,)
+        ).fetchone()[0]
+        assert checkpoint == -2029
+    finally:
+        db.close()
+
+
+def test_integer_cents_keeps_ids_and_triggers(tmp_path):
+    db = _version_one(tmp_path / "budget.db")
+    conn = db.get_connection()
+    with db.transaction():
+        conn.execute("INSERT INTO accounts(name) VALUES ('Dropped')")
+        conn.execute("DELETE FROM accounts WHERE name = 'Dropped'")
+    dropped = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'accounts'").fetchone()[0]
+    db.initialize()
+    try:
+        # AUTOINCREMENT does not hand out the deleted account's id again
+        with db.transaction():
+            new_id = conn.execute("INSERT INTO accounts(name) VALUES ('New')").lastrowid
+        assert new_id == dropped + 1
+
+        category = conn.execute("SELECT id FROM categories WHERE type = 'expense'").fetchone()[0]
+        with db.transaction():
+            conn.execute(
+                "INSERT INTO transactions(account_id, type, amount, category_id, date)"
+                " VALUES (?, 'expense', 1234, ?, '2024-03-01')",
+                (new_id, category),
+            )
+        assert conn.execute(
+            "SELECT total FROM monthly_rollups WHERE account_id = ?", (new_id,)
+        ).fetchone()[0] == 1234
+    finally:
+        db.close()
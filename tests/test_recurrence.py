@@ -0,0 +1,98 @@
+import calendar
+from datetime import date, timedelta
+
+import pytest
+
+from models.recurring_rule import RecurringRule
+from services.recurrence import RecurrencePlan, compile_rule
+from utils.constants import WEEK_INTERVALS
+
+
+def _rule(frequency, start, end=None, **fields) -> RecurringRule:
+    fields = {"type": "expense", "amount": 1000, "account_id": 1, **fields}
+    return RecurringRule(
+        id=1, name="Rule", category_id=1, description="", frequency=frequency,
+        start_date=start, is_active=True, end_date=end, **fields,
+    )
+
+
+def _walk(rule: RecurringRule, first: date, last: date) -> list[date]:
+    """Due dates found by testing every day of the window."""
+    start = date.fromisoformat(rule.start_date)
+    end = date.fromisoformat(rule.end_date) if rule.end_date else last
+    due, day = [], max(first, start)
+    while day <= min(last, end):
+        month_end = calendar.monthrange(day.year, day.month)[1]
+        target = rule.day_of_month if rule.day_of_month is not None else start.day
+        dom = month_end if target == 0 else min(target, month_end)
+        if rule.frequency in WEEK_INTERVALS:
+            weekday = start.weekday() if rule.day_of_week is None else rule.day_of_week
+            anchor = start + timedelta(days=(weekday - start.weekday()) % 7)
+            hit = day >= anchor and (day - anchor).days % WEEK_INTERVALS[rule.frequency] == 0
+        elif rule.frequency == "monthly":
+            hit = day.day == dom
+        else:
+            hit = day.month == (rule.month_of_year or start.month) and day.day == dom
+        if hit:
+            due.append(day)
+        day += timedelta(days=1)
+    return due
+
+
+RULES = [
+    _rule("weekly", "2024-01-03"),
+    _rule("weekly", "2024-01-03", day_of_week=0),
+    _rule("every 2 weeks", "2024-02-29", "2024-09-30", day_of_week=4),
+    _rule("every 4 weeks", "2023-12-31"),
+    _rule("monthly", "2024-01-31"),                     # clamped in short months
+    _rule("monthly", "2024-01-15", day_of_month=0),     # last day of the month
+    _rule("monthly", "2024-03-10", "2024-08-09"),
+    _rule("yearly", "2020-02-29"),                      # 28 Feb in other years
+    _rule("yearly", "2023-06-01", month_of_year=11, day_of_month=30),
+]
+WINDOWS = [
+    (date(2024, 1, 1), date(2024, 12, 31)),
+    (date(2024, 2, 29), date(2024, 2, 29)),
+    (date(2023, 1, 1), date(2023, 12, 31)),
+    (date(2024, 3, 11), date(2025, 3, 9)),
+    (date(2025, 1, 1), date(2024, 1, 1)),               # empty
+]
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda r: f"{r.frequency}-{r.start_date}")
+@pytest.mark.parametrize("window", WINDOWS, ids=str)
+def test_occurrences_and_count_match_a_day_by_day_walk(rule, window):
+    schedule = compile_rule(rule)
+    expected = _walk(rule, *window)
+    assert schedule.occurrences(*window) == expected
+    assert schedule.count(*window) == len(expected)
+
+
+def test_month_ends_are_clamped():
+    schedule = compile_rule(_rule("monthly", "2024-01-31"))
+    assert schedule.occurrences(date(2024, 1, 1), date(2024, 4, 30)) == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+    ]
+    leap = compile_rule(_rule("yearly", "2020-02-29"))
+    assert leap.occurrences(date(2021, 1, 1), date(2024, 12, 31)) == [
+        date(2021, 2, 28), date(2022, 2, 28), date(2023, 2, 28), date(2024, 2, 29),
+    ]
+
+
+def test_next_due_skips_applied_dates_and_stops_at_the_end():
+    schedule = compile_rule(_rule("monthly", "2024-01-15", "2024-03-31", last_applied="2024-02-15"))
+    assert schedule.next_due(date(2024, 1, 1)) == date(2024, 3, 15)
+    assert schedule.next_due(date(2024, 3, 15)) is None
+
+
+def test_plan_totals_by_month_and_account():
+    rules = [
+        _rule("weekly", "2024-01-01"),                          # Mondays
+        _rule("monthly", "2024-01-31", type="income", amount=5000, account_id=2),
+    ]
+    plan = RecurrencePlan(rules)
+    totals = plan.monthly_totals(date(2024, 1, 1), date(2024, 2, 29))
+    assert totals == {(2024, 1): (5000, 5000), (2024, 2): (5000, 4000)}
+    assert plan.monthly_totals(date(2024, 1, 1), date(2024, 2, 29), account_id=2) == {
+        (2024, 1): (5000, 0), (2024, 2): (5000, 0),
+    }
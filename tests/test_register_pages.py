@@ -0,0 +1,93 @@
+import pytest
+
+
+@pytest.fixture
+def ledger(account_dao, tx_dao, tx_service, expense_category):
+    """An account with 23 rows over three months, several on the same date,
+    and a transfer in. Returns (account, rows in register order, expected
+    running balance after each row)."""
+    account = account_dao.create("Everyday", opening_balance=1000)
+    other = account_dao.create("Rainy day", opening_balance=50000)
+    dates = [f"2024-01-{d:02d}" for d in (3, 3, 3, 10, 31)]
+    dates += [f"2024-02-{d:02d}" for d in range(1, 29, 2)]
+    dates += [f"2024-03-{d:02d}" for d in (1, 1, 15, 31)]
+    rows = []
+    for n, date in enumerate(dates, start=1):
+        type_ = "income" if n % 4 == 0 else "expense"
+        rows.append(tx_dao.create(account.id, type_, n * 100, date, category_id=expense_category.id))
+    tx_service.create_transfer(other.id, account.id, 2500, "2024-02-01", "top up")
+    rows = sorted(tx_dao.get_by_account(account.id), key=lambda t: (t.date, t.id))
+    # The register's balance is the sum of the rows, as in get_with_running_balance()
+    balances, balance = [], 0
+    for tx in rows:
+        balance += tx.signed_amount
+        balances.append(balance)
+    return account, rows, balances
+
+
+def _key(tx):
+    return (tx.date, tx.id)
+
+
+def test_running_balances_match_a_full_scan(tx_dao, ledger):
+    account, rows, balances = ledger
+    expected = {tx.id: b for tx, b in zip(rows, balances)}
+    windows = [
+        (0, 0),                      # the account's first row
+        (len(rows) - 1, len(rows) - 1),
+        (0, len(rows) - 1),
+        (1, 2),                      # inside one date
+        (3, 8),                      # across a month end
+        (10, 12),                    # starting mid-month, after a checkpoint
+    ]
+    for lo, hi in windows:
+        result = tx_dao.get_running_balances(account.id, _key(rows[lo]), _key(rows[hi]))
+        assert result == {tx.id: expected[tx.id] for tx in rows[lo:hi + 1]}
+
+
+def test_paging_forward_and_back_visits_every_row_once(tx_service, ledger):
+    account, rows, balances = ledger
+    pages = [tx_service.get_page(account.id, page_size=7)]
+    while pages[-1].has_next:
+        pages.append(tx_service.get_page(account.id, after=pages[-1].last_key, page_size=7))
+    seen = [(tx.id, balance) for page in pages for tx, balance in page.rows]
+    assert seen == [(tx.id, b) for tx, b in zip(rows, balances)]
+    assert [p.offset for p in pages] == list(range(0, len(rows), 7))
+    assert not pages[0].has_prev and all(p.has_prev for p in pages[1:])
+    assert all(p.total == len(rows) for p in pages)
+
+    back = [pages[-1]]
+    while back[-1].has_prev:
+        back.append(tx_service.get_page(account.id, before=back[-1].first_key, page_size=7))
+    seen_back = [tx.id for page in reversed(back) for tx, _ in page.rows]
+    assert seen_back == [tx.id for tx in rows]
+
+
+def test_jump_to_starts_at_the_first_row_on_or_after_the_date(tx_service, ledger):
+    account, rows, _ = ledger
+    page = tx_service.get_page(account.id, jump_to="2024-02-02", page_size=5)
+    first = next(i for i, tx in enumerate(rows) if tx.date >= "2024-02-02")
+    assert [tx.id for tx, _ in page.rows] == [tx.id for tx in rows[first:first + 5]]
+    assert page.offset == first
+
+    page = tx_service.get_page(account.id, jump_to="2023-01-01", page_size=5)
+    assert page.offset == 0 and not page.has_prev
+
+
+def test_jump_past_the_last_row_returns_the_last_page(tx_service, ledger):
+    account, rows, balances = ledger
+    page = tx_service.get_page(account.id, jump_to="2030-01-01", page_size=10)
+    assert [tx.id for tx, _ in page.rows] == [tx.id for tx in rows[-10:]]
+    assert page.rows[-1][1] == balances[-1]
+    assert page.offset == len(rows) - 10
+    assert page.has_prev and not page.has_next
+
+    previous = tx_service.get_page(account.id, before=page.first_key, page_size=10)
+    assert [tx.id for tx, _ in previous.rows] == [tx.id for tx in rows[-20:-10]]
+
+
+def test_empty_filter_gives_an_empty_page(tx_service, ledger):
+    account, _, _ = ledger
+    page = tx_service.get_page(account.id, month="2025-06", jump_to="2025-06-01")
+    assert page.rows == [] and page.total == 0
+    assert not page.has_prev and not page.has_next
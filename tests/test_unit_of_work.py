@@ -0,0 +1,70 @@
+import pytest
+
+
+class Boom(Exception):
+    pass
+
+
+@pytest.fixture
+def published(db):
+    """Changes delivered by the bus, and those it dropped on rollback."""
+    delivered, dropped = [], []
+    db.changes.subscribe(delivered.append)
+    db.changes.subscribe_discards(dropped.append)
+    return delivered, dropped
+
+
+def test_rollback_drops_held_changes(db, account_dao, published):
+    delivered, dropped = published
+    with pytest.raises(Boom):
+        with db.transaction():
+            account = account_dao.create("Gone")
+            assert delivered == []
+            raise Boom
+    assert delivered == []
+    assert [c.ids for c in dropped] == [frozenset({account.id})]
+    assert account_dao.get_by_name("Gone") is None
+
+
+def test_failed_savepoint_drops_only_its_own_changes(db, account_dao, published):
+    delivered, dropped = published
+    with db.transaction():
+        kept = account_dao.create("Kept")
+        with pytest.raises(Boom):
+            with db.transaction():
+                undone = account_dao.create("Undone")
+                raise Boom
+        later = account_dao.create("Later")
+    assert [c.ids for c in delivered] == [frozenset({kept.id}), frozenset({later.id})]
+    assert [c.ids for c in dropped] == [frozenset({undone.id})]
+    names = {a.name for a in account_dao.get_all()}
+    assert {"Kept", "Later"} <= names and "Undone" not in names
+
+
+def test_identity_map_never_serves_rolled_back_rows(db, account_dao, category_dao):
+    account = account_dao.create("Everyday")
+    category = category_dao.create("Hobbies", "expense")
+    category_dao.get_all()
+    with pytest.raises(Boom):
+        with db.transaction():
+            account_dao.update(account.id, "Renamed")
+            category_dao.delete(category.id)
+            account_dao.create("Gone")
+            # The account map is first loaded here, with the uncommitted rows
+            assert account_dao.get_by_name("Renamed") is not None
+            raise Boom
+    assert account_dao.get_by_id(account.id).name == "Everyday"
+    assert account_dao.get_by_name("Gone") is None
+    assert category_dao.get_by_id(category.id) == category
+
+
+def test_commit_patches_identity_map(db, account_dao):
+    account = account_dao.create("Everyday")
+    assert account_dao.get_by_id(account.id) == account
+    with db.transaction():
+        updated = account_dao.update(account.id, "Renamed")
+        assert updated.name == "Renamed"
+    assert account_dao.get_by_id(account.id).name == "Renamed"
+    assert account_dao.get_by_name("Everyday") is None
+    account_dao.delete(account.id)
+    assert account_dao.get_by_id(account.id) is None
@@ -11,7 +11,9 @@ from services.forecast_service import ForecastService
 from services.net_worth_service import NetWorthService
 from services.category_service import CategoryService
 from services.data_service import DataService
+from services.async_facade import AsyncFacade
 from database.category_dao import CategoryDAO
+from database.changes import Change
 from database.db_manager import DatabaseManager
 from ui.components.account_form import AccountForm
 from ui.components.alert_banner import AlertBanner
@@ -28,16 +30,29 @@ from ui.tabs.settings_tab import SettingsTab
 from utils.constants import APP_NAME, APP_WIDTH, APP_HEIGHT
 
 
-_REFRESH_SCOPES: dict[str, set[str]] = {
-    "transaction": {"dashboard", "register", "budgets", "reports", "net_worth", "forecast"},
-    "budget":      {"dashboard", "budgets"},
-    "recurring":   {"dashboard", "recurring", "forecast"},
-    "category":    {"dashboard", "register", "budgets", "reports", "categories"},
-    "account":     {"dashboard", "register", "reports", "net_worth", "forecast"},
-    "full":        {"dashboard", "register", "budgets", "recurring", "reports",
-                    "net_worth", "forecast", "categories", "settings"},
+# Entities each tab displays; a committed change to one marks the tab stale.
+_TAB_DEPENDENCIES: dict[str, set[str]] = {
+    "Dashboard":  {"transaction", "budget", "recurring", "category", "account"},
+    "Register":   {"transaction", "category", "account"},
+    "Budgets":    {"transaction", "budget", "category"},
+    "Recurring":  {"recurring", "category", "account"},
+    "Reports":    {"transaction", "category", "account"},
+    "Net Worth":  {"transaction", "account"},
+    "Forecast":   {"transaction", "recurring", "budget", "account"},
+    "Categories": {"category"},
+    # The maintenance report: file size and free pages
+    "Settings":   {"transaction", "budget", "recurring", "category", "account"},
 }
 
+# Tabs that show only the selected account's transactions.
+_ACCOUNT_TABS = {"Register"}
+
+# How often to check for writes made by another process.
+_EXTERNAL_POLL_MS = 2000
+
+# How often to offer the database its idle-time maintenance.
+_MAINTENANCE_POLL_MS = 10_000
+
 
 class AppWindow(ctk.CTk):
     def __init__(
@@ -52,6 +67,7 @@ class AppWindow(ctk.CTk):
         net_worth_service: NetWorthService,
         category_service: CategoryService,
         category_dao: CategoryDAO,
+        facade: AsyncFacade,
         db: DatabaseManager | None = None,
         data_service: DataService | None = None,
         dismissed_reminder_dao=None,
@@ -72,6 +88,7 @@ class AppWindow(ctk.CTk):
         self._net_worth_svc = net_worth_service
         self._cat_svc = category_service
         self._cat_dao = category_dao
+        self._facade = facade
         self._db = db
         self._data_svc = data_service
         self._dismissed_dao = dismissed_reminder_dao
@@ -91,10 +108,21 @@ class AppWindow(ctk.CTk):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(2, weight=1)
 
+        # Tabs are refreshed from the change bus: the visible one at once,
+        # the others when next selected
+        self._stale_tabs: set[str] = set()
+        self._accounts_stale = False
+        self._flush_pending = False
+
         self._build_account_bar()
         self._build_banner_area()
         self._build_tabs()
 
+        if self._db:
+            self._db.changes.subscribe(self._on_data_changed)
+            self._poll_external_changes()
+            self.after(_MAINTENANCE_POLL_MS, self._run_idle_maintenance)
+
         # Show startup banner for new recurring transactions
         if self._startup_transactions:
             count = len(self._startup_transactions)
@@ -147,7 +175,7 @@ class AppWindow(ctk.CTk):
         self._banner_frame.grid(row=1, column=0, sticky="ew", padx=8)
 
     def _build_tabs(self):
-        self._tabview = ctk.CTkTabview(self)
+        self._tabview = ctk.CTkTabview(self, command=self._on_tab_selected)
         self._tabview.grid(row=2, column=0, sticky="nsew", padx=8, pady=(0, 8))
 
         tab_names = [
@@ -163,6 +191,7 @@ class AppWindow(ctk.CTk):
             self._tabview.tab("Dashboard"),
             tx_service=self._tx_svc,
             budget_service=self._budget_svc,
+            facade=self._facade,
             get_account_id=self._get_current_account_id,
             get_account=lambda: self._current_account,
             date_format=self._date_format,
@@ -174,9 +203,9 @@ class AppWindow(ctk.CTk):
             tx_service=self._tx_svc,
             account_service=self._acct_svc,
             category_dao=self._cat_dao,
+            facade=self._facade,
             get_account_id=self._get_current_account_id,
             get_account=lambda: self._current_account,
-            notify_refresh=self.notify_tabs_refresh,
             date_format=self._date_format,
         )
         self._register_tab.grid(row=0, column=0, sticky="nsew")
@@ -184,7 +213,7 @@ class AppWindow(ctk.CTk):
         self._budgets_tab = BudgetsTab(
             self._tabview.tab("Budgets"),
             budget_service=self._budget_svc,
-            notify_refresh=self.notify_tabs_refresh,
+            facade=self._facade,
         )
         self._budgets_tab.grid(row=0, column=0, sticky="nsew")
 
@@ -192,12 +221,14 @@ class AppWindow(ctk.CTk):
             self._tabview.tab("Reports"),
             report_service=self._report_svc,
             account_service=self._acct_svc,
+            facade=self._facade,
         )
         self._reports_tab.grid(row=0, column=0, sticky="nsew")
 
         self._net_worth_tab = NetWorthTab(
             self._tabview.tab("Net Worth"),
             net_worth_service=self._net_worth_svc,
+            facade=self._facade,
         )
         self._net_worth_tab.grid(row=0, column=0, sticky="nsew")
 
@@ -206,7 +237,7 @@ class AppWindow(ctk.CTk):
             recurring_service=self._recurring_svc,
             account_service=self._acct_svc,
             category_dao=self._cat_dao,
-            notify_refresh=self.notify_tabs_refresh,
+            facade=self._facade,
             date_format=self._date_format,
         )
         self._recurring_tab.grid(row=0, column=0, sticky="nsew")
@@ -215,13 +246,14 @@ class AppWindow(ctk.CTk):
             self._tabview.tab("Forecast"),
             forecast_service=self._forecast_svc,
             account_service=self._acct_svc,
+            facade=self._facade,
         )
         self._forecast_tab.grid(row=0, column=0, sticky="nsew")
 
         self._categories_tab = CategoriesTab(
             self._tabview.tab("Categories"),
             category_service=self._cat_svc,
-            notify_refresh=self.notify_tabs_refresh,
+            facade=self._facade,
         )
         self._categories_tab.grid(row=0, column=0, sticky="nsew")
 
@@ -231,7 +263,6 @@ class AppWindow(ctk.CTk):
                 self._tabview.tab("Settings"),
                 db=self._db,
                 data_service=self._data_svc,
-                notify_refresh=self.notify_tabs_refresh,
             )
             self._settings_tab.grid(row=0, column=0, sticky="nsew")
         else:
@@ -244,7 +275,7 @@ class AppWindow(ctk.CTk):
             (a for a in self._accounts if a.name == name), None
         )
         self._update_acct_type_label()
-        self.notify_tabs_refresh("account")
+        self._refresh_tabs(_ACCOUNT_TABS | {"Dashboard"})
 
     def _get_current_account_id(self) -> int | None:
         return self._current_account.id if self._current_account else None
@@ -252,9 +283,6 @@ class AppWindow(ctk.CTk):
     def _open_new_account(self):
         form = AccountForm(self, self._acct_svc)
         self.wait_window(form)
-        if form.saved:
-            self._refresh_account_bar()
-            self.notify_tabs_refresh("account")
 
     def _open_edit_account(self):
         if not self._current_account:
@@ -265,9 +293,6 @@ class AppWindow(ctk.CTk):
             on_delete_callback=self._on_account_deleted,
         )
         self.wait_window(form)
-        if form.saved:
-            self._refresh_account_bar()
-            self.notify_tabs_refresh("account")
 
     def _on_account_deleted(self):
         self._current_account = None
@@ -294,17 +319,64 @@ class AppWindow(ctk.CTk):
             self._acct_type_label.configure(text="")
 
     # ── Refresh ──────────────────────────────────────────────────────────────
-    def notify_tabs_refresh(self, scope: str = "full"):
-        tabs = _REFRESH_SCOPES.get(scope, _REFRESH_SCOPES["full"])
-        if "dashboard"  in tabs: self._dashboard_tab.refresh()
-        if "register"   in tabs: self._register_tab.refresh()
-        if "budgets"    in tabs: self._budgets_tab.refresh()
-        if "recurring"  in tabs: self._recurring_tab.refresh()
-        if "reports"    in tabs: self._reports_tab.refresh()
-        if "net_worth"  in tabs: self._net_worth_tab.refresh()
-        if "forecast"   in tabs: self._forecast_tab.refresh()
-        if "categories" in tabs: self._categories_tab.refresh()
-        if "settings"   in tabs and self._settings_tab: self._settings_tab.refresh()
+    def _on_data_changed(self, change: Change):
+        account_id = self._get_current_account_id()
+        for name, entities in _TAB_DEPENDENCIES.items():
+            if change.entity not in entities:
+                continue
+            if (name in _ACCOUNT_TABS and change.entity == "transaction"
+                    and not change.touches_account(account_id)):
+                continue
+            self._stale_tabs.add(name)
+        if change.entity == "account":
+            self._accounts_stale = True
+        # One refresh for all the changes of a commit
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.after_idle(self._flush_changes)
+
+    def _flush_changes(self):
+        self._flush_pending = False
+        if self._accounts_stale:
+            self._accounts_stale = False
+            self._refresh_account_bar()
+        self._on_tab_selected()
+
+    def _on_tab_selected(self):
+        current = self._tabview.get()
+        if current in self._stale_tabs:
+            self._refresh_tabs({current})
+
+    def _refresh_tabs(self, names: set[str]):
+        """Refresh the visible tab among `names` now and the rest when shown."""
+        current = self._tabview.get()
+        self._stale_tabs |= names - {current}
+        if current in names:
+            self._stale_tabs.discard(current)
+            tab = self._tab_widgets().get(current)
+            if tab:
+                tab.refresh()
+
+    def _tab_widgets(self) -> dict:
+        return {
+            "Dashboard": self._dashboard_tab,
+            "Register": self._register_tab,
+            "Budgets": self._budgets_tab,
+            "Recurring": self._recurring_tab,
+            "Reports": self._reports_tab,
+            "Net Worth": self._net_worth_tab,
+            "Forecast": self._forecast_tab,
+            "Categories": self._categories_tab,
+            "Settings": self._settings_tab,
+        }
+
+    def _poll_external_changes(self):
+        self._db.poll_external_changes()
+        self.after(_EXTERNAL_POLL_MS, self._poll_external_changes)
+
+    def _run_idle_maintenance(self):
+        self._db.maintenance.on_idle()
+        self.after(_MAINTENANCE_POLL_MS, self._run_idle_maintenance)
 
     # ── Banners & dialogs ────────────────────────────────────────────────────
     def _show_recurring_banner(self, count: int):
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from services.account_service import AccountService
 from models.account import Account, ACCOUNT_TYPE_LABELS, DEBT_ACCOUNT_TYPES
+from utils.currency import format_amount, to_cents
 
 
 class AccountForm(ctk.CTkToplevel):
@@ -67,7 +68,7 @@ class AccountForm(ctk.CTkToplevel):
         self._ob_label = ctk.CTkLabel(self, text="Opening Balance ($):")
         self._ob_label.grid(row=3, column=0, padx=(16, 8), pady=4, sticky="e")
         self._ob_var = ctk.StringVar(
-            value=f"{account.opening_balance:.2f}" if account and account.is_debt_account else ""
+            value=format_amount(account.opening_balance) if account and account.is_debt_account else ""
         )
         self._ob_entry = ctk.CTkEntry(self, textvariable=self._ob_var, width=240)
         self._ob_entry.grid(row=3, column=1, padx=(0, 16), pady=4, sticky="ew")
@@ -137,10 +138,10 @@ class AccountForm(ctk.CTkToplevel):
         type_label = self._type_var.get()
         account_type = self._LABEL_TO_KEY.get(type_label, "checking")
 
-        opening_balance = 0.0
+        opening_balance = 0
         if account_type in DEBT_ACCOUNT_TYPES:
             try:
-                opening_balance = float(self._ob_var.get())
+                opening_balance = to_cents(self._ob_var.get())
             except ValueError:
                 self._error_var.set("Opening balance must be a number.")
                 return
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from services.budget_service import BudgetService
 from models.budget import Budget
+from utils.currency import format_amount, to_cents
 
 
 class BudgetForm(ctk.CTkToplevel):
@@ -57,7 +58,7 @@ class BudgetForm(ctk.CTkToplevel):
             row=r, column=0, padx=(16, 8), pady=4, sticky="e"
         )
         self._limit_var = ctk.StringVar(
-            value=f"{budget.limit_amount:.2f}" if budget else ""
+            value=format_amount(budget.limit_amount) if budget else ""
         )
         ctk.CTkEntry(self, textvariable=self._limit_var, width=200).grid(
             row=r, column=1, padx=(0, 16), pady=4, sticky="ew"
@@ -95,7 +96,7 @@ class BudgetForm(ctk.CTkToplevel):
 
     def _on_save(self):
         try:
-            limit = float(self._limit_var.get())
+            limit = to_cents(self._limit_var.get())
         except ValueError:
             self._error_var.set("Invalid amount.")
             return
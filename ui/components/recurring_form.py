@@ -6,6 +6,7 @@ from models.recurring_rule import RecurringRule
 from ui.components.date_picker import DatePickerWidget
 from utils.date_helpers import today_str
 from utils.constants import FREQUENCIES, DAYS_OF_WEEK, WEEK_INTERVALS
+from utils.currency import format_amount, to_cents
 
 
 class RecurringForm(ctk.CTkToplevel):
@@ -62,7 +63,7 @@ class RecurringForm(ctk.CTkToplevel):
 
         # Amount
         self._add_label("Amount:", r)
-        self._amount_var = ctk.StringVar(value=f"{rule.amount:.2f}" if rule else "")
+        self._amount_var = ctk.StringVar(value=format_amount(rule.amount) if rule else "")
         ctk.CTkEntry(self, textvariable=self._amount_var, width=220).grid(
             row=r, column=1, padx=(0, 16), pady=4, sticky="ew"
         )
@@ -247,7 +248,7 @@ class RecurringForm(ctk.CTkToplevel):
         freq = self._freq_var.get()
 
         try:
-            amount = float(self._amount_var.get())
+            amount = to_cents(self._amount_var.get())
         except ValueError:
             self._error_var.set("Invalid amount.")
             return
@@ -5,6 +5,7 @@ from database.category_dao import CategoryDAO
 from models.transaction import Transaction
 from ui.components.date_picker import DatePickerWidget
 from utils.date_helpers import today_str
+from utils.currency import format_amount, to_cents
 
 
 class TransactionForm(ctk.CTkToplevel):
@@ -95,7 +96,7 @@ class TransactionForm(ctk.CTkToplevel):
         # Amount
         self._label("Amount:", r)
         self._amount_var = ctk.StringVar(
-            value=f"{tx.amount:.2f}" if tx else ""
+            value=format_amount(tx.amount) if tx else ""
         )
         ctk.CTkEntry(self, textvariable=self._amount_var, width=200).grid(
             row=r, column=1, padx=(0, 16), pady=4, sticky="ew"
@@ -178,7 +179,7 @@ class TransactionForm(ctk.CTkToplevel):
         # Amount
         self._label("Amount:", r)
         self._amount_var = ctk.StringVar(
-            value=f"{tx.amount:.2f}" if tx else ""
+            value=format_amount(tx.amount) if tx else ""
         )
         ctk.CTkEntry(self, textvariable=self._amount_var, width=200).grid(
             row=r, column=1, padx=(0, 16), pady=4, sticky="ew"
@@ -238,7 +239,7 @@ class TransactionForm(ctk.CTkToplevel):
 
     def _on_save(self):
         try:
-            amount = float(self._amount_var.get())
+            amount = to_cents(self._amount_var.get())
         except ValueError:
             self._error_var.set("Invalid amount.")
             return
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from services.async_facade import AsyncFacade
 from services.budget_service import BudgetService
 from ui.components.budget_form import BudgetForm
 from ui.components.confirm_dialog import ConfirmDialog
@@ -11,12 +12,13 @@ class BudgetsTab(ctk.CTkFrame):
         self,
         master,
         budget_service: BudgetService,
-        notify_refresh,
+        facade: AsyncFacade,
         **kwargs,
     ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._svc = budget_service
-        self._notify_refresh = notify_refresh
+        self._facade = facade
+        self._budgets = facade.wrap(budget_service)
         self._month_var = ctk.StringVar(value=current_month_str())
 
         self.grid_columnconfigure(0, weight=1)
@@ -63,11 +65,12 @@ class BudgetsTab(ctk.CTkFrame):
         self._scroll.grid_columnconfigure(0, weight=1)
 
     def _load(self):
+        self._facade.submit(self, self._budgets.get_budget_status(self._month_var.get()), self._show)
+
+    def _show(self, budgets):
         for w in self._scroll.winfo_children():
             w.destroy()
 
-        month = self._month_var.get()
-        budgets = self._svc.get_budget_status(month)
         if not budgets:
             ctk.CTkLabel(
                 self._scroll,
@@ -125,8 +128,6 @@ class BudgetsTab(ctk.CTkFrame):
             self.winfo_toplevel(), self._svc, month=self._month_var.get()
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("budget")
 
     def _open_edit(self, budget):
         form = BudgetForm(
@@ -134,12 +135,10 @@ class BudgetsTab(ctk.CTkFrame):
             month=self._month_var.get(), budget=budget
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("budget")
 
     def _copy_prev(self):
+        # A copy publishes a change, which reloads the tab
         count = self._svc.copy_from_previous_month(self._month_var.get())
-        self._load()
         if count == 0:
             ctk.CTkLabel(
                 self._scroll,
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from services.async_facade import AsyncFacade
 from services.category_service import CategoryService
 from ui.components.category_form import CategoryForm
 from ui.components.confirm_dialog import ConfirmDialog
@@ -9,12 +10,13 @@ class CategoriesTab(ctk.CTkFrame):
         self,
         master,
         category_service: CategoryService,
-        notify_refresh,
+        facade: AsyncFacade,
         **kwargs,
     ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._svc = category_service
-        self._notify_refresh = notify_refresh
+        self._facade = facade
+        self._categories = facade.wrap(category_service)
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -45,10 +47,12 @@ class CategoriesTab(ctk.CTkFrame):
         self._scroll.grid_columnconfigure(0, weight=1)
 
     def _load(self):
+        self._facade.submit(self, self._categories.get_all(), self._show)
+
+    def _show(self, categories):
         for w in self._scroll.winfo_children():
             w.destroy()
 
-        categories = self._svc.get_all()
         if not categories:
             ctk.CTkLabel(
                 self._scroll,
@@ -136,14 +140,10 @@ class CategoriesTab(ctk.CTkFrame):
     def _open_add(self):
         form = CategoryForm(self.winfo_toplevel(), self._svc)
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("category")
 
     def _open_edit(self, cat):
         form = CategoryForm(self.winfo_toplevel(), self._svc, category=cat)
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("category")
 
     def _on_delete(self, cat):
         dlg = ConfirmDialog(
@@ -154,7 +154,6 @@ class CategoriesTab(ctk.CTkFrame):
         if dlg.result:
             try:
                 self._svc.delete(cat.id)
-                self._notify_refresh("category")
             except ValueError as e:
                 # show inline error - just reload to reflect current state
                 self._load()
@@ -1,4 +1,6 @@
+import asyncio
 import customtkinter as ctk
+from services.async_facade import AsyncFacade
 from services.transaction_service import TransactionService
 from services.budget_service import BudgetService
 from utils.currency import format_currency
@@ -11,6 +13,7 @@ class DashboardTab(ctk.CTkFrame):
         master,
         tx_service: TransactionService,
         budget_service: BudgetService,
+        facade: AsyncFacade,
         get_account_id,   # callable → int | None
         get_account=None, # callable → Account | None
         date_format: str = "MM/DD/YYYY",
@@ -19,6 +22,9 @@ class DashboardTab(ctk.CTkFrame):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._tx_svc = tx_service
         self._budget_svc = budget_service
+        self._facade = facade
+        self._txs = facade.wrap(tx_service)
+        self._budgets = facade.wrap(budget_service)
         self._get_account_id = get_account_id
         self._get_account = get_account or (lambda: None)
         self._date_format = date_format
@@ -85,18 +91,33 @@ class DashboardTab(ctk.CTkFrame):
         self._month_var.set(month)  # trigger label update
         is_debt = account is not None and account.is_debt_account
 
-        # Pre-fetch monthly pairs once — used for both cards and recent transactions
-        month_pairs = self._tx_svc.get_with_running_balance(account_id, month) if account_id else []
+        async def fetch():
+            budgets = self._budgets.get_budget_status(month)
+            if not account_id:
+                return [], None, await budgets
+            # Pre-fetch monthly pairs once — used for both cards and recent transactions
+            pairs = self._txs.get_with_running_balance(account_id, month)
+            # All-time balance for a debt account, the month's totals otherwise
+            cards = (
+                self._txs.get_current_balance(account_id) if is_debt
+                else self._txs.get_totals(account_id, month)
+            )
+            return await asyncio.gather(pairs, cards, budgets)
+
+        self._facade.submit(
+            self, fetch(), lambda result: self._show(account_id, account, *result)
+        )
+
+    def _show(self, account_id, account, month_pairs, cards, budgets):
+        is_debt = account is not None and account.is_debt_account
 
         # Summary cards
         for w in self._card_frame.winfo_children():
             w.destroy()
 
         if is_debt and account_id:
-            # All-time running balance → amount owed
-            all_pairs = self._tx_svc.get_with_running_balance(account_id)
-            current_balance = all_pairs[-1][1] if all_pairs else 0.0
-            amount_owed = account.opening_balance - current_balance
+            # All-time balance → amount owed
+            amount_owed = account.opening_balance - cards
             # Derive monthly activity from pre-fetched pairs (avoids a separate get_totals() query)
             monthly_expense = sum(tx.amount for tx, _ in month_pairs if tx.type == "expense")
             monthly_income = sum(tx.amount for tx, _ in month_pairs if tx.type == "income")
@@ -106,10 +127,7 @@ class DashboardTab(ctk.CTkFrame):
                 ("Payments This Month",  monthly_income,  "#4CAF50",  ""),
             ]
         else:
-            if account_id:
-                totals = self._tx_svc.get_totals(account_id, month)
-            else:
-                totals = {"income": 0.0, "expense": 0.0, "net": 0.0}
+            totals = cards or {"income": 0, "expense": 0, "net": 0}
             card_data = [
                 ("Income",   totals["income"],  "#4CAF50",  None),
                 ("Expenses", totals["expense"], "#F44336",  None),
@@ -157,7 +175,6 @@ class DashboardTab(ctk.CTkFrame):
         for w in self._budget_frame.winfo_children():
             w.destroy()
         current_month = current_month_str()
-        budgets = self._budget_svc.get_budget_status(month)
         if not budgets:
             ctk.CTkLabel(
                 self._budget_frame, text="No budgets set for this month.",
@@ -1,12 +1,12 @@
-import threading
 import customtkinter as ctk
 import tkinter as tk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from services.async_facade import AsyncFacade
 from services.forecast_service import ForecastService
 from services.account_service import AccountService
-from utils.currency import format_currency
+from utils.currency import format_currency, from_cents
 
 
 class ForecastTab(ctk.CTkFrame):
@@ -15,10 +15,13 @@ class ForecastTab(ctk.CTkFrame):
         master,
         forecast_service: ForecastService,
         account_service: AccountService,
+        facade: AsyncFacade,
         **kwargs,
     ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._forecast_svc = forecast_service
+        self._facade = facade
+        self._forecasts = facade.wrap(forecast_service)
         self._acct_svc = account_service
 
         accounts = account_service.get_all()
@@ -27,7 +30,6 @@ class ForecastTab(ctk.CTkFrame):
         self._acct_var = ctk.StringVar(value="All Accounts")
         self._source_var = ctk.StringVar(value="Recurring + History")
         self._view_var = ctk.StringVar(value="Monthly")
-        self._load_gen = 0
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=0)
@@ -51,9 +53,11 @@ class ForecastTab(ctk.CTkFrame):
         return acct.id if acct else None
 
     def _get_source(self) -> int:
-        return {"Recurring Only": 1, "Recurring + Budgets": 2, "Recurring + History": 3}.get(
-            self._source_var.get(), 3
-        )
+        """1-3 as in ForecastService.get_monthly_forecast, 4 = simulated."""
+        return {
+            "Recurring Only": 1, "Recurring + Budgets": 2,
+            "Recurring + History": 3, "Simulated": 4,
+        }.get(self._source_var.get(), 3)
 
     def _style_ax(self, ax, fig):
         is_dark = ctk.get_appearance_mode() == "Dark"
@@ -81,7 +85,7 @@ class ForecastTab(ctk.CTkFrame):
         ctk.CTkLabel(bar, text="Source:").pack(side="left", padx=(0, 4))
         ctk.CTkSegmentedButton(
             bar,
-            values=["Recurring Only", "Recurring + Budgets", "Recurring + History"],
+            values=["Recurring Only", "Recurring + Budgets", "Recurring + History", "Simulated"],
             variable=self._source_var,
             command=lambda _: self._load(),
         ).pack(side="left", padx=(0, 16))
@@ -106,11 +110,8 @@ class ForecastTab(ctk.CTkFrame):
         self._chart_title.pack(pady=(10, 0))
 
         # Legend
-        legend_frame = ctk.CTkFrame(outer, fg_color="transparent")
-        legend_frame.pack()
-        for color, label in (("#4CAF50", "Income"), ("#F44336", "Expense")):
-            tk.Label(legend_frame, bg=color, width=2).pack(side="left", padx=(8, 2))
-            ctk.CTkLabel(legend_frame, text=label, font=ctk.CTkFont(size=11)).pack(side="left", padx=(0, 8))
+        self._legend_frame = ctk.CTkFrame(outer, fg_color="transparent")
+        self._legend_frame.pack()
 
         self._chart_fig = Figure(figsize=(8, 2.8), dpi=80, tight_layout=True)
         self._chart_ax = self._chart_fig.add_subplot(111)
@@ -126,13 +127,16 @@ class ForecastTab(ctk.CTkFrame):
         # Header row
         header = ctk.CTkFrame(outer, fg_color=("gray80", "gray25"), corner_radius=0)
         header.grid(row=0, column=0, sticky="ew", padx=4, pady=(4, 0))
+        self._header_labels = []
         for col, (text, w) in enumerate([("Period", 120), ("Income", 120), ("Expense", 120), ("Net", 120)]):
             header.grid_columnconfigure(col, weight=1, minsize=w)
-            ctk.CTkLabel(
+            label = ctk.CTkLabel(
                 header, text=text,
                 font=ctk.CTkFont(weight="bold"),
                 anchor="center",
-            ).grid(row=0, column=col, padx=4, pady=6, sticky="ew")
+            )
+            label.grid(row=0, column=col, padx=4, pady=6, sticky="ew")
+            self._header_labels.append(label)
 
         self._table_scroll = ctk.CTkScrollableFrame(outer, fg_color="transparent")
         self._table_scroll.grid(row=1, column=0, sticky="nsew", padx=4, pady=(0, 4))
@@ -142,30 +146,40 @@ class ForecastTab(ctk.CTkFrame):
     # ── Data loading ─────────────────────────────────────────────────────────
 
     def _load(self):
-        self._load_gen += 1
-        gen = self._load_gen
         account_id = self._get_account_id()
         source = self._get_source()
         view = self._view_var.get()
+        simulated = source == 4
+        if simulated:
+            fetch = self._forecasts.get_simulated_forecast(account_id, annual=view == "Annual")
+        elif view == "Monthly":
+            fetch = self._forecasts.get_monthly_forecast(account_id, source)
+        else:
+            fetch = self._forecasts.get_annual_forecast(account_id, source)
+        self._facade.submit(
+            self, fetch,
+            lambda data: self._on_data_ready(data, view, simulated),
+            on_error=lambda _e: self._on_data_ready([], view, simulated),
+        )
 
-        def fetch():
-            try:
-                if view == "Monthly":
-                    data = self._forecast_svc.get_monthly_forecast(account_id, source)
-                else:
-                    data = self._forecast_svc.get_annual_forecast(account_id, source)
-            except Exception:
-                data = []
-            self.after(0, lambda: self._on_data_ready(gen, data, view))
-
-        threading.Thread(target=fetch, daemon=True).start()
-
-    def _on_data_ready(self, gen: int, data: list[dict], view: str):
-        if gen != self._load_gen:
-            return  # superseded by a newer load
-        if not self.winfo_exists():
-            return
-        if view == "Monthly":
+    def _on_data_ready(self, data: list[dict], view: str, simulated: bool = False):
+        self._set_legend(
+            (("#2196F3", "Median"), ("#90CAF9", "P10–P90")) if simulated
+            else (("#4CAF50", "Income"), ("#F44336", "Expense"))
+        )
+        headers = ("P10 Net", "P50 Net", "P90 Net") if simulated else ("Income", "Expense", "Net")
+        for label, text in zip(self._header_labels[1:], headers):
+            label.configure(text=text)
+
+        if simulated and view == "Monthly":
+            self._chart_title.configure(text="Simulated Cumulative Net (through Dec next year)")
+            self._draw_band_chart(data, "Monthly")
+            self._populate_band_table(data, "Monthly")
+        elif simulated:
+            self._chart_title.configure(text="Simulated Annual Net")
+            self._draw_band_chart(data, "Annual")
+            self._populate_band_table(data, "Annual")
+        elif view == "Monthly":
             self._chart_title.configure(text="Monthly Forecast (through Dec next year)")
             self._draw_bar_chart(data, "Monthly")
             self._populate_table(data, "Monthly")
@@ -174,6 +188,13 @@ class ForecastTab(ctk.CTkFrame):
             self._draw_bar_chart(data, "Annual")
             self._populate_table(data, "Annual")
 
+    def _set_legend(self, entries):
+        for w in self._legend_frame.winfo_children():
+            w.destroy()
+        for color, label in entries:
+            tk.Label(self._legend_frame, bg=color, width=2).pack(side="left", padx=(8, 2))
+            ctk.CTkLabel(self._legend_frame, text=label, font=ctk.CTkFont(size=11)).pack(side="left", padx=(0, 8))
+
     # ── Chart drawing ─────────────────────────────────────────────────────────
 
     def _draw_bar_chart(self, data: list[dict], mode: str):
@@ -191,8 +212,8 @@ class ForecastTab(ctk.CTkFrame):
             labels = [d["month"][5:] for d in data]
         else:
             labels = [str(d["year"]) for d in data]
-        incomes  = [d.get("income",  0) for d in data]
-        expenses = [d.get("expense", 0) for d in data]
+        incomes  = [from_cents(d.get("income",  0)) for d in data]
+        expenses = [from_cents(d.get("expense", 0)) for d in data]
 
         x = list(range(len(labels)))
         w = 0.35
@@ -205,6 +226,38 @@ class ForecastTab(ctk.CTkFrame):
         )
         self._chart_mpl.draw_idle()
 
+    def _draw_band_chart(self, data: list[dict], mode: str):
+        """Median line inside its P10–P90 band: cumulative net by month, or
+        net by year."""
+        ax = self._chart_ax
+        ax.clear()
+        self._style_ax(ax, self._chart_fig)
+
+        if not data:
+            ax.text(0.5, 0.5, "No data", ha="center", va="center",
+                    transform=ax.transAxes, color="gray")
+            self._chart_mpl.draw_idle()
+            return
+
+        if mode == "Monthly":
+            labels = [d["month"][5:] for d in data]
+            low, mid, high = ([from_cents(d[k]) for d in data]
+                              for k in ("balance_p10", "balance_p50", "balance_p90"))
+        else:
+            labels = [str(d["year"]) for d in data]
+            low, mid, high = ([from_cents(d[k]) for d in data] for k in ("p10", "p50", "p90"))
+
+        x = list(range(len(labels)))
+        ax.fill_between(x, low, high, color="#90CAF9", alpha=0.6, linewidth=0)
+        ax.plot(x, mid, color="#2196F3", marker="o", markersize=3)
+        ax.axhline(0, color="gray", linewidth=0.8)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45 if len(labels) > 12 else 0, ha="right")
+        ax.yaxis.set_major_formatter(
+            lambda v, _: f"{v/1000:.0f}k" if abs(v) >= 1000 else f"{v:.0f}"
+        )
+        self._chart_mpl.draw_idle()
+
     # ── Table population ─────────────────────────────────────────────────────
 
     def _populate_table(self, data: list[dict], mode: str):
@@ -237,4 +290,23 @@ class ForecastTab(ctk.CTkFrame):
                     corner_radius=0,
                 ).grid(row=row_idx, column=col, padx=1, pady=1, sticky="ew")
 
+    def _populate_band_table(self, data: list[dict], mode: str):
+        for w in self._table_scroll.winfo_children():
+            w.destroy()
 
+        for row_idx, d in enumerate(data):
+            bg = ("gray85", "gray22") if row_idx % 2 == 0 else ("gray90", "gray18")
+            period_label = d["month"] if mode == "Monthly" else str(d["year"])
+            cells = [(period_label, None)] + [
+                (format_currency(d[k]), "#4CAF50" if d[k] >= 0 else "#F44336")
+                for k in ("p10", "p50", "p90")
+            ]
+            for col, (text, color) in enumerate(cells):
+                ctk.CTkLabel(
+                    self._table_scroll,
+                    text=text,
+                    text_color=color or ("gray10", "gray90"),
+                    fg_color=bg,
+                    anchor="center",
+                    corner_radius=0,
+                ).grid(row=row_idx, column=col, padx=1, pady=1, sticky="ew")
@@ -1,17 +1,21 @@
-import threading
+import asyncio
 import customtkinter as ctk
 import tkinter as tk
 
+from services.async_facade import AsyncFacade
 from services.net_worth_service import NetWorthService
-from utils.currency import format_currency
+from utils.currency import format_currency, from_cents
 
 
 class NetWorthTab(ctk.CTkFrame):
-    def __init__(self, master, net_worth_service: NetWorthService, **kwargs):
+    def __init__(
+        self, master, net_worth_service: NetWorthService, facade: AsyncFacade, **kwargs
+    ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._svc = net_worth_service
+        self._facade = facade
+        self._net_worth = facade.wrap(net_worth_service)
         self._months_var = ctk.IntVar(value=12)
-        self._load_gen = 0
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(3, weight=1)
@@ -107,29 +111,17 @@ class NetWorthTab(ctk.CTkFrame):
     # ── Data loading ──────────────────────────────────────────────────────────
 
     def _load(self):
-        self._load_gen += 1
-        gen = self._load_gen
         months = self._months_var.get()
 
-        def fetch():
-            try:
-                breakdown = self._svc.get_current_breakdown()
-                history = self._svc.get_monthly_history(months=months)
-            except Exception:
-                breakdown = None
-                history = []
-            self.after(0, lambda: self._on_data_ready(gen, breakdown, history))
-
-        threading.Thread(target=fetch, daemon=True).start()
+        async def fetch():
+            return await asyncio.gather(
+                self._net_worth.get_current_breakdown(),
+                self._net_worth.get_monthly_history(months=months),
+            )
 
-    def _on_data_ready(self, gen: int, breakdown: dict | None, history: list[dict]):
-        if gen != self._load_gen:
-            return
-        if not self.winfo_exists():
-            return
-        if breakdown is None:
-            return
+        self._facade.submit(self, fetch(), lambda result: self._on_data_ready(*result))
 
+    def _on_data_ready(self, breakdown: dict, history: list[dict]):
         # Update headline
         net_worth = breakdown["net_worth"]
         color = "#4CAF50" if net_worth >= 0 else "#F44336"
@@ -158,7 +150,7 @@ class NetWorthTab(ctk.CTkFrame):
         self._chart_canvas.configure(bg=self._canvas_bg())
         self._chart_canvas.after(50, lambda h=history: self._draw_bar_chart(h))
 
-    def _populate_panel(self, frame, rows: list[tuple], total: float, value_color: str):
+    def _populate_panel(self, frame, rows: list[tuple], total: int, value_color: str):
         for w in frame.winfo_children():
             w.destroy()
 
@@ -197,7 +189,7 @@ class NetWorthTab(ctk.CTkFrame):
             canvas.create_text(200, 100, text="No data", fill="gray")
             return
 
-        values = [h["net_worth"] for h in history]
+        values = [from_cents(h["net_worth"]) for h in history]
         max_val = max(values) if values else 0.0
         min_val = min(values) if values else 0.0
 
@@ -258,7 +250,7 @@ class NetWorthTab(ctk.CTkFrame):
         )
 
         for i, entry in enumerate(history):
-            nw = entry["net_worth"]
+            nw = from_cents(entry["net_worth"])
             x_center = padding_left + (i + 0.5) * (chart_w / n)
             bar_color = "#4CAF50" if nw >= 0 else "#F44336"
             bar_y = y_for_val(nw)
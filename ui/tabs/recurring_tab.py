@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from services.async_facade import AsyncFacade
 from services.recurring_service import RecurringService
 from services.account_service import AccountService
 from database.category_dao import CategoryDAO
@@ -15,7 +16,7 @@ class RecurringTab(ctk.CTkFrame):
         recurring_service: RecurringService,
         account_service: AccountService,
         category_dao: CategoryDAO,
-        notify_refresh,
+        facade: AsyncFacade,
         date_format: str = "MM/DD/YYYY",
         **kwargs,
     ):
@@ -23,7 +24,8 @@ class RecurringTab(ctk.CTkFrame):
         self._svc = recurring_service
         self._acct_svc = account_service
         self._cat_dao = category_dao
-        self._notify_refresh = notify_refresh
+        self._facade = facade
+        self._rules = facade.wrap(recurring_service)
         self._date_format = date_format
 
         self.grid_columnconfigure(0, weight=1)
@@ -53,10 +55,12 @@ class RecurringTab(ctk.CTkFrame):
         self._scroll.grid_columnconfigure(0, weight=1)
 
     def _load(self):
+        self._facade.submit(self, self._rules.get_all(), self._show)
+
+    def _show(self, rules):
         for w in self._scroll.winfo_children():
             w.destroy()
 
-        rules = self._svc.get_all()
         if not rules:
             ctk.CTkLabel(
                 self._scroll,
@@ -132,8 +136,6 @@ class RecurringTab(ctk.CTkFrame):
             date_format=self._date_format,
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("recurring")
 
     def _open_edit(self, rule):
         form = RecurringForm(
@@ -143,9 +145,6 @@ class RecurringTab(ctk.CTkFrame):
             date_format=self._date_format,
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("recurring")
 
     def _toggle_active(self, rule):
         self._svc.set_active(rule.id, not rule.is_active)
-        self._notify_refresh("recurring")
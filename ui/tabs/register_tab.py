@@ -1,15 +1,19 @@
 import customtkinter as ctk
+from services.async_facade import AsyncFacade
 from services.transaction_service import TransactionService
 from services.account_service import AccountService
 from database.category_dao import CategoryDAO
 from models.transaction import Transaction
 from ui.components.transaction_form import TransactionForm
 from ui.components.confirm_dialog import ConfirmDialog
+from ui.components.date_picker import DatePickerWidget
 from utils.currency import format_currency
 from utils.date_helpers import current_month_str, friendly_month, format_display_date
 
 
-_MAX_RENDERED_ROWS = 100
+_PAGE_SIZE = 100
+# Typing pause (ms) before the search box reloads the register
+_SEARCH_DELAY_MS = 150
 
 
 class RegisterTab(ctk.CTkFrame):
@@ -19,8 +23,8 @@ class RegisterTab(ctk.CTkFrame):
         tx_service: TransactionService,
         account_service: AccountService,
         category_dao: CategoryDAO,
+        facade: AsyncFacade,
         get_account_id,   # callable → int | None
-        notify_refresh,   # callable
         get_account=None, # callable → Account | None
         date_format: str = "MM/DD/YYYY",
         **kwargs,
@@ -29,16 +33,21 @@ class RegisterTab(ctk.CTkFrame):
         self._tx_svc = tx_service
         self._acct_svc = account_service
         self._cat_dao = category_dao
+        self._facade = facade
+        self._txs = facade.wrap(tx_service)
         self._get_account_id = get_account_id
         self._get_account = get_account or (lambda: None)
-        self._notify_refresh = notify_refresh
         self._date_format = date_format
 
         self._month_var = ctk.StringVar(value=current_month_str())
         self._type_var = ctk.StringVar(value="all")
         self._cleared_var = ctk.StringVar(value="all")
         self._search_var = ctk.StringVar()
-        self._search_var.trace_add("write", lambda *_: self._load())
+        self._search_var.trace_add("write", lambda *_: self._schedule_search())
+        self._search_after_id = None
+        # get_page() seek arguments for the page on screen; filters reset it
+        self._seek: dict = {}
+        self._page = None
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(2, weight=1)
@@ -46,10 +55,12 @@ class RegisterTab(ctk.CTkFrame):
         self._build_filter_bar()
         self._build_header()
         self._build_register()
+        self._build_pager()
         self._load()
 
     def refresh(self):
-        self._load()
+        """Reload the page on screen, e.g. after an edit elsewhere."""
+        self._render()
 
     # ── Filter bar ──────────────────────────────────────────────────────────
     def _build_filter_bar(self):
@@ -153,10 +164,75 @@ class RegisterTab(ctk.CTkFrame):
         self._scroll.grid(row=2, column=0, sticky="nsew", padx=8, pady=(0, 8))
         self._scroll.grid_columnconfigure(0, weight=1)
 
+    # ── Pager ────────────────────────────────────────────────────────────────
+    def _build_pager(self):
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.grid(row=3, column=0, sticky="ew", padx=8, pady=(0, 8))
+        bar.grid_columnconfigure(2, weight=1)
+
+        self._prev_btn = ctk.CTkButton(
+            bar, text="◀ Prev", width=70, command=self._prev_page
+        )
+        self._prev_btn.grid(row=0, column=0, padx=(0, 4))
+        self._next_btn = ctk.CTkButton(
+            bar, text="Next ▶", width=70, command=self._next_page
+        )
+        self._next_btn.grid(row=0, column=1, padx=4)
+        self._page_label = ctk.CTkLabel(bar, text="", text_color="gray60", anchor="w")
+        self._page_label.grid(row=0, column=2, padx=8, sticky="w")
+
+        self._jump_picker = DatePickerWidget(bar, date_format=self._date_format)
+        self._jump_picker.grid(row=0, column=3, padx=4)
+        ctk.CTkButton(bar, text="Go to date", width=90, command=self._jump_to_date).grid(
+            row=0, column=4, padx=(4, 0)
+        )
+
+    def _prev_page(self):
+        if self._page and self._page.has_prev:
+            self._seek = {"before": self._page.first_key}
+            self._render()
+
+    def _next_page(self):
+        if self._page and self._page.has_next:
+            self._seek = {"after": self._page.last_key}
+            self._render()
+
+    def _jump_to_date(self):
+        if not self._jump_picker.is_valid():
+            return
+        date_str = self._jump_picker.get()
+        self._month_var.set(date_str[:7])
+        self._seek = {"jump_to": date_str}
+        self._render()
+
+    def _update_pager(self):
+        page = self._page
+        if page is None or not page.total:
+            self._page_label.configure(text="")
+        else:
+            first = page.offset + 1
+            self._page_label.configure(
+                text=f"{first:,}–{first + len(page.rows) - 1:,} of {page.total:,}"
+            )
+        self._prev_btn.configure(state="normal" if page and page.has_prev else "disabled")
+        self._next_btn.configure(state="normal" if page and page.has_next else "disabled")
+
+    def _schedule_search(self):
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(_SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        self._load()
+
     def _load(self):
-        for w in self._scroll.winfo_children():
-            w.destroy()
+        """Reload from the first page, e.g. after a filter changed."""
+        self._seek = {}
+        self._render()
 
+    def _render(self):
+        self._page = None
         account_id = self._get_account_id()
         account = self._get_account()
         is_debt = account is not None and account.is_debt_account
@@ -168,7 +244,11 @@ class RegisterTab(ctk.CTkFrame):
         self._balance_header.configure(text="Amt Owed" if is_debt else "Balance")
 
         if not account_id:
+            self._facade.discard(self)
+            for w in self._scroll.winfo_children():
+                w.destroy()
             ctk.CTkLabel(self._scroll, text="No account selected.").grid(row=0, column=0)
+            self._update_pager()
             return
 
         month = self._month_var.get()
@@ -176,31 +256,32 @@ class RegisterTab(ctk.CTkFrame):
         cleared_f = self._cleared_var.get()
         search = self._search_var.get().strip()
 
-        rows = self._tx_svc.get_with_running_balance(
-            account_id, month, type_f, cleared_f, search
+        self._facade.submit(
+            self,
+            self._txs.get_page(
+                account_id, month, type_f, cleared_f, search,
+                page_size=_PAGE_SIZE, **self._seek,
+            ),
+            lambda page: self._show_page(page, account, is_debt),
         )
 
-        if not rows:
+    def _show_page(self, page, account, is_debt: bool):
+        for w in self._scroll.winfo_children():
+            w.destroy()
+        self._page = page
+        self._update_pager()
+
+        if not self._page.rows:
             ctk.CTkLabel(
                 self._scroll, text="No transactions for this period.",
                 text_color="gray60",
             ).grid(row=0, column=0, pady=20)
             return
 
-        total = len(rows)
-        visible = rows[:_MAX_RENDERED_ROWS]
-        for idx, (tx, balance) in enumerate(visible):
+        for idx, (tx, balance) in enumerate(self._page.rows):
             self._add_row(idx, tx, balance, account, is_debt)
 
-        if total > _MAX_RENDERED_ROWS:
-            ctk.CTkLabel(
-                self._scroll,
-                text=f"Showing {_MAX_RENDERED_ROWS} of {total} transactions — use filters or search to narrow results.",
-                text_color="gray60",
-                font=ctk.CTkFont(size=11),
-            ).grid(row=_MAX_RENDERED_ROWS, column=0, pady=8)
-
-    def _add_row(self, idx: int, tx: Transaction, balance: float, account=None, is_debt: bool = False):
+    def _add_row(self, idx: int, tx: Transaction, balance: int, account=None, is_debt: bool = False):
         bg = ("gray92", "gray17") if idx % 2 == 0 else ("gray88", "gray21")
         row = ctk.CTkFrame(self._scroll, fg_color=bg, corner_radius=4)
         row.grid(row=idx, column=0, sticky="ew", pady=1, padx=2)
@@ -237,26 +318,12 @@ class RegisterTab(ctk.CTkFrame):
         )
 
         # Amount
-        if tx.type == "income":
+        if tx.direction > 0:
             amt_color = "#4CAF50"
             amt_text = f"+{format_currency(tx.amount)}"
-        elif tx.type == "expense":
+        else:
             amt_color = "#F44336"
             amt_text = f"-{format_currency(tx.amount)}"
-        else:
-            # Transfer: determine direction via pair
-            pair = self._tx_svc.get_transfer_pair(tx.transfer_pair_id) if tx.transfer_pair_id else []
-            if len(pair) == 2:
-                debit_id = min(p.id for p in pair)
-                if tx.id == debit_id:
-                    amt_color = "#F44336"
-                    amt_text = f"-{format_currency(tx.amount)}"
-                else:
-                    amt_color = "#4CAF50"
-                    amt_text = f"+{format_currency(tx.amount)}"
-            else:
-                amt_color = "#2196F3"
-                amt_text = format_currency(tx.amount)
 
         ctk.CTkLabel(
             row, text=amt_text, width=90, anchor="e", text_color=amt_color
@@ -303,8 +370,6 @@ class RegisterTab(ctk.CTkFrame):
             date_format=self._date_format,
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("transaction")
 
     def _open_make_payment(self):
         account_id = self._get_account_id()
@@ -319,8 +384,6 @@ class RegisterTab(ctk.CTkFrame):
             date_format=self._date_format,
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("transaction")
 
     def _open_edit_form(self, tx: Transaction):
         account_id = self._get_account_id()
@@ -333,8 +396,6 @@ class RegisterTab(ctk.CTkFrame):
             date_format=self._date_format,
         )
         self.wait_window(form)
-        if form.saved:
-            self._notify_refresh("transaction")
 
     def _delete_tx(self, tx: Transaction):
         if tx.transfer_pair_id:
@@ -345,7 +406,6 @@ class RegisterTab(ctk.CTkFrame):
             )
             if dlg.result:
                 self._tx_svc.delete_transfer_pair(tx.transfer_pair_id)
-                self._notify_refresh("transaction")
         else:
             dlg = ConfirmDialog(
                 self.winfo_toplevel(),
@@ -354,4 +414,3 @@ class RegisterTab(ctk.CTkFrame):
             )
             if dlg.result:
                 self._tx_svc.delete(tx.id)
-                self._notify_refresh("transaction")
@@ -1,12 +1,14 @@
+import asyncio
 import customtkinter as ctk
 import tkinter as tk
 import csv
 import os
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from services.async_facade import AsyncFacade
 from services.report_service import ReportService
 from services.account_service import AccountService
-from utils.currency import format_currency
+from utils.currency import format_currency, from_cents
 from utils.date_helpers import current_month_str, friendly_month
 
 
@@ -16,10 +18,13 @@ class ReportsTab(ctk.CTkFrame):
         master,
         report_service: ReportService,
         account_service: AccountService,
+        facade: AsyncFacade,
         **kwargs,
     ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._report_svc = report_service
+        self._facade = facade
+        self._reports = facade.wrap(report_service)
         self._acct_svc = account_service
 
         accounts = account_service.get_all()
@@ -126,14 +131,24 @@ class ReportsTab(ctk.CTkFrame):
 
         month = self._month_var.get()
 
+        async def fetch():
+            return await asyncio.gather(
+                self._reports.get_year_over_year(month, account_id),
+                self._reports.get_category_breakdown(month, account_id),
+                self._reports.get_monthly_chart_data(account_id, months=6),
+            )
+
+        self._facade.submit(self, fetch(), lambda result: self._show(*result))
+
+    def _show(self, yoy, breakdown, chart_data):
         # Summary cards
         for w in self._summary_frame.winfo_children():
             w.destroy()
-        summary = self._report_svc.get_summary(month, account_id)
-        for i, (label, value, color) in enumerate([
-            ("Income", summary["income"], "#4CAF50"),
-            ("Expenses", summary["expense"], "#F44336"),
-            ("Net", summary["net"], "#2196F3" if summary["net"] >= 0 else "#FF9800"),
+        summary, prior = yoy["month"], yoy["prior_month"]
+        for i, (label, key, color) in enumerate([
+            ("Income", "income", "#4CAF50"),
+            ("Expenses", "expense", "#F44336"),
+            ("Net", "net", "#2196F3" if summary["net"] >= 0 else "#FF9800"),
         ]):
             card = ctk.CTkFrame(
                 self._summary_frame, fg_color=("gray90", "gray20"), corner_radius=10
@@ -141,17 +156,19 @@ class ReportsTab(ctk.CTkFrame):
             card.grid(row=0, column=i, padx=6, sticky="ew")
             ctk.CTkLabel(card, text=label, text_color="gray60").pack(pady=(10, 0), padx=16)
             ctk.CTkLabel(
-                card, text=format_currency(value),
+                card, text=format_currency(summary[key]),
                 font=ctk.CTkFont(size=18, weight="bold"),
                 text_color=color,
-            ).pack(pady=(4, 10), padx=16)
+            ).pack(pady=(4, 0), padx=16)
+            ctk.CTkLabel(
+                card, text=f"Last year: {format_currency(prior[key])}",
+                text_color="gray60", font=ctk.CTkFont(size=11),
+            ).pack(pady=(0, 10), padx=16)
 
         # Bar chart
-        self.after(50, lambda: self._draw_bar_chart(account_id))
+        self.after(50, lambda: self._draw_bar_chart(chart_data))
 
         # Pie chart
-        breakdown = self._report_svc.get_category_breakdown(month, account_id)
-
         self.after(50, lambda b=breakdown: self._draw_pie_chart(b))
         for w in self._legend_frame.winfo_children():
             w.destroy()
@@ -164,12 +181,11 @@ class ReportsTab(ctk.CTkFrame):
                 anchor="w", font=ctk.CTkFont(size=11),
             ).pack(side="left")
 
-    def _draw_bar_chart(self, account_id):
+    def _draw_bar_chart(self, data):
         ax = self._bar_ax
         ax.clear()
         self._style_ax(ax, self._bar_fig)
 
-        data = self._report_svc.get_monthly_chart_data(account_id, months=6)
         if not data:
             ax.text(0.5, 0.5, "No data", ha="center", va="center",
                     transform=ax.transAxes, color="gray")
@@ -177,12 +193,13 @@ class ReportsTab(ctk.CTkFrame):
             return
 
         labels = [d["month"][5:] for d in data]
-        incomes  = [d.get("income",  0) for d in data]
-        expenses = [d.get("expense", 0) for d in data]
+        incomes  = [from_cents(d.get("income",  0)) for d in data]
+        expenses = [from_cents(d.get("expense", 0)) for d in data]
         x = list(range(len(labels)))
         w = 0.35
         ax.bar([i - w / 2 for i in x], incomes,  w, color="#4CAF50")
         ax.bar([i + w / 2 for i in x], expenses, w, color="#F44336")
+        ax.plot(x, [from_cents(d["net_avg"]) for d in data], color="#2196F3", marker="o")
         ax.set_xticks(x)
         ax.set_xticklabels(labels)
         ax.yaxis.set_major_formatter(
@@ -211,7 +228,6 @@ class ReportsTab(ctk.CTkFrame):
         self._pie_mpl.draw_idle()
 
     def _export_csv(self):
-        from tkinter import filedialog
         acct_name = self._acct_var.get()
         account_id = None
         if acct_name != "All Accounts":
@@ -220,8 +236,13 @@ class ReportsTab(ctk.CTkFrame):
                 account_id = acct.id
 
         month = self._month_var.get()
-        rows = self._report_svc.export_csv(account_id, month)
+        self._facade.submit(
+            self, self._reports.export_csv(account_id, month),
+            lambda rows: self._save_csv(rows, month), key=(self, "export"),
+        )
 
+    def _save_csv(self, rows, month):
+        from tkinter import filedialog
         path = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv")],
@@ -1,8 +1,12 @@
 import json
+import os
+import threading
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
+from database.backup import BACKUP_GENERATIONS
 from database.db_manager import DatabaseManager
+from database.storage_profiles import STORAGE_PROFILES
 from services.data_service import DataService
 from utils.app_config import get_db_folder, set_db_folder
 from utils.date_helpers import DATE_FORMAT_OPTIONS
@@ -16,13 +20,11 @@ class SettingsTab(ctk.CTkFrame):
         master,
         db: DatabaseManager,
         data_service: DataService,
-        notify_refresh,
         **kwargs,
     ):
         super().__init__(master, fg_color="transparent", **kwargs)
         self._db = db
         self._data_svc = data_service
-        self._notify_refresh = notify_refresh
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -33,7 +35,9 @@ class SettingsTab(ctk.CTkFrame):
 
         self._build_db_folder_section(scroll)
         self._build_export_import_section(scroll)
+        self._build_backup_section(scroll)
         self._build_app_settings_section(scroll)
+        self._build_maintenance_section(scroll)
 
     def refresh(self):
         """Re-read settings from DB and update displayed values."""
@@ -45,6 +49,10 @@ class SettingsTab(ctk.CTkFrame):
         self._currency_var.set(currency)
         if date_fmt in DATE_FORMAT_OPTIONS:
             self._date_fmt_var.set(date_fmt)
+        self._profile_var.set(self._db.storage_profile.label)
+        self._show_profile_description(self._profile_var.get())
+        self._show_maintenance_report()
+        self._show_backups()
 
     # ── Section 1: DB folder ──────────────────────────────────────────────────
 
@@ -196,7 +204,6 @@ class SettingsTab(ctk.CTkFrame):
 
         try:
             stats = self._data_svc.import_json(data, mode)
-            self._notify_refresh("full")
             self._io_status_var.set(self._format_stats(stats))
         except Exception as e:
             messagebox.showerror("Import Failed", str(e))
@@ -215,7 +222,6 @@ class SettingsTab(ctk.CTkFrame):
 
         try:
             stats = self._data_svc.import_csv_zip(path, mode)
-            self._notify_refresh("full")
             self._io_status_var.set(self._format_stats(stats))
         except Exception as e:
             messagebox.showerror("Import Failed", str(e))
@@ -229,10 +235,122 @@ class SettingsTab(ctk.CTkFrame):
         parts = [f"{v} {k}" for k, v in stats.items() if v > 0]
         return "Imported: " + ", ".join(parts) if parts else "Nothing new imported."
 
-    # ── Section 3: App settings ───────────────────────────────────────────────
+    # ── Section 3: Backups ────────────────────────────────────────────────────
+
+    def _build_backup_section(self, parent):
+        section = self._make_section(parent, "Backups", row=2)
+
+        ctk.CTkLabel(
+            section,
+            text=f"Copies of this year's DB file, kept in {self._db.backups.folder} "
+                 f"(newest {BACKUP_GENERATIONS}).",
+            text_color="gray60",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+        ).grid(row=0, column=0, columnspan=3, sticky="w", padx=8, pady=(4, 6))
+
+        self._backup_btn = ctk.CTkButton(
+            section, text="Back Up Now", width=130,
+            command=self._backup_now,
+        )
+        self._backup_btn.grid(row=1, column=0, sticky="w", padx=8, pady=4)
+
+        self._backup_progress = ctk.CTkProgressBar(section, width=240)
+        self._backup_progress.set(0)
+        self._backup_progress.grid(row=1, column=1, columnspan=2, sticky="w", padx=4)
+
+        self._backup_choice_var = ctk.StringVar()
+        self._backup_menu = ctk.CTkComboBox(
+            section,
+            variable=self._backup_choice_var,
+            values=[],
+            width=260,
+            state="readonly",
+        )
+        self._backup_menu.grid(row=2, column=0, sticky="w", padx=8, pady=4)
+
+        ctk.CTkButton(
+            section, text="Restore…", width=100,
+            fg_color="transparent", border_width=1,
+            text_color=("gray10", "gray90"),
+            command=self._restore_backup,
+        ).grid(row=2, column=1, sticky="w", padx=4)
+
+        self._backup_status_var = ctk.StringVar()
+        ctk.CTkLabel(
+            section,
+            textvariable=self._backup_status_var,
+            text_color="#4CAF50",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+        ).grid(row=3, column=0, columnspan=3, sticky="w", padx=8, pady=(0, 6))
+
+        self._backup_paths: dict[str, str] = {}
+        self._show_backups()
+
+    def _show_backups(self):
+        self._backup_paths = {
+            f"{b.created:%Y-%m-%d %H:%M:%S}  ({b.size / 1024:,.0f} KB)": b.path
+            for b in self._db.backups.list_backups()
+        }
+        labels = list(self._backup_paths) or ["(no backups yet)"]
+        self._backup_menu.configure(values=labels)
+        self._backup_choice_var.set(labels[0])
+
+    def _backup_now(self):
+        self._backup_btn.configure(state="disabled")
+        self._backup_progress.set(0)
+        self._backup_status_var.set("Backing up…")
+
+        def on_progress(done: int, total: int):
+            self.after(0, lambda: self._backup_progress.set(done / total if total else 1))
+
+        def run():
+            try:
+                path, error = self._db.backups.backup(on_progress), None
+            except Exception as e:
+                path, error = None, e
+            self.after(0, lambda: self._on_backup_done(path, error))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _on_backup_done(self, path: str | None, error: Exception | None):
+        if not self.winfo_exists():
+            return
+        self._backup_btn.configure(state="normal")
+        if error:
+            self._backup_status_var.set("")
+            messagebox.showerror("Backup Failed", str(error))
+            return
+        self._backup_progress.set(1)
+        self._backup_status_var.set(f"Backed up to {os.path.basename(path)}")
+        self._show_backups()
+
+    def _restore_backup(self):
+        path = self._backup_paths.get(self._backup_choice_var.get())
+        if not path:
+            return
+        if not messagebox.askyesno(
+            "Restore Backup",
+            f"Replace all of this year's data with the backup from "
+            f"{self._backup_choice_var.get()}?\n\n"
+            "The current data is backed up first.",
+        ):
+            return
+        try:
+            safety = self._db.backups.restore(path)
+        except Exception as e:
+            messagebox.showerror("Restore Failed", str(e))
+            return
+        self._backup_status_var.set(
+            f"Restored. The replaced data was saved as {os.path.basename(safety)}"
+        )
+        self.refresh()
+
+    # ── Section 4: App settings ───────────────────────────────────────────────
 
     def _build_app_settings_section(self, parent):
-        section = self._make_section(parent, "App Settings", row=2)
+        section = self._make_section(parent, "App Settings", row=3)
 
         # Appearance
         ctk.CTkLabel(section, text="Appearance:", anchor="e", width=120).grid(
@@ -275,19 +393,46 @@ class SettingsTab(ctk.CTkFrame):
             state="readonly",
         ).grid(row=2, column=1, padx=4, pady=6, sticky="w")
 
+        # Storage profile
+        ctk.CTkLabel(section, text="Storage Profile:", anchor="e", width=120).grid(
+            row=3, column=0, padx=(8, 4), pady=6, sticky="e"
+        )
+        self._profile_labels = {p.label: p.name for p in STORAGE_PROFILES.values()}
+        self._profile_var = ctk.StringVar(value=self._db.storage_profile.label)
+        ctk.CTkComboBox(
+            section,
+            values=list(self._profile_labels),
+            variable=self._profile_var,
+            width=180,
+            state="readonly",
+            command=self._show_profile_description,
+        ).grid(row=3, column=1, padx=4, pady=6, sticky="w")
+
+        self._profile_desc_label = ctk.CTkLabel(
+            section,
+            text="",
+            text_color="gray60",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+            justify="left",
+            wraplength=420,
+        )
+        self._profile_desc_label.grid(row=4, column=1, sticky="w", padx=4, pady=(0, 6))
+        self._show_profile_description(self._profile_var.get())
+
         ctk.CTkLabel(
             section,
             text="Date format changes take effect on next app restart.",
             text_color="gray60",
             font=ctk.CTkFont(size=11),
             anchor="w",
-        ).grid(row=3, column=0, columnspan=2, sticky="w", padx=8)
+        ).grid(row=5, column=0, columnspan=2, sticky="w", padx=8)
 
         # Save button
         ctk.CTkButton(
             section, text="Save Settings", width=140,
             command=self._save_settings,
-        ).grid(row=4, column=0, columnspan=2, pady=(10, 8))
+        ).grid(row=6, column=0, columnspan=2, pady=(10, 8))
 
         self._settings_status_var = ctk.StringVar()
         ctk.CTkLabel(
@@ -295,7 +440,11 @@ class SettingsTab(ctk.CTkFrame):
             textvariable=self._settings_status_var,
             text_color="#4CAF50",
             font=ctk.CTkFont(size=11),
-        ).grid(row=5, column=0, columnspan=2, pady=(0, 8))
+        ).grid(row=7, column=0, columnspan=2, pady=(0, 8))
+
+    def _show_profile_description(self, label: str):
+        profile = STORAGE_PROFILES[self._profile_labels[label]]
+        self._profile_desc_label.configure(text=profile.description)
 
     def _save_settings(self):
         appearance_display = self._appearance_var.get()
@@ -306,9 +455,99 @@ class SettingsTab(ctk.CTkFrame):
         self._db.set_setting("appearance_mode", appearance_key)
         self._db.set_setting("currency_symbol", currency)
         self._db.set_setting("date_format", date_fmt)
+        profile = self._profile_labels[self._profile_var.get()]
+        if profile != self._db.storage_profile.name:
+            self._db.set_storage_profile(profile)
         ctk.set_appearance_mode(appearance_key)
         self._settings_status_var.set("Settings saved.")
 
+    # ── Section 5: Maintenance ────────────────────────────────────────────────
+
+    def _build_maintenance_section(self, parent):
+        section = self._make_section(parent, "Maintenance", row=4)
+
+        ctk.CTkLabel(
+            section,
+            text="Monthly totals are cached in summary tables. Rebuild them if reports look wrong.",
+            text_color="gray60",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+        ).grid(row=0, column=0, sticky="w", padx=8, pady=(4, 6))
+
+        ctk.CTkButton(
+            section, text="Rebuild Summary Tables", width=180,
+            fg_color="transparent", border_width=1,
+            text_color=("gray10", "gray90"),
+            command=self._rebuild_rollups,
+        ).grid(row=1, column=0, sticky="w", padx=8, pady=4)
+
+        ctk.CTkLabel(
+            section,
+            text="Compacting rewrites the file without its unused space.",
+            text_color="gray60",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+        ).grid(row=2, column=0, sticky="w", padx=8, pady=(10, 6))
+
+        ctk.CTkButton(
+            section, text="Compact Database", width=180,
+            fg_color="transparent", border_width=1,
+            text_color=("gray10", "gray90"),
+            command=self._compact_database,
+        ).grid(row=3, column=0, sticky="w", padx=8, pady=4)
+
+        self._maint_status_var = ctk.StringVar()
+        ctk.CTkLabel(
+            section,
+            textvariable=self._maint_status_var,
+            text_color="#4CAF50",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+        ).grid(row=4, column=0, sticky="w", padx=8, pady=(0, 6))
+
+        self._maint_report_var = ctk.StringVar()
+        ctk.CTkLabel(
+            section,
+            textvariable=self._maint_report_var,
+            text_color="gray60",
+            font=ctk.CTkFont(family="Courier", size=11),
+            anchor="w",
+            justify="left",
+        ).grid(row=5, column=0, sticky="w", padx=8, pady=(0, 6))
+        self._show_maintenance_report()
+
+    def _rebuild_rollups(self):
+        try:
+            self._db.rebuild_rollups()
+            self._maint_status_var.set("Summary tables rebuilt.")
+        except Exception as e:
+            messagebox.showerror("Rebuild Failed", str(e))
+
+    def _compact_database(self):
+        try:
+            self._db.maintenance.compact()
+            self._maint_status_var.set("Database compacted.")
+        except Exception as e:
+            messagebox.showerror("Compact Failed", str(e))
+        self._show_maintenance_report()
+
+    def _show_maintenance_report(self):
+        report = self._db.maintenance.report()
+        last_run = report["last_run"]
+        lines = [
+            f"File:        {report['file_bytes'] / 1024:,.0f} KB "
+            f"({report['page_count']:,} pages of {report['page_size']:,} bytes)",
+            f"Free pages:  {report['freelist_count']:,}",
+            f"WAL:         {report['wal_bytes'] / 1024:,.0f} KB",
+            f"Auto-vacuum: {report['auto_vacuum']}",
+            "",
+            "Last checkpoint: " + (last_run["checkpoint"] or "never"),
+            "Last analyze:    " + (last_run["analyze"] or "never"),
+            "Last optimize:   " + (last_run["optimize"] or "never"),
+            "Last compact:    " + (last_run["vacuum"] or "never"),
+        ]
+        self._maint_report_var.set("\n".join(lines))
+
     # ── Helpers ───────────────────────────────────────────────────────────────
 
     def _make_section(self, parent, title: str, row: int) -> ctk.CTkFrame:
@@ -1,9 +1,36 @@
-def format_currency(amount: float, symbol: str = "$") -> str:
-    """Format a float as currency string, e.g. '$1,234.56'."""
-    return f"{symbol}{amount:,.2f}"
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
+# Money is held as integer cents from the database through the services.
+# Dollars only exist as text typed into or shown by the UI.
 
-def format_signed(amount: float, symbol: str = "$") -> str:
+
+def to_cents(amount) -> int:
+    """Parse a dollar amount (text, int, float or Decimal) into integer cents,
+    rounding half up. Raises ValueError if it is not a finite number."""
+    try:
+        value = Decimal(str(amount).strip().replace(",", "")) * 100
+        return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError, OverflowError):
+        raise ValueError(f"Invalid amount: {amount!r}") from None
+
+
+def from_cents(cents: int) -> float:
+    """Dollars as a float, for charts and exported files. Parse it back with
+    to_cents() rather than doing arithmetic on it."""
+    return cents / 100
+
+
+def format_amount(cents: int) -> str:
+    """Plain dollar string for an entry field, e.g. '1234.56'."""
+    return f"{Decimal(cents).scaleb(-2):.2f}"
+
+
+def format_currency(cents: int, symbol: str = "$") -> str:
+    """Format cents as currency string, e.g. '$1,234.56'."""
+    return f"{symbol}{Decimal(cents).scaleb(-2):,.2f}"
+
+
+def format_signed(cents: int, symbol: str = "$") -> str:
     """Format with +/- sign."""
-    sign = "+" if amount >= 0 else "-"
-    return f"{sign}{symbol}{abs(amount):,.2f}"
+    sign = "+" if cents >= 0 else "-"
+    return f"{sign}{symbol}{Decimal(abs(cents)).scaleb(-2):,.2f}"